@@ -1,13 +1,30 @@
 from __future__ import annotations
+import sys
 from dataclasses import dataclass, field
 from typing import Literal, List, Dict, Optional
 
+# Crawls can produce thousands of these records, so drop the per-instance
+# __dict__ where the interpreter supports slotted dataclasses (3.10+)
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 Severity = Literal["low", "medium", "high", "critical"]
 BugType  = Literal["UI", "Accessibility", "Logic", "Performance", "Security", "Usability"]
 Priority = Literal["P1", "P2", "P3", "P4"]  # P1 = Must fix, P4 = Nice to have
 BugCategory = Literal["Functional", "Visual", "Content", "Navigation", "Form", "Mobile", "Desktop"]
 
-@dataclass
+# Shared constants for the Literal values above, so construction sites reuse one
+# interned string per value instead of scattering literals
+SEV_LOW: Severity = "low"
+SEV_MED: Severity = "medium"
+SEV_HIGH: Severity = "high"
+SEV_CRIT: Severity = "critical"
+
+BT_UI: BugType = "UI"
+BT_A11Y: BugType = "Accessibility"
+BT_LOGIC: BugType = "Logic"
+BT_PERF: BugType = "Performance"
+
+@dataclass(**_DATACLASS_OPTS)
 class ReproStep:
     """Represents a single step in reproducing a bug"""
     step_number: int
@@ -20,7 +37,7 @@ class ReproStep:
 
 #LAYER BETWEEN THE ORCHESTRATOR AND THE INSPECTOR: pass a url to inspector, inspector returns a PageResult
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Evidence:
     screenshot_path: Optional[str] = None
     console_log: Optional[str] = None
@@ -28,7 +45,7 @@ class Evidence:
     viewport: Optional[str] = None  # "1280x800"
     action_log: Optional[str] = None  # Human-readable action sequence log
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Bug:
     id: str
     type: BugType
@@ -58,7 +75,7 @@ class Bug:
     original_bug_ids: List[str] = field(default_factory=list)  # IDs of bugs that were merged into this one
     deduplication_reason: Optional[str] = None  # Reason why bugs were considered duplicates
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PageResult:
     page_url: str
     status: Optional[int] = None
@@ -69,7 +86,7 @@ class PageResult:
     viewport_artifacts: List[str] = field(default_factory=list)
     navigation_metadata: Dict[str, Dict] = field(default_factory=dict)  # URL -> {text, selector, etc.}
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class CrawlReport:
     scanned_at: str
     seed_url: str
@@ -80,3 +97,4 @@ class CrawlReport:
 
 class Inspector:
     async def inspect_page(self, url: str) -> PageResult: ...
+    def prefetch(self, url: str) -> None: ...  # Optional hint: url is likely inspected next
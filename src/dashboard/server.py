@@ -5,6 +5,7 @@ Dashboard web server for viewing crawl reports.
 import json
 import os
 import webbrowser
+from collections import Counter
 from pathlib import Path
 from typing import Optional, Dict, Any
 from flask import Flask, render_template, jsonify, send_from_directory
@@ -194,36 +195,30 @@ class DashboardServer:
         if not self.current_report:
             return {}
         
-        severity_counts = {}
-        for bug in self.current_report.findings:
-            severity = bug['severity'] if isinstance(bug, dict) else bug.severity
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        return severity_counts
+        return dict(Counter(
+            bug['severity'] if isinstance(bug, dict) else bug.severity
+            for bug in self.current_report.findings
+        ))
     
     def get_bugs_by_type(self) -> Dict[str, int]:
         """Get bug counts grouped by type."""
         if not self.current_report:
             return {}
         
-        type_counts = {}
-        for bug in self.current_report.findings:
-            bug_type = bug['type'] if isinstance(bug, dict) else bug.type
-            type_counts[bug_type] = type_counts.get(bug_type, 0) + 1
-        
-        return type_counts
+        return dict(Counter(
+            bug['type'] if isinstance(bug, dict) else bug.type
+            for bug in self.current_report.findings
+        ))
     
     def get_bugs_by_page(self) -> Dict[str, int]:
         """Get bug counts grouped by page."""
         if not self.current_report:
             return {}
         
-        page_counts = {}
-        for bug in self.current_report.findings:
-            page_url = bug['page_url'] if isinstance(bug, dict) else bug.page_url
-            page_counts[page_url] = page_counts.get(page_url, 0) + 1
-        
-        return page_counts
+        return dict(Counter(
+            bug['page_url'] if isinstance(bug, dict) else bug.page_url
+            for bug in self.current_report.findings
+        ))
     
     def _calculate_success_rate(self) -> float:
         """Calculate the percentage of successfully crawled pages."""
@@ -1,20 +1,40 @@
 """
 Accessibility scanner using axe-core for WCAG compliance testing.
 """
-import uuid
 import asyncio
-from typing import List, Dict, Any, Optional
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set, Tuple
 from playwright.async_api import Page
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 try:
     from axe_playwright_python.async_playwright import Axe
 except ImportError:
     print("Warning: axe-playwright-python not installed. Run: pip install axe-playwright-python")
     Axe = None
 
-from inspector.checks.base_scanner import BaseScanner, BaseScanResult
-from core.types import Bug, Evidence
+from inspector.checks.base_scanner import BaseScanner, BaseScanResult, new_bug_id
+from core.types import Bug, Evidence, SEV_LOW, SEV_MED, SEV_HIGH, SEV_CRIT, BT_A11Y
 from inspector.utils.evidence import EvidenceCollector
+from inspector.playwright_helpers.page_setup import DEFAULT_TIMEOUTS, PageSetup
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=128)
+def _wcag_guidelines(tags: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    WCAG guideline codes for a set of axe tags.
+    
+    Rules repeat across findings and viewports, so the codes are worked out once per tag
+    set. They're cached as a tuple; each Bug and Evidence gets its own list copy.
+    """
+    return tuple(tag.upper() for tag in tags if tag.startswith('wcag'))
 
 
 class AccessibilityScanResult(BaseScanResult):
@@ -37,6 +57,13 @@ class AccessibilityScanner(BaseScanner):
     Accessibility scanner using axe-core for comprehensive WCAG compliance testing.
     """
     
+    # Default viewports for accessibility testing
+    DEFAULT_VIEWPORTS = (
+        {"name": "desktop", "width": 1280, "height": 800},
+        {"name": "tablet", "width": 768, "height": 1024},
+        {"name": "mobile", "width": 375, "height": 667}
+    )
+    
     # WCAG 2.1 AA rules (high priority)
     DEFAULT_RULES = [
         'color-contrast',           # Color contrast ratio
@@ -57,18 +84,64 @@ class AccessibilityScanner(BaseScanner):
         'region',                  # All page content must be contained by landmarks
     ]
     
+    # Runs axe against the current document in a single round-trip. Returns null
+    # when axe-core has not been injected yet so the caller can inject it once
+    # per document instead of re-shipping the script on every viewport.
+    # Only the fields turned into Bugs are sent back; passes and inapplicable
+    # results are reduced to counts since nothing else reads them. The result is
+    # returned as one JSON string, which is cheaper to move over CDP and decode
+    # (with orjson when installed) than Playwright's nested value serialization.
+    _AXE_RUN_JS = """
+    async (options) => {
+        if (typeof window.axe === 'undefined') {
+            return null;
+        }
+        const results = await window.axe.run(document, options);
+        const narrow = (item) => ({
+            id: item.id,
+            impact: item.impact,
+            description: item.description,
+            help: item.help,
+            tags: item.tags,
+            nodes: item.nodes.map(node => ({
+                target: node.target.slice(0, 1).map(String),
+                failureSummary: node.failureSummary || ''
+            }))
+        });
+        return JSON.stringify({
+            violations: results.violations.map(narrow),
+            incomplete: results.incomplete.map(narrow),
+            passes: results.passes.length,
+            inapplicable: results.inapplicable.length
+        });
+    }
+    """
+    
+    # Resolves once two frames have rendered after a viewport resize, i.e. the new
+    # layout has been applied, or after maxMs if frames are throttled
+    _LAYOUT_SETTLED_JS = """
+    (maxMs) => new Promise(resolve => {
+        setTimeout(resolve, maxMs);
+        requestAnimationFrame(() => requestAnimationFrame(resolve));
+    })
+    """
+    
     # Severity mapping from axe to our system
     SEVERITY_MAPPING = {
-        'critical': 'critical',
-        'serious': 'high',
-        'moderate': 'medium',
-        'minor': 'low'
+        'critical': SEV_CRIT,
+        'serious': SEV_HIGH,
+        'moderate': SEV_MED,
+        'minor': SEV_LOW
     }
     
-    def __init__(self, output_dir: str, wcag_level: str = "AA"):
-        super().__init__(output_dir)
+    def __init__(self, output_dir: str, wcag_level: str = "AA", verbose: bool = False):
+        super().__init__(output_dir, verbose)
         self.wcag_level = wcag_level
         self.axe = Axe() if Axe else None
+        # Bug kwargs shared by every finding of a given kind and axe impact
+        self._bug_templates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Findings already reported during a multi-viewport scan; None outside one
+        self._seen_findings: Optional[Set[Tuple[str, str, Tuple[str, ...]]]] = None
         
     @property
     def scan_type(self) -> str:
@@ -87,9 +160,9 @@ class AccessibilityScanner(BaseScanner):
         if not self.axe:
             # Create a fallback bug if axe is not available
             bug = Bug(
-                id=str(uuid.uuid4()),
-                type="Accessibility",
-                severity="medium",
+                id=new_bug_id(),
+                type=BT_A11Y,
+                severity=SEV_MED,
                 page_url=page_url,
                 summary="Accessibility scanner unavailable - axe-playwright-python not installed",
                 suggested_fix="Install axe-playwright-python: pip install axe-playwright-python"
@@ -98,28 +171,46 @@ class AccessibilityScanner(BaseScanner):
             return result
                 
         try:
-            # Set up evidence collection
-            evidence_collector = EvidenceCollector(page, self.output_dir)
-            
-            # Configure axe options
-            axe_options = {
-                'runOnly': {
-                    'type': 'tag',
-                    'values': self._get_wcag_tags()
-                }
+            response = await self._run_axe(page, self._get_axe_options())
+        except Exception as e:
+            response = e
+        
+        return await self._build_scan_result(page, page_url, viewport_key, response)
+    
+    def _get_axe_options(self) -> Dict[str, Any]:
+        """Restrict axe-core to the rules for the configured WCAG level"""
+        return {
+            'runOnly': {
+                'type': 'tag',
+                'values': self._get_wcag_tags()
             }
+        }
+    
+    async def _build_scan_result(self, page: Page, page_url: str, viewport_key: Optional[str], response: Any) -> AccessibilityScanResult:
+        """
+        Turn an axe-core response (or the exception raised while running it) into a scan
+        result, capturing evidence from page.
+        """
+        result = AccessibilityScanResult()
+        
+        try:
+            if isinstance(response, Exception):
+                raise response
             
-            # Run axe-core accessibility scan
-            scan_results = await self.axe.run(page, options=axe_options)
+            # Set up evidence collection
+            evidence_collector = EvidenceCollector(page, self.output_dir)
             
             # Process results
-            await self._process_scan_results(
-                scan_results, 
-                page_url, 
-                viewport_key, 
-                result, 
-                evidence_collector
-            )
+            try:
+                await self._process_scan_results(
+                    response, 
+                    page_url, 
+                    viewport_key, 
+                    result, 
+                    evidence_collector
+                )
+            finally:
+                await evidence_collector.flush()
             
             # Update metadata
             result.wcag_level = self.wcag_level
@@ -133,14 +224,13 @@ class AccessibilityScanner(BaseScanner):
                 print(f"    ✅ Accessibility scan complete: {result.violations_count} violations, {result.passes_count} passes")
             
         except Exception as e:
-            if self.verbose:
-                print(f"    ❌ Accessibility scan error: {str(e)}")
+            logger.warning("Accessibility scan failed for %s", page_url, exc_info=True)
             
             # Create error bug
             bug = Bug(
-                id=str(uuid.uuid4()),
-                type="Accessibility",
-                severity="medium",
+                id=new_bug_id(),
+                type=BT_A11Y,
+                severity=SEV_MED,
                 page_url=page_url,
                 summary=f"Accessibility scan failed: {str(e)}",
                 suggested_fix="Review page structure and accessibility scanner compatibility"
@@ -149,9 +239,29 @@ class AccessibilityScanner(BaseScanner):
         
         return result
     
+    async def _run_axe(self, page: Page, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run axe-core on the page, injecting it only if the document doesn't have it yet.
+        
+        Scanning the same document across viewports then costs one evaluate per
+        viewport instead of re-injecting the full axe-core source each time.
+        """
+        axe_source = getattr(self.axe, 'axe_script', None)
+        if not isinstance(axe_source, str):
+            # Unknown axe-playwright-python layout - fall back to its own runner
+            scan_results = await self.axe.run(page, options=options)
+            return scan_results.response
+        
+        raw = await page.evaluate(self._AXE_RUN_JS, options)
+        if raw is None:
+            await page.evaluate(axe_source)
+            raw = await page.evaluate(self._AXE_RUN_JS, options)
+        
+        return _json_loads(raw) if raw else {}
+    
     async def _process_scan_results(
         self, 
-        scan_results, 
+        response: Dict[str, Any], 
         page_url: str, 
         viewport_key: str,
         result: AccessibilityScanResult,
@@ -159,48 +269,50 @@ class AccessibilityScanner(BaseScanner):
     ):
         """Process axe-core scan results and convert to Bug objects"""
         
-        # Get the actual results from the AxeResults object
-        response = scan_results.response
-        
         # Update counts
-        result.violations_count = len(response.get('violations', []))
-        result.passes_count = len(response.get('passes', []))
-        result.incomplete_count = len(response.get('incomplete', []))
-        result.inapplicable_count = len(response.get('inapplicable', []))
-        
-        # Process violations (actual accessibility issues)
-        for violation in response.get('violations', []):
-            await self._create_violation_bug(
-                violation, 
-                page_url, 
-                viewport_key, 
-                result, 
-                evidence_collector
-            )
+        result.violations_count = self._result_count(response, 'violations')
+        result.passes_count = self._result_count(response, 'passes')
+        result.incomplete_count = self._result_count(response, 'incomplete')
+        result.inapplicable_count = self._result_count(response, 'inapplicable')
+        
+        # Build bugs for violations (actual accessibility issues) and incomplete
+        # results (potential issues that need manual review) concurrently so the
+        # per-violation screenshot round-trips overlap instead of queueing
+        coros = [
+            self._create_violation_bug(violation, page_url, viewport_key, evidence_collector)
+            for violation in response.get('violations', [])
+        ]
+        coros.extend(
+            self._create_incomplete_bug(incomplete, page_url, viewport_key, evidence_collector)
+            for incomplete in response.get('incomplete', [])
+        )
         
-        # Process incomplete results (potential issues that need manual review)
-        for incomplete in response.get('incomplete', []):
-            await self._create_incomplete_bug(
-                incomplete, 
-                page_url, 
-                viewport_key, 
-                result, 
-                evidence_collector
-            )
+        outcomes = await asyncio.gather(*coros, return_exceptions=True)
+        if logger.isEnabledFor(logging.WARNING):
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.warning("Failed to process accessibility result on %s", page_url, exc_info=outcome)
+        
+        # Fan the created bugs in with a single extend, in axe's result order
+        # (skipped duplicates come back as None)
+        result.findings.extend(outcome for outcome in outcomes if isinstance(outcome, Bug))
+    
+    @staticmethod
+    def _result_count(response: Dict[str, Any], key: str) -> int:
+        """Count an axe result group, which the narrowed payload may send as a plain number"""
+        value = response.get(key, [])
+        return value if isinstance(value, int) else len(value)
     
     async def _create_violation_bug(
         self, 
         violation: Dict[str, Any], 
         page_url: str, 
         viewport_key: str,
-        result: AccessibilityScanResult,
         evidence_collector: EvidenceCollector
-    ):
+    ) -> Optional[Bug]:
         """Create a Bug object from an axe violation"""
         
-        # Map severity
         axe_impact = violation.get('impact', 'moderate')
-        severity = self.SEVERITY_MAPPING.get(axe_impact, 'medium')
         
         # Build summary and description
         rule_id = violation.get('id', 'unknown')
@@ -226,12 +338,12 @@ class AccessibilityScanner(BaseScanner):
                 if failure_summary:
                     element_details.append(f"Element {selector}: {failure_summary}")
         
-        # Build WCAG guidelines
-        wcag_guidelines = []
-        tags = violation.get('tags', [])
-        for tag in tags:
-            if tag.startswith('wcag'):
-                wcag_guidelines.append(tag.upper())
+        # Same rule failing on the same elements at another viewport - skip the screenshot and Bug
+        if self._is_duplicate_finding('violation', rule_id, affected_elements):
+            return None
+        
+        # Build WCAG guidelines (cached per distinct tag set, copied into each finding)
+        wcag_guidelines = _wcag_guidelines(tuple(violation.get('tags', [])))
         
         # Capture screenshot for this violation if possible
         screenshot_path = None
@@ -246,7 +358,7 @@ class AccessibilityScanner(BaseScanner):
         evidence = Evidence(
             screenshot_path=screenshot_path,
             viewport=viewport_key,
-            wcag=wcag_guidelines
+            wcag=list(wcag_guidelines)
         )
         
         # Build technical details
@@ -258,31 +370,26 @@ class AccessibilityScanner(BaseScanner):
         
         # Create bug
         bug = Bug(
-            id=str(uuid.uuid4()),
-            type="Accessibility",
-            severity=severity,
+            **self._get_bug_template('violation', axe_impact),
+            id=new_bug_id(),
             page_url=page_url,
             summary=summary,
             suggested_fix=help_text,
             evidence=evidence,
             affected_elements=affected_elements,
-            wcag_guidelines=wcag_guidelines,
+            wcag_guidelines=list(wcag_guidelines),
             technical_details=technical_details,
-            impact_description=self._get_impact_description(axe_impact),
-            business_impact=self._get_business_impact(axe_impact),
-            category="Functional",
             tags=[f"axe-{rule_id}", f"wcag-{self.wcag_level.lower()}", "accessibility"]
         )
-        result.add_finding(bug)
+        return bug
     
     async def _create_incomplete_bug(
         self, 
         incomplete: Dict[str, Any], 
         page_url: str, 
         viewport_key: str,
-        result: AccessibilityScanResult,
         evidence_collector: EvidenceCollector
-    ):
+    ) -> Optional[Bug]:
         """Create a Bug object from an axe incomplete result (needs manual review)"""
         
         rule_id = incomplete.get('id', 'unknown')
@@ -301,37 +408,76 @@ class AccessibilityScanner(BaseScanner):
                 selector = target[0] if isinstance(target[0], str) else str(target[0])
                 affected_elements.append(selector)
         
-        # Build WCAG guidelines
-        wcag_guidelines = []
-        tags = incomplete.get('tags', [])
-        for tag in tags:
-            if tag.startswith('wcag'):
-                wcag_guidelines.append(tag.upper())
+        if self._is_duplicate_finding('incomplete', rule_id, affected_elements):
+            return None
+        
+        # Build WCAG guidelines (cached per distinct tag set, copied into each finding)
+        wcag_guidelines = _wcag_guidelines(tuple(incomplete.get('tags', [])))
         
         # Create evidence
         evidence = Evidence(
             viewport=viewport_key,
-            wcag=wcag_guidelines
+            wcag=list(wcag_guidelines)
         )
         
         # Create bug with low severity since it needs manual review
         bug = Bug(
-            id=str(uuid.uuid4()),
-            type="Accessibility",
-            severity="low",
+            **self._get_bug_template('incomplete'),
+            id=new_bug_id(),
             page_url=page_url,
             summary=summary,
             suggested_fix=f"Manual review required: {help_text}",
             evidence=evidence,
             affected_elements=affected_elements,
-            wcag_guidelines=wcag_guidelines,
+            wcag_guidelines=list(wcag_guidelines),
             technical_details=f"Rule: {rule_id}\nRequires manual accessibility review",
-            impact_description="Potential accessibility issue requiring manual verification",
-            category="Functional",
             tags=[f"axe-{rule_id}", "manual-review", "accessibility"]
         )
         
-        result.add_finding(bug)
+        return bug
+    
+    def _get_bug_template(self, kind: str, axe_impact: str = '') -> Dict[str, Any]:
+        """
+        Get the constant Bug fields for a finding kind and axe impact, building them on first use.
+        
+        Only immutable values live in a template; per-finding lists are passed separately.
+        """
+        key = (kind, axe_impact)
+        template = self._bug_templates.get(key)
+        if template is None:
+            if kind == 'violation':
+                template = {
+                    'type': BT_A11Y,
+                    'severity': self.SEVERITY_MAPPING.get(axe_impact, SEV_MED),
+                    'impact_description': self._get_impact_description(axe_impact),
+                    'business_impact': self._get_business_impact(axe_impact),
+                    'category': "Functional"
+                }
+            else:
+                template = {
+                    'type': BT_A11Y,
+                    'severity': SEV_LOW,
+                    'impact_description': "Potential accessibility issue requiring manual verification",
+                    'category': "Functional"
+                }
+            self._bug_templates[key] = template
+        return template
+    
+    def _is_duplicate_finding(self, kind: str, rule_id: str, affected_elements: List[str]) -> bool:
+        """
+        Check whether an identical finding was already reported in this multi-viewport scan.
+        
+        The finding is recorded as seen when it is new, so only the first viewport reporting it creates a Bug.
+        """
+        if self._seen_findings is None:
+            return False
+        
+        key = (kind, rule_id, tuple(affected_elements))
+        if key in self._seen_findings:
+            return True
+        
+        self._seen_findings.add(key)
+        return False
     
     def _get_wcag_tags(self) -> List[str]:
         """Get WCAG tags based on compliance level"""
@@ -374,54 +520,116 @@ class AccessibilityScanner(BaseScanner):
         }
         return business_impact_map.get(axe_impact, 'May affect accessibility compliance')
     
+    async def _wait_for_layout(self, page: Page, max_ms: int = 500):
+        """Wait for the page to lay out at its new size, capped at max_ms"""
+        try:
+            await page.evaluate(self._LAYOUT_SETTLED_JS, max_ms)
+        except Exception:
+            await asyncio.sleep(max_ms / 1000)
+    
+    async def _set_viewport(self, page: Page, viewport: Dict[str, Any]):
+        """Resize the page to a viewport and let it lay out, skipping pages already at that size"""
+        viewport_size = {"width": viewport['width'], "height": viewport['height']}
+        if page.viewport_size != viewport_size:
+            await page.set_viewport_size(viewport_size)
+            await self._wait_for_layout(page)  # Allow layout to settle
+    
+    async def _open_viewport_pages(self, page: Page, viewports: List[Dict[str, Any]]) -> List[Optional[Page]]:
+        """
+        Open one page on the current URL per viewport in the same browser context, sized
+        before it loads and navigated the same way as the inspected page, so axe sees the
+        same rendered content at every size. Returns None in place of pages that couldn't open.
+        """
+        async def open_one(viewport: Dict[str, Any]) -> Optional[Page]:
+            viewport_page = None
+            try:
+                viewport_page = await page.context.new_page()
+                await viewport_page.set_viewport_size({"width": viewport['width'], "height": viewport['height']})
+                if await PageSetup(viewport_page, page.url, DEFAULT_TIMEOUTS).navigate_safely():
+                    return viewport_page
+            except Exception:
+                logger.debug("Could not open page for viewport %s", viewport.get('name'), exc_info=True)
+            if viewport_page:
+                await viewport_page.close()
+            return None
+        
+        return list(await asyncio.gather(*(open_one(viewport) for viewport in viewports)))
+    
+    async def _run_axe_at_viewport(self, page: Page, viewport: Dict[str, Any]) -> Dict[str, Any]:
+        """Size the page to a viewport and run axe-core on it"""
+        await self._set_viewport(page, viewport)
+        return await self._run_axe(page, self._get_axe_options())
+    
     async def scan_all_viewports(self, page: Page, page_url: str, viewports: List[Dict[str, Any]] = None) -> AccessibilityScanResult:
         """
         Perform accessibility scan across multiple viewports to catch responsive design issues.
+        
+        Viewports after the first are loaded on their own pages in the same browser context
+        so the axe runs overlap. Results are still processed in viewport order, so a finding
+        seen at several sizes is reported for the same viewport as in a one-by-one scan.
         """
         if not viewports:
-            # Default viewports for accessibility testing
-            viewports = [
-                {"name": "desktop", "width": 1280, "height": 800},
-                {"name": "tablet", "width": 768, "height": 1024},
-                {"name": "mobile", "width": 375, "height": 667}
-            ]
+            viewports = self.DEFAULT_VIEWPORTS
         
         combined_result = AccessibilityScanResult()
+        self._seen_findings = set()
         
-        for viewport in viewports:
-            viewport_key = f"{viewport['width']}x{viewport['height']}"
-            viewport_name = viewport.get('name', viewport_key)
-            
-            if self.verbose:
-                print(f"    Testing accessibility in {viewport_name} ({viewport_key})")
-            
-            # Set viewport
-            await page.set_viewport_size({"width": viewport['width'], "height": viewport['height']})
-            await asyncio.sleep(0.5)  # Allow layout to settle
-            
-            # Run accessibility scan for this viewport
-            viewport_result = await self.scan(page, page_url, viewport_key)
+        if self.axe and len(viewports) > 1:
+            extra_pages = await self._open_viewport_pages(page, viewports[1:])
+        else:
+            extra_pages = [None] * (len(viewports) - 1)
+        viewport_pages = [page if self.axe else None] + extra_pages
+        
+        try:
+            scanned = [index for index, viewport_page in enumerate(viewport_pages) if viewport_page is not None]
+            responses = dict(zip(scanned, await asyncio.gather(
+                *(self._run_axe_at_viewport(viewport_pages[index], viewports[index]) for index in scanned),
+                return_exceptions=True
+            )))
             
-            # Merge results, but mark findings with viewport info
-            for finding in viewport_result.findings:
-                # Add viewport info to evidence and tags
-                if finding.evidence:
-                    finding.evidence.viewport = viewport_key
+            for index, viewport in enumerate(viewports):
+                viewport_key = f"{viewport['width']}x{viewport['height']}"
+                viewport_name = viewport.get('name', viewport_key)
+                
+                if self.verbose:
+                    print(f"    Testing accessibility in {viewport_name} ({viewport_key})")
+                
+                if index in responses:
+                    viewport_result = await self._build_scan_result(viewport_pages[index], page_url, viewport_key, responses[index])
                 else:
-                    finding.evidence = Evidence(viewport=viewport_key)
+                    # No page of its own - scan on the original page at this size
+                    await self._set_viewport(page, viewport)
+                    viewport_result = await self.scan(page, page_url, viewport_key)
                 
-                finding.tags.append(f"viewport-{viewport_name}")
+                # Merge results, but mark findings with viewport info
+                for finding in viewport_result.findings:
+                    # Add viewport info to evidence and tags
+                    if finding.evidence:
+                        finding.evidence.viewport = viewport_key
+                    else:
+                        finding.evidence = Evidence(viewport=viewport_key)
+                    
+                    finding.tags.append(f"viewport-{viewport_name}")
+                    
+                    # Update summary to include viewport context if this is a viewport-specific issue
+                    if viewport_name != "desktop":
+                        finding.summary = f"[{viewport_name}] {finding.summary}"
                 
-                # Update summary to include viewport context if this is a viewport-specific issue
-                if viewport_name != "desktop":
-                    finding.summary = f"[{viewport_name}] {finding.summary}"
-            
-            # Merge findings and counts
-            combined_result.findings.extend(viewport_result.findings)
-            combined_result.violations_count += viewport_result.violations_count
-            combined_result.passes_count += viewport_result.passes_count
-            combined_result.incomplete_count += viewport_result.incomplete_count
-            combined_result.inapplicable_count += viewport_result.inapplicable_count
+                # Merge findings and counts
+                combined_result.findings.extend(viewport_result.findings)
+                combined_result.violations_count += viewport_result.violations_count
+                combined_result.passes_count += viewport_result.passes_count
+                combined_result.incomplete_count += viewport_result.incomplete_count
+                combined_result.inapplicable_count += viewport_result.inapplicable_count
+        finally:
+            self._seen_findings = None
+            for viewport_page in extra_pages:
+                if viewport_page is None:
+                    continue
+                try:
+                    await viewport_page.close()
+                except Exception:
+                    pass
         
         # Update combined metadata
         combined_result.total_checks = combined_result.violations_count + combined_result.passes_count + combined_result.incomplete_count
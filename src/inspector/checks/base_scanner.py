@@ -1,13 +1,28 @@
 """
 Base scanner interface for modular scan architecture.
 """
+import itertools
+import uuid
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from playwright.async_api import Page
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 from core.types import Bug, PageResult
 
 
+# Bug ids only need to be unique within a run, so a random per-process prefix
+# plus a counter replaces an os.urandom() call for every finding
+_RUN_NONCE = uuid.uuid4().hex[:8]
+_BUG_CTR = itertools.count()
+
+
+def new_bug_id() -> str:
+    """Return a bug id that is unique within the current run"""
+    return f"{_RUN_NONCE}-{next(_BUG_CTR):x}"
+
+
 class BaseScanResult:
     """Base class for scan results"""
     def __init__(self, scan_type: str):
@@ -34,7 +49,7 @@ class BaseScanner(ABC):
         self.name = self.__class__.__name__
     
     @abstractmethod
-    async def scan(self, page: Page, page_url: str, viewport_key: str = None) -> BaseScanResult:
+    async def scan(self, page: "Page", page_url: str, viewport_key: str = None) -> BaseScanResult:
         """
         Perform the scan and return results.
         
@@ -68,12 +83,14 @@ class ScanConfig:
         accessibility: bool = True,
         ui_scans: bool = True,
         performance: bool = False,
-        model: str = 'cohere'
+        model: str = 'cohere',
+        max_concurrency: int = 8
     ):
         self.accessibility = accessibility
         self.ui_scans = ui_scans
         self.performance = performance
         self.model = model
+        self.max_concurrency = max_concurrency  # Pages inspected at once by a shared Inspector
     
     @classmethod
     def accessibility_only(cls, model: str = 'cohere') -> 'ScanConfig':
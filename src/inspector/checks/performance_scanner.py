@@ -5,12 +5,11 @@ This scanner takes the performance data collected by PerformanceTracker and anal
 against web performance standards to detect issues that impact user experience.
 """
 
-import uuid
 from typing import List, Dict, Any, Optional
 from playwright.async_api import Page
 
 from core.types import Bug, Evidence
-from inspector.checks.base_scanner import BaseScanner, BaseScanResult
+from inspector.checks.base_scanner import BaseScanner, BaseScanResult, new_bug_id
 from inspector.utils.performance import PerformanceTracker
 
 
@@ -20,6 +19,7 @@ class PerformanceScanResult(BaseScanResult):
     def __init__(self):
         super().__init__("Performance")
         self.performance_metrics: Dict[str, float] = {}
+        self.timings: Dict[str, float] = {}  # Load timings alone, without the Core Web Vitals
         self.thresholds_exceeded: List[str] = []
 
 
@@ -60,6 +60,78 @@ class PerformanceScanner(BaseScanner):
         'ssl_handshake': 200,              # SSL handshake should be < 200ms
     }
     
+    # Summary templates (formatted with value, threshold and their /1000 *_kb forms) and
+    # fix suggestions per metric, built once rather than for every finding
+    METRIC_DESCRIPTIONS = {
+        'largest_contentful_paint': (
+            "Largest Contentful Paint is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Optimize largest images/text blocks, improve server response time, use CDN"
+        ),
+        'first_contentful_paint': (
+            "First Contentful Paint is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Reduce server response time, eliminate render-blocking resources, optimize CSS"
+        ),
+        'cumulative_layout_shift': (
+            "Cumulative Layout Shift is high ({value:.3f} vs {threshold} target)",
+            "Set dimensions on images/videos, reserve space for dynamic content, use CSS containment"
+        ),
+        'total_load_time': (
+            "Page load time is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Optimize images, minify CSS/JS, reduce HTTP requests, use browser caching"
+        ),
+        'dom_content_loaded': (
+            "DOM Content Loaded is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Reduce initial HTML size, defer non-critical CSS/JS, optimize critical path"
+        ),
+        'dom_interactive': (
+            "DOM Interactive time is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Minimize parser-blocking scripts, optimize HTML structure, reduce DOM complexity"
+        ),
+        'slowest_resource_duration': (
+            "Slowest resource takes too long ({value:.0f}ms vs {threshold}ms target)",
+            "Identify and optimize slow resources, use compression, consider lazy loading"
+        ),
+        'average_resource_duration': (
+            "Average resource load time is high ({value:.0f}ms vs {threshold}ms target)",
+            "Optimize all resources, use compression, enable HTTP/2, consider CDN"
+        ),
+        'total_resource_size': (
+            "Total resource size is large ({value_kb:.0f}KB vs {threshold_kb}KB target)",
+            "Compress images, minify CSS/JS, remove unused resources, use modern formats"
+        ),
+        'resource_count': (
+            "Too many resources loaded ({value:.0f} vs {threshold} target)",
+            "Combine CSS/JS files, use CSS sprites, reduce number of images, bundle resources"
+        ),
+        'image_count': (
+            "Too many images loaded ({value:.0f} vs {threshold} target)",
+            "Use CSS sprites, lazy load images, combine decorative images, optimize formats"
+        ),
+        'script_count': (
+            "Too many script files ({value:.0f} vs {threshold} target)",
+            "Bundle JavaScript files, remove unused scripts, use code splitting"
+        ),
+        'stylesheet_count': (
+            "Too many CSS files ({value:.0f} vs {threshold} target)",
+            "Combine CSS files, inline critical CSS, remove unused styles"
+        ),
+        'dns_lookup': (
+            "DNS lookup is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Use faster DNS provider, implement DNS prefetching, reduce DNS lookups"
+        ),
+        'tcp_connect': (
+            "TCP connection is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Use keep-alive connections, implement connection pooling, use HTTP/2"
+        ),
+        'ssl_handshake': (
+            "SSL handshake is slow ({value:.0f}ms vs {threshold}ms target)",
+            "Optimize TLS configuration, use session resumption, consider OCSP stapling"
+        )
+    }
+    
+    # Metrics that are Core Web Vitals, whose impact is described in SEO terms
+    CORE_WEB_VITALS = frozenset({'largest_contentful_paint', 'first_contentful_paint', 'cumulative_layout_shift'})
+    
     # Severity mapping based on how much threshold is exceeded
     SEVERITY_MULTIPLIERS = {
         1.5: 'medium',    # 1.5x threshold = medium
@@ -95,8 +167,9 @@ class PerformanceScanner(BaseScanner):
         result = PerformanceScanResult()
         
         try:
-            # Collect performance metrics using existing PerformanceTracker
-            metrics = await self.performance_tracker.collect_timings(page)
+            # Collect timings and Core Web Vitals in one round trip
+            metrics, cwv_metrics = await self.performance_tracker.collect_page_metrics(page)
+            result.timings = dict(metrics)
             result.performance_metrics = metrics
             
             if not metrics:
@@ -104,8 +177,6 @@ class PerformanceScanner(BaseScanner):
                 result.add_finding(self._create_no_metrics_bug(page_url, viewport_key))
                 return result
             
-            # Collect Core Web Vitals separately
-            cwv_metrics = await self.performance_tracker.get_core_web_vitals(page)
             metrics.update(cwv_metrics)
             
             # Analyze each metric against thresholds
@@ -128,7 +199,7 @@ class PerformanceScanner(BaseScanner):
         except Exception as e:
             # Create error bug if performance analysis fails
             error_bug = Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="Performance",
                 severity="medium",
                 page_url=page_url,
@@ -161,7 +232,7 @@ class PerformanceScanner(BaseScanner):
             summary = f"[{viewport_key}] {summary}"
         
         return Bug(
-            id=str(uuid.uuid4()),
+            id=new_bug_id(),
             type="Performance",
             severity=severity,
             page_url=page_url,
@@ -175,78 +246,15 @@ class PerformanceScanner(BaseScanner):
     
     def _get_metric_description(self, metric_name: str, value: float, threshold: float) -> tuple[str, str]:
         """Get human-readable description and fix suggestion for a metric"""
-        
-        descriptions = {
-            'largest_contentful_paint': (
-                f"Largest Contentful Paint is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Optimize largest images/text blocks, improve server response time, use CDN"
-            ),
-            'first_contentful_paint': (
-                f"First Contentful Paint is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Reduce server response time, eliminate render-blocking resources, optimize CSS"
-            ),
-            'cumulative_layout_shift': (
-                f"Cumulative Layout Shift is high ({value:.3f} vs {threshold} target)",
-                "Set dimensions on images/videos, reserve space for dynamic content, use CSS containment"
-            ),
-            'total_load_time': (
-                f"Page load time is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Optimize images, minify CSS/JS, reduce HTTP requests, use browser caching"
-            ),
-            'dom_content_loaded': (
-                f"DOM Content Loaded is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Reduce initial HTML size, defer non-critical CSS/JS, optimize critical path"
-            ),
-            'dom_interactive': (
-                f"DOM Interactive time is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Minimize parser-blocking scripts, optimize HTML structure, reduce DOM complexity"
-            ),
-            'slowest_resource_duration': (
-                f"Slowest resource takes too long ({value:.0f}ms vs {threshold}ms target)",
-                "Identify and optimize slow resources, use compression, consider lazy loading"
-            ),
-            'average_resource_duration': (
-                f"Average resource load time is high ({value:.0f}ms vs {threshold}ms target)",
-                "Optimize all resources, use compression, enable HTTP/2, consider CDN"
-            ),
-            'total_resource_size': (
-                f"Total resource size is large ({value/1000:.0f}KB vs {threshold/1000}KB target)",
-                "Compress images, minify CSS/JS, remove unused resources, use modern formats"
-            ),
-            'resource_count': (
-                f"Too many resources loaded ({value:.0f} vs {threshold} target)",
-                "Combine CSS/JS files, use CSS sprites, reduce number of images, bundle resources"
-            ),
-            'image_count': (
-                f"Too many images loaded ({value:.0f} vs {threshold} target)",
-                "Use CSS sprites, lazy load images, combine decorative images, optimize formats"
-            ),
-            'script_count': (
-                f"Too many script files ({value:.0f} vs {threshold} target)",
-                "Bundle JavaScript files, remove unused scripts, use code splitting"
-            ),
-            'stylesheet_count': (
-                f"Too many CSS files ({value:.0f} vs {threshold} target)",
-                "Combine CSS files, inline critical CSS, remove unused styles"
-            ),
-            'dns_lookup': (
-                f"DNS lookup is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Use faster DNS provider, implement DNS prefetching, reduce DNS lookups"
-            ),
-            'tcp_connect': (
-                f"TCP connection is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Use keep-alive connections, implement connection pooling, use HTTP/2"
-            ),
-            'ssl_handshake': (
-                f"SSL handshake is slow ({value:.0f}ms vs {threshold}ms target)",
-                "Optimize TLS configuration, use session resumption, consider OCSP stapling"
+        description = self.METRIC_DESCRIPTIONS.get(metric_name)
+        if description is None:
+            return (
+                f"Performance metric {metric_name} exceeds threshold ({value:.1f} vs {threshold})",
+                "Review and optimize this performance metric"
             )
-        }
         
-        return descriptions.get(metric_name, (
-            f"Performance metric {metric_name} exceeds threshold ({value:.1f} vs {threshold})",
-            "Review and optimize this performance metric"
-        ))
+        summary, fix_suggestion = description
+        return summary.format(value=value, threshold=threshold, value_kb=value / 1000, threshold_kb=threshold / 1000), fix_suggestion
     
     def _get_impact_description(self, metric_name: str, ratio: float) -> str:
         """Get impact description based on metric and severity ratio"""
@@ -260,8 +268,7 @@ class PerformanceScanner(BaseScanner):
         else:
             impact_level = "minor"
         
-        core_vitals = ['largest_contentful_paint', 'first_contentful_paint', 'cumulative_layout_shift']
-        if metric_name in core_vitals:
+        if metric_name in self.CORE_WEB_VITALS:
             return f"This {impact_level} Core Web Vitals issue directly impacts Google search rankings and user experience"
         else:
             return f"This {impact_level} performance issue may cause user frustration and increased bounce rates"
@@ -285,7 +292,7 @@ class PerformanceScanner(BaseScanner):
             summary = f"[{viewport_key}] {summary}"
         
         return Bug(
-            id=str(uuid.uuid4()),
+            id=new_bug_id(),
             type="Performance",
             severity="medium",
             page_url=page_url,
@@ -319,7 +326,7 @@ class PerformanceScanner(BaseScanner):
             severity = "critical" if failing_count == 3 else "high"
             
             bug = Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="Performance",
                 severity=severity,
                 page_url=page_url,
@@ -352,7 +359,7 @@ class PerformanceScanner(BaseScanner):
                     summary = f"[{viewport_key}] {summary}"
                 
                 bug = Bug(
-                    id=str(uuid.uuid4()),
+                    id=new_bug_id(),
                     type="Performance",
                     severity="medium",
                     page_url=page_url,
@@ -1,21 +1,48 @@
-import uuid
+import os
 import time
 import asyncio
-from typing import List, Dict, Any, Optional
-from playwright.async_api import Page
+import hashlib
+from functools import lru_cache
+from types import MappingProxyType
+from urllib.parse import urldefrag, urlparse
+from typing import List, Dict, Any, Optional, Iterable, Sequence
+from playwright.async_api import Page, Response
 
 
 from core.types import Bug, Evidence, PageResult
-from inspector.utils.evidence import EvidenceCollector
+from inspector.utils.evidence import EvidenceCollector, read_screenshot
+from inspector.checks.base_scanner import new_bug_id
 from inspector.utils.performance import PerformanceTracker
 from inspector.utils.action_recorder import ActionRecorder
-from inspector.utils.analyzer_factory import analyze_screenshot
+from inspector.utils.analyzer_factory import PerceptualHashIndex, analyze_screenshot_bytes, downscale_for_analysis, is_model_available, perceptual_hash
 from inspector.utils.scroll_manager import ScrollManager
 from inspector.utils.interaction_tracker import InteractionTracker
 from inspector.playwright_helpers.link_detection import LinkDetector
+from inspector.playwright_helpers.page_setup import DEFAULT_TIMEOUTS, PageSetup, evaluate_kernel
 
 
 
+# Analytics, ad and chat widget hosts whose requests never affect what exploration
+# tests, but slow down settling and can inject overlays into screenshots
+BLOCKED_HOSTS = (
+    'googletagmanager.com',
+    'google-analytics.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'hotjar.com',
+    'segment.io',
+    'segment.com',
+    'intercom.io',
+    'connect.facebook.net',
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_blocked_host(host: str) -> bool:
+    """Check whether a host is one of BLOCKED_HOSTS or a subdomain of one"""
+    return any(host == blocked or host.endswith('.' + blocked) for blocked in BLOCKED_HOSTS)
+
+
 class StructuredExplorer:
     """
     Simple, direct page exploration that finds forms and interactive elements,
@@ -23,22 +50,715 @@ class StructuredExplorer:
     """
     
     # Default viewports to explore
-    DEFAULT_VIEWPORTS = [
+    DEFAULT_VIEWPORTS = (
         {"name": "desktop", "width": 1280, "height": 800},
         {"name": "tablet", "width": 768, "height": 1024},
         {"name": "mobile", "width": 375, "height": 667}
-    ]
+    )
+    
+    # Resource types aborted while exploring. Images and stylesheets are only blocked
+    # on request since the screenshots sent for visual analysis usually need them.
+    LIGHT_BLOCKED_RESOURCES = frozenset({'font', 'media', 'texttrack', 'beacon', 'ping', 'csp_report'})
+    HEAVY_BLOCKED_RESOURCES = LIGHT_BLOCKED_RESOURCES | {'image', 'imageset', 'stylesheet'}
+    
+    # Screenshot analyses allowed in flight at once, shared by all viewport passes.
+    # Override with MANTIS_ANALYSIS_CONCURRENCY to match the model account's rate limit.
+    MAX_CONCURRENT_ANALYSES = 4
+    
+    # Viewports explored at once, each on its own page in the browser context. Lower it
+    # with MANTIS_VIEWPORT_CONCURRENCY when the browser is short on memory.
+    MAX_CONCURRENT_VIEWPORTS = 3
+    
+    # Screenshots whose perceptual hashes differ by at most this many bits look the
+    # same, so only the first of them is sent for analysis
+    PERCEPTUAL_HASH_DISTANCE = 4
+    
+    # Capture modes whose screenshots are compared perceptually, and only with earlier
+    # captures of the same mode. The others only skip byte-identical screenshots: text in
+    # an input or a small dropdown barely changes a perceptual hash, but is what they test.
+    PERCEPTUAL_DEDUPE_MODES = frozenset({'scroll', 'accordions'})
+    
+    # Points at which a screenshot is captured for analysis
+    CAPTURE_MODES = frozenset({'scroll', 'forms', 'dropdowns', 'modals', 'accordions'})
+    
+    # Edge case data designed to test layout limits, keyed by input type. These tables are
+    # shared by every explorer instance, so they're kept read-only.
+    EDGE_CASE_DATA = MappingProxyType({
+        'text': 'This is an extremely long text input that should test how the form handles very long content that might overflow containers or break layouts in unexpected ways when the user enters much more text than anticipated by the designer',
+        'email': 'very.very.very.long.email.address.that.might.break.layout@extremely.long.domain.name.that.could.cause.issues.example.com',
+        'password': 'VeryLongPasswordThatMightBreakLayoutsWhenDisplayed123!@#$%^&*()',
+        'tel': '555-123-4567-extension-9999-department-sales-very-long-phone-number',
+        'url': 'https://extremely.long.domain.name.that.might.cause.layout.issues.when.displayed.in.forms.example.com/very/long/path/that/continues',
+        'number': '999999999999999999999',
+        'search': 'Very long search query with lots of special characters !@#$%^&*()_+ that might break search input layouts and cause overflow',
+        'textarea': 'This is extremely long textarea content that spans multiple lines and contains various special characters !@#$%^&*()_+ and should test how well the textarea handles large amounts of content without breaking the surrounding layout or causing overflow issues that might affect other page elements. This text continues for a very long time to really test the boundaries of what the textarea can handle without breaking the page layout or causing visual problems for users.'
+    })
+    
+    # Triggers for the interactive elements exercised at each scroll position
+    DROPDOWN_SELECTORS = (
+        '.dropdown-toggle',
+        '[data-toggle="dropdown"]',
+        '[data-bs-toggle="dropdown"]',
+        '.nav-item.dropdown > a',
+        'button[aria-expanded]',          # Modern ARIA dropdowns
+        'button[aria-controls]',          # ARIA controlled elements
+        '[data-toggle="collapse"]',       # Collapsible elements
+        '[data-bs-toggle="collapse"]',    # Bootstrap 5 collapse
+        '.hamburger',                     # Mobile hamburger menus
+        '.menu-toggle',                   # Generic menu toggles
+        '.navbar-toggler'                 # Bootstrap navbar toggles
+    )
+    
+    MODAL_SELECTORS = (
+        '[data-toggle="modal"]',
+        '[data-bs-toggle="modal"]',
+        '[data-target*="modal"]',
+        '[data-bs-target*="modal"]',
+        'button:has(+ .modal)',
+        '.modal-trigger'
+    )
+    
+    ACCORDION_SELECTORS = (
+        '.accordion-button',
+        '[data-toggle="collapse"]',
+        '[data-bs-toggle="collapse"]',
+        'details summary',
+        '.collapsible-header'
+    )
+    
+    # Dropdown, modal and accordion triggers, discovered together at each scroll position
+    INTERACTIVE_SELECTOR_GROUPS = (DROPDOWN_SELECTORS, MODAL_SELECTORS, ACCORDION_SELECTORS)
+    
+    # Close buttons inside an open modal
+    MODAL_CLOSE_SELECTORS = ('.modal :is(.close, [data-dismiss="modal"], [data-bs-dismiss="modal"])',)
+    
+    # Common overlays that might block clicks
+    OVERLAY_SELECTORS = (
+        '.modal-backdrop',
+        '.overlay',
+        '.loading-overlay',
+        '[data-dismiss="modal"]',
+        '[data-bs-dismiss="modal"]',
+        '.close',
+        'button:has-text("Close")',
+        'button:has-text("×")'
+    )
+    
+    # Sets each [selector, value] pair on the first visible, editable match and fires the
+    # input/change events frameworks listen for. Only textareas and text-like inputs are
+    # written; buttons, checkboxes, radios and selects are left alone and reported as
+    # skipped. Returns {failed, skipped} selector lists.
+    # Every target is resolved before anything is written, so the visibility checks share
+    # one layout instead of re-running it after each framework's input handler; selectors
+    # that only match, or whose match was replaced, once earlier fields are filled are
+    # looked up again afterwards.
+    _FILL_INPUTS_JS = """
+    (pairs) => {
+        const TEXT_TYPES = new Set(['text', 'email', 'password', 'tel', 'url', 'number', 'search']);
+        const isTextLike = (element) => {
+            if (element.tagName === 'TEXTAREA') return true;
+            if (element.tagName !== 'INPUT') return false;
+            const type = element.getAttribute('type');
+            return type === null || TEXT_TYPES.has(type.toLowerCase());
+        };
+        const resolve = (selector) => {
+            try {
+                return Array.from(document.querySelectorAll(selector))
+                    .find(candidate => candidate.getClientRects().length > 0) || null;
+            } catch (e) {
+                return null;
+            }
+        };
+        const targets = pairs.map(([selector]) => resolve(selector));
+        const failed = [];
+        const skipped = [];
+        pairs.forEach(([selector, value], index) => {
+            // A target an earlier field's handler re-rendered away is looked up again
+            const element = (targets[index] && targets[index].isConnected) ? targets[index] : resolve(selector);
+            if (element && !isTextLike(element)) {
+                skipped.push(selector);
+                return;
+            }
+            if (!element || element.disabled || element.readOnly) {
+                failed.push(selector);
+                return;
+            }
+            
+            // Respect maxlength like typing would, and go through the prototype setter so
+            // frameworks that track the value property see the change
+            const text = element.maxLength > 0 ? value.slice(0, element.maxLength) : value;
+            const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value');
+            if (setter && setter.set) {
+                setter.set.call(element, text);
+            } else {
+                element.value = text;
+            }
+            element.dispatchEvent(new Event('input', { bubbles: true }));
+            element.dispatchEvent(new Event('change', { bubbles: true }));
+        });
+        return { failed, skipped };
+    }
+    """
+    
+    # Resolves once finite animations started by the last interaction have finished
+    # (checked two frames later so freshly triggered transitions are picked up), or
+    # after maxMs. Infinite animations like spinners are ignored.
+    _WAIT_SETTLED_JS = """
+    (maxMs) => new Promise(resolve => {
+        const timer = setTimeout(resolve, maxMs);
+        requestAnimationFrame(() => requestAnimationFrame(() => {
+            const running = document.getAnimations().filter(a =>
+                a.playState === 'running' &&
+                !(a.effect && a.effect.getComputedTiming().endTime === Infinity)
+            );
+            Promise.all(running.map(a => a.finished.catch(() => {}))).then(() => {
+                clearTimeout(timer);
+                resolve();
+            });
+        }));
+    })
+    """
+    
+    # Clicks the first visible element matching any of the selectors, in order, and reports
+    # whether one was found. Playwright's `tag:has-text("...")` form is matched by hand as
+    # a case-insensitive substring of the element's text.
+    _DISMISS_OVERLAY_JS = """
+    (selectors) => {
+        const isVisible = (element) => element.getClientRects().length > 0 &&
+            window.getComputedStyle(element).visibility !== 'hidden';
+        
+        // Several has-text selectors scan the same elements, so normalize each one's text once
+        const normalizedText = new Map();
+        const textOf = (element) => {
+            if (!normalizedText.has(element)) {
+                normalizedText.set(element, element.textContent.replace(/\\s+/g, ' ').toLowerCase());
+            }
+            return normalizedText.get(element);
+        };
+        
+        const matchAll = (selector) => {
+            const hasText = selector.match(/^([\\w-]*):has-text\\("(.*)"\\)$/);
+            if (!hasText) return document.querySelectorAll(selector);
+            const text = hasText[2].toLowerCase();
+            return [...document.querySelectorAll(hasText[1] || '*')].filter(element => textOf(element).includes(text));
+        };
+        
+        for (const selector of selectors) {
+            let matches;
+            try {
+                matches = matchAll(selector);
+            } catch (e) {
+                continue;
+            }
+            for (const element of matches) {
+                if (isVisible(element)) {
+                    element.click();
+                    return true;
+                }
+            }
+        }
+        return false;
+    }
+    """
+    
+    # Standalone inputs (not inside forms) considered for edge case testing
+    _STANDALONE_INPUT_SELECTOR = 'input:not(form input):not([type="hidden"]), textarea:not(form textarea)'
     
-    def __init__(self, output_dir: str, model: str = 'cohere', verbose: bool = False):
+    # Discovers forms and standalone inputs with a usable selector for each input.
+    # Visibility is checked separately so the result can be reused across scroll positions.
+    # Don't call this directly: it runs as part of _VISIBLE_FORMS_JS.
+    _FORM_DISCOVERY_JS = """
+    (standaloneSelector) => {
+        const FORM_INPUTS = 'input:not([type="hidden"]), textarea, select';
+        
+        // Helper function to create more specific selectors
+        const createBestSelector = (input, containerIndex) => {
+            // Priority: ID > name > data attributes > class + type > placeholder (with container context)
+            if (input.id) {
+                return `#${input.id}`;
+            }
+            
+            if (input.name) {
+                return `[name="${input.name}"]`;
+            }
+            
+            // Check for data attributes that could make selector more specific
+            const dataAttrs = [];
+            for (const attr of input.attributes) {
+                if (attr.name.startsWith('data-') && attr.value) {
+                    dataAttrs.push(`[${attr.name}="${attr.value}"]`);
+                }
+            }
+            if (dataAttrs.length > 0) {
+                return `${input.tagName.toLowerCase()}${dataAttrs.join('')}`;
+            }
+            
+            // Use class + type if available (classList skips stray whitespace in the class attribute)
+            if (input.classList.length > 0 && input.type) {
+                return `${input.tagName.toLowerCase()}[type="${input.type}"].${CSS.escape(input.classList[0])}`;
+            }
+            
+            // Last resort: placeholder with additional context
+            if (input.placeholder) {
+                const tagType = input.type ? `[type="${input.type}"]` : '';
+                // Add container context to make it more specific
+                return `${input.tagName.toLowerCase()}${tagType}[placeholder="${input.placeholder}"]:nth-of-type(${containerIndex + 1})`;
+            }
+            
+            return null;
+        };
+        
+        // position is the input's index among its form's inputs, so the visibility check
+        // can find it again without re-running its selector
+        const describeInputs = (inputs) => {
+            const described = [];
+            inputs.forEach((input, inputIndex) => {
+                const selector = createBestSelector(input, inputIndex);
+                if (!selector) return;
+                described.push({
+                    type: input.type || input.tagName.toLowerCase(),
+                    name: input.name,
+                    id: input.id,
+                    placeholder: input.placeholder,
+                    selector: selector,
+                    position: inputIndex
+                });
+            });
+            return described;
+        };
+        
+        const entries = [];
+        document.querySelectorAll('form').forEach((form, index) => {
+            const inputs = describeInputs(form.querySelectorAll(FORM_INPUTS));
+            if (inputs.length > 0) {
+                entries.push({ type: 'form', index: index, inputs: inputs });
+            }
+        });
+        document.querySelectorAll(standaloneSelector).forEach((input, index) => {
+            const selector = createBestSelector(input, index);
+            if (!selector) return;
+            entries.push({
+                type: 'standalone_input',
+                index: index,
+                inputs: [{
+                    type: input.type || input.tagName.toLowerCase(),
+                    name: input.name,
+                    id: input.id,
+                    placeholder: input.placeholder,
+                    selector: selector
+                }]
+            });
+        });
+        
+        return entries;
+    }
+    """
+    
+    # For each discovered form/input entry, returns per-input visibility in the current
+    # viewport (an empty list when the form itself isn't visible). Runs as part of _VISIBLE_FORMS_JS.
+    _FORM_VISIBILITY_JS = """
+    ([standaloneSelector, entries]) => {
+        // Viewport size and layout don't change during this read-only pass, so read the
+        // size once and check cheap geometry before the costlier computed style
+        const viewportHeight = window.innerHeight;
+        const viewportWidth = window.innerWidth;
+        
+        // Each element's computed style is looked up at most once per pass: siblings share
+        // ancestors, and checked elements (forms, nav containers) are often ancestors of others
+        const styles = new Map();
+        const styleOf = (node) => {
+            if (!styles.has(node)) styles.set(node, window.getComputedStyle(node));
+            return styles.get(node);
+        };
+        
+        // Opacity isn't inherited, so an element inside a faded-out container (a closed menu
+        // or modal mid-transition) still reports its own; check a few ancestors as well
+        const isTransparent = (node) => parseFloat(styleOf(node).opacity) < 0.01;
+        const isFadedOut = (element) => {
+            let ancestor = element.parentElement;
+            for (let depth = 0; ancestor && depth < 5; depth++, ancestor = ancestor.parentElement) {
+                if (isTransparent(ancestor)) return true;
+            }
+            return false;
+        };
+        
+        // Helper function to check if element is truly visible AND in current viewport
+        const isElementVisible = (element) => {
+            if (!element) return false;
+            
+            // Check basic visibility
+            if (element.offsetParent === null) return false;
+            
+            // Check if element has dimensions
+            const rect = element.getBoundingClientRect();
+            if (rect.width === 0 && rect.height === 0) return false;
+            
+            // Check if element is positioned completely off-screen
+            if (rect.right < 0 || rect.bottom < 0 || 
+                rect.left > viewportWidth || rect.top > viewportHeight) return false;
+            
+            // Calculate visible area of element
+            const visibleTop = Math.max(0, rect.top);
+            const visibleLeft = Math.max(0, rect.left);
+            const visibleBottom = Math.min(viewportHeight, rect.bottom);
+            const visibleRight = Math.min(viewportWidth, rect.right);
+            
+            // Element must have some visible area
+            if (visibleTop >= visibleBottom || visibleLeft >= visibleRight) return false;
+            
+            // Calculate percentage of element that's visible
+            const elementArea = rect.width * rect.height;
+            const visibleArea = (visibleRight - visibleLeft) * (visibleBottom - visibleTop);
+            const visibilityRatio = visibleArea / elementArea;
+            
+            // Element must be at least 30% visible to be considered testable
+            // This prevents testing elements that are barely visible at viewport edges
+            if (visibilityRatio < 0.3) return false;
+            
+            // Check computed style
+            const style = styleOf(element);
+            return !(style.display === 'none' || 
+                     style.visibility === 'hidden' || 
+                     isTransparent(element) ||
+                     isFadedOut(element));
+        };
+        
+        // Finds an input by its discovered position, re-running its selector only if the
+        // form has changed since discovery and that position now holds something else
+        const findInput = (formInputs, container, input) => {
+            const candidate = formInputs[input.position];
+            if (candidate && candidate.matches(input.selector)) return candidate;
+            return container.querySelector(input.selector) || document.querySelector(input.selector);
+        };
+        
+        const forms = document.querySelectorAll('form');
+        const standalone = document.querySelectorAll(standaloneSelector);
+        
+        return entries.map(entry => {
+            const container = entry.type === 'form' ? forms[entry.index] : standalone[entry.index];
+            if (!isElementVisible(container)) return [];
+            if (entry.type !== 'form') return [true];
+            const formInputs = container.querySelectorAll('input:not([type="hidden"]), textarea, select');
+            return entry.inputs.map(input => isElementVisible(findInput(formInputs, container, input)));
+        });
+    }
+    """
+    
+    # Forms and standalone inputs with at least one input visible in the current viewport,
+    # keeping only their visible inputs. When the kernels are injected, discovery is reused
+    # from the previous call until the DOM changes (see __mantisDomVersion).
+    _VISIBLE_FORMS_JS = f"""
+    (standaloneSelector) => {{
+        const discover = {_FORM_DISCOVERY_JS};
+        const visibility = {_FORM_VISIBILITY_JS};
+        
+        const domVersion = window.__mantisDomVersion ? window.__mantisDomVersion() : null;
+        const cached = window.__mantisFormEntries;
+        let entries;
+        if (domVersion !== null && cached && cached.selector === standaloneSelector && cached.version === domVersion) {{
+            entries = cached.entries;
+        }} else {{
+            entries = discover(standaloneSelector);
+            if (domVersion !== null) {{
+                window.__mantisFormEntries = {{ selector: standaloneSelector, version: domVersion, entries }};
+            }}
+        }}
+        
+        const inputVisibility = visibility([standaloneSelector, entries]);
+        return entries
+            .map((entry, i) => ({{ ...entry, inputs: entry.inputs.filter((input, j) => inputVisibility[i][j]) }}))
+            .filter(entry => entry.inputs.length > 0);
+    }}
+    """
+    
+    # For each selector group, the elements visible in the current viewport that match it
+    _VISIBLE_ELEMENT_GROUPS_JS = """
+    (groups) => {
+        // Viewport size and layout don't change during this read-only pass, so read the
+        // size once and check cheap geometry before the costlier computed style
+        const viewportHeight = window.innerHeight;
+        const viewportWidth = window.innerWidth;
+        
+        // Each element's computed style is looked up at most once per pass: siblings share
+        // ancestors, and checked elements (forms, nav containers) are often ancestors of others
+        const styles = new Map();
+        const styleOf = (node) => {
+            if (!styles.has(node)) styles.set(node, window.getComputedStyle(node));
+            return styles.get(node);
+        };
+        
+        // Opacity isn't inherited, so an element inside a faded-out container (a closed menu
+        // or modal mid-transition) still reports its own; check a few ancestors as well
+        const isTransparent = (node) => parseFloat(styleOf(node).opacity) < 0.01;
+        const isFadedOut = (element) => {
+            let ancestor = element.parentElement;
+            for (let depth = 0; ancestor && depth < 5; depth++, ancestor = ancestor.parentElement) {
+                if (isTransparent(ancestor)) return true;
+            }
+            return false;
+        };
+        
+        // Enhanced viewport visibility checker from Phase 3
+        const isElementInViewport = (element) => {
+            if (!element) return false;
+            
+            // Check basic visibility
+            if (element.offsetParent === null) return false;
+            
+            // Check if element has dimensions
+            const rect = element.getBoundingClientRect();
+            if (rect.width === 0 && rect.height === 0) return false;
+            
+            // Check if element is positioned completely off-screen
+            if (rect.right < 0 || rect.bottom < 0 || 
+                rect.left > viewportWidth || rect.top > viewportHeight) return false;
+            
+            // Calculate visible area of element
+            const visibleTop = Math.max(0, rect.top);
+            const visibleLeft = Math.max(0, rect.left);
+            const visibleBottom = Math.min(viewportHeight, rect.bottom);
+            const visibleRight = Math.min(viewportWidth, rect.right);
+            
+            // Element must have some visible area
+            if (visibleTop >= visibleBottom || visibleLeft >= visibleRight) return false;
+            
+            // Calculate percentage of element that's visible
+            const elementArea = rect.width * rect.height;
+            const visibleArea = (visibleRight - visibleLeft) * (visibleBottom - visibleTop);
+            const visibilityRatio = visibleArea / elementArea;
+            
+            // Element must be at least 30% visible to be considered testable
+            if (visibilityRatio < 0.3) return false;
+            
+            // Check computed style
+            const style = styleOf(element);
+            return !(style.display === 'none' || 
+                     style.visibility === 'hidden' || 
+                     isTransparent(element) ||
+                     isFadedOut(element));
+        };
+        
+        // What makes an element's selector specific - its id, or a suffix for the group's
+        // base selector - worked out once per element however many groups it falls in
+        const selectorParts = new Map();
+        const selectorPartOf = (element) => {
+            if (selectorParts.has(element)) return selectorParts.get(element);
+            
+            let part = null;
+            if (element.id) {
+                part = { id: `#${element.id}` };
+            } else if (element.name) {
+                part = { suffix: `[name="${element.name}"]` };
+            } else {
+                // Check for data attributes
+                const dataAttr = [...element.attributes].find(attr => attr.name.startsWith('data-') && attr.value);
+                if (dataAttr) {
+                    part = { suffix: `[${dataAttr.name}="${dataAttr.value}"]` };
+                } else if (element.classList.length > 0) {
+                    // Use class if available (classList also covers SVG elements, whose className isn't a string)
+                    part = { suffix: `.${CSS.escape(element.classList[0])}` };
+                }
+            }
+            selectorParts.set(element, part);
+            return part;
+        };
+        
+        const createBestSelector = (element, baseSelector, index) => {
+            // Try to create the most specific selector possible
+            const part = selectorPartOf(element);
+            if (part) return part.id || `${baseSelector}${part.suffix}`;
+            
+            // Last resort: use base selector with nth-of-type
+            return `${baseSelector}:nth-of-type(${index + 1})`;
+        };
+        
+        // Which group each matching element falls in, under the first of the group's selectors
+        // it matches, with its index among that selector's matches for nth-of-type fallbacks.
+        // This depends only on the DOM's structure and attributes, so when the kernels are
+        // injected it's reused across calls until the DOM changes (see __mantisDomVersion).
+        const matchGroups = () => {
+            // One DOM walk over the union of all selectors in all groups; elements come
+            // back once, in document order, even if several selectors match them
+            const distinctSelectors = [...new Set(groups.flat())];
+            const groupSelectorIndices = groups.map(selectors => selectors.map(selector => distinctSelectors.indexOf(selector)));
+            const matchCounts = groups.map(selectors => new Array(selectors.length).fill(0));
+            const matches = [];
+            
+            for (const element of document.querySelectorAll(distinctSelectors.join(', '))) {
+                // Match each distinct selector once, even if it appears in several groups
+                const matched = distinctSelectors.map(selector => element.matches(selector));
+                
+                const bases = groups.map((selectors, g) => {
+                    let baseIndex = -1;
+                    for (let s = 0; s < selectors.length; s++) {
+                        if (matched[groupSelectorIndices[g][s]]) {
+                            if (baseIndex === -1) baseIndex = s;
+                            matchCounts[g][s]++;
+                        }
+                    }
+                    return baseIndex === -1 ? null : [baseIndex, matchCounts[g][baseIndex] - 1];
+                });
+                matches.push({ element, bases });
+            }
+            return matches;
+        };
+        
+        const cacheKey = JSON.stringify(groups);
+        const domVersion = window.__mantisDomVersion ? window.__mantisDomVersion() : null;
+        const cached = window.__mantisGroupMatches;
+        let matches;
+        if (domVersion !== null && cached && cached.key === cacheKey && cached.version === domVersion) {
+            matches = cached.matches;
+        } else {
+            matches = matchGroups();
+            if (domVersion !== null) {
+                window.__mantisGroupMatches = { key: cacheKey, version: domVersion, matches };
+            }
+        }
+        
+        // Signature part the interaction tracker derives from a base selector, worked out
+        // once per selector here rather than once per element in Python
+        const baseKeys = new Map();
+        const baseKeyOf = (selector) => {
+            if (!baseKeys.has(selector)) baseKeys.set(selector, selector.split('.').pop().split('[')[0]);
+            return baseKeys.get(selector);
+        };
+        
+        const visibleGroups = groups.map(() => []);
+        for (const { element, bases } of matches) {
+            // Read lazily and at most once, however many groups the element falls in
+            let inViewport = null;
+            let text = null;
+            
+            bases.forEach((base, g) => {
+                if (base === null) return;
+                
+                if (inViewport === null) inViewport = isElementInViewport(element);
+                if (inViewport) {
+                    const [baseIndex, i] = base;
+                    const selector = groups[g][baseIndex];
+                    if (text === null) text = element.textContent ? element.textContent.trim().substring(0, 50) : '';
+                    visibleGroups[g].push({ baseIndex, index: i, info: {
+                        selector: createBestSelector(element, selector, i),
+                        baseSelector: selector,
+                        baseKey: baseKeyOf(selector),
+                        text: text,
+                        textKey: text.substring(0, 20) || 'no-text',
+                        tagName: element.tagName.toLowerCase(),
+                        ariaExpanded: element.getAttribute('aria-expanded'),
+                        index: i
+                    }});
+                }
+            });
+        }
+        
+        // Callers only test the first few triggers of a group, so list them in selector
+        // priority order (specific selectors before generic ones) rather than document order
+        return visibleGroups.map(entries => entries
+            .sort((a, b) => a.baseIndex - b.baseIndex || a.index - b.index)
+            .map(entry => entry.info));
+    }
+    """
+    
+    # Installed into every page of the inspector's browser context (see install_dom_kernels)
+    # so the discovery scripts above, and the link detector's page scans, are parsed once per
+    # document instead of sent with every call
+    _DOM_KERNELS_INIT_SCRIPT = f"""
+    // Counts DOM changes so kernels can reuse what they matched while nothing has changed.
+    // Pending mutation records are taken on read, so a change just before a call counts.
+    // Observing starts on the first read, so pages no kernel looks at (like the ones the
+    // performance scanner measures) never pay for the observer. Reads null without a document.
+    (() => {{
+        let version = null;
+        const observer = new MutationObserver(() => {{ version++; }});
+        window.__mantisDomVersion = () => {{
+            if (version === null) {{
+                if (!document.documentElement) return null;
+                observer.observe(document.documentElement, {{ childList: true, subtree: true, attributes: true }});
+                version = 0;
+            }} else if (observer.takeRecords().length) {{
+                version++;
+            }}
+            return version;
+        }};
+    }})();
+    window.__mantisKernels = {{
+        visibleForms: {_VISIBLE_FORMS_JS},
+        fillInputs: {_FILL_INPUTS_JS},
+        visibleElementGroups: {_VISIBLE_ELEMENT_GROUPS_JS},
+        waitSettled: {_WAIT_SETTLED_JS},
+        dismissOverlay: {_DISMISS_OVERLAY_JS},
+        linkScan: {LinkDetector._LINK_SCAN_JS},
+        navigationMetadata: {LinkDetector._NAVIGATION_METADATA_JS}
+    }};
+    """
+    
+    # Settles using the injected kernel (or a plain delay without it), then reads the
+    # element's aria-expanded state
+    _SETTLE_AND_READ_ARIA_JS = """
+    async (element, maxMs) => {
+        if (window.__mantisKernels) {
+            await window.__mantisKernels.waitSettled(maxMs);
+        } else {
+            await new Promise(resolve => setTimeout(resolve, maxMs));
+        }
+        return element.getAttribute('aria-expanded');
+    }
+    """
+    
+    def __init__(self, output_dir: str, model: str = 'cohere', verbose: bool = False, block_heavy_resources: bool = False,
+                 capture_modes: Optional[Iterable[str]] = None, downscale_for_vlm: bool = True):
         self.name = "Structured Explorer"
         self.description = "Direct page exploration with form testing and interactive element analysis"
         self.output_dir = output_dir
         self.model = model
         self.verbose = verbose
+        self.blocked_resources = self.HEAVY_BLOCKED_RESOURCES if block_heavy_resources else self.LIGHT_BLOCKED_RESOURCES
+        # Screenshots only feed the visual analyzer, so skip them all when it can't run
+        if capture_modes is None:
+            capture_modes = self.CAPTURE_MODES if is_model_available(model) else frozenset()
+        self.capture_modes = frozenset(capture_modes)
+        # The analyzer gets a small JPEG copy of each screenshot; evidence keeps the original
+        self.downscale_for_vlm = downscale_for_vlm
         self.bugs = []
         self.action_recorder: Optional[ActionRecorder] = None
+        self.performance_tracker = PerformanceTracker()
         self.interaction_tracker = InteractionTracker(verbose)  # Track tested elements to prevent duplicates
         self.navigation_metadata: Dict[str, Dict] = {}  # Store navigation metadata for action recording
+        self.document_response: Optional[Response] = None  # Main navigation response, replayed to sibling pages
+        self.captured_screenshots: List[str] = []  # Screenshots captured by finished viewport passes
+        self._pending_analyses: List[asyncio.Future] = []  # Screenshot analyses still in flight
+        self._analyzed_digests = set()  # Content hashes of screenshots already sent for analysis
+        self._analyzed_phashes: Dict[str, PerceptualHashIndex] = {}  # Perceptual hashes of screenshots already sent for analysis, by capture mode
+        self._analysis_slots = asyncio.Semaphore(self._analysis_concurrency())
+    
+    @classmethod
+    def _analysis_concurrency(cls) -> int:
+        """Number of concurrent screenshot analyses, from MANTIS_ANALYSIS_CONCURRENCY if set"""
+        try:
+            return max(1, int(os.getenv("MANTIS_ANALYSIS_CONCURRENCY", cls.MAX_CONCURRENT_ANALYSES)))
+        except ValueError:
+            return cls.MAX_CONCURRENT_ANALYSES
+    
+    @classmethod
+    def _viewport_concurrency(cls) -> int:
+        """Number of viewports explored at once, from MANTIS_VIEWPORT_CONCURRENCY if set"""
+        try:
+            return max(1, int(os.getenv("MANTIS_VIEWPORT_CONCURRENCY", cls.MAX_CONCURRENT_VIEWPORTS)))
+        except ValueError:
+            return cls.MAX_CONCURRENT_VIEWPORTS
+    
+    @classmethod
+    async def install_dom_kernels(cls, context):
+        """Inject the DOM discovery scripts into every page the context loads from now on"""
+        await context.add_init_script(script=cls._DOM_KERNELS_INIT_SCRIPT)
+    
+    async def _evaluate_kernel(self, page: Page, name: str, source: str, arg: Any) -> Any:
+        """
+        Run a DOM discovery script, calling the copy injected by install_dom_kernels when
+        the page has one and sending the full source only when it doesn't.
+        """
+        return await evaluate_kernel(page, name, source, arg)
     
     def _format_reproduction_steps(self) -> List[str]:
         """Format action recorder steps as list of strings for bug reproduction_steps"""
@@ -48,6 +768,97 @@ class StructuredExplorer:
         # Convert ReproStep objects to simple string descriptions
         return [step.description for step in self.action_recorder.steps]
     
+    def _queue_analysis(self, screenshot_path: str, context: str, viewport_key: str, page_url: str, location: str,
+                        capture_mode: Optional[str] = None):
+        """
+        Start analyzing a screenshot in the background so exploration can carry on.
+        Reproduction steps are captured now, while they still lead to this screenshot.
+        Screenshots identical to one already analyzed in this pass are skipped, as are
+        ones that look the same as an earlier capture of the same mode (see _looks_already_analyzed).
+        The bytes are held until analysis so a queued screenshot is never read back from disk.
+        """
+        try:
+            image_bytes = read_screenshot(screenshot_path)
+        except OSError:
+            if self.verbose:
+                print(f"      ⚠️  Screenshot {location} could not be read, skipping analysis")
+            return
+        
+        digest = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        if digest in self._analyzed_digests:
+            if self.verbose:
+                print(f"      ⏭️  Screenshot {location} is identical to one already analyzed, skipping")
+            return
+        self._analyzed_digests.add(digest)
+        
+        reproduction_steps = self._format_reproduction_steps() if self.action_recorder else None
+        self._pending_analyses.append(asyncio.ensure_future(
+            self._analyze_screenshot(screenshot_path, image_bytes, context, viewport_key, page_url, location, reproduction_steps, capture_mode)
+        ))
+    
+    async def _looks_already_analyzed(self, image_bytes: bytes, capture_mode: Optional[str]) -> bool:
+        """
+        Check whether a screenshot is perceptually the same as one of the same capture mode
+        already sent for analysis in this pass, remembering it if not. Only modes in
+        PERCEPTUAL_DEDUPE_MODES are compared. Hashing decodes the image, so it runs off the
+        event loop; without Pillow nothing is treated as a match.
+        """
+        if capture_mode not in self.PERCEPTUAL_DEDUPE_MODES:
+            return False
+        phash = await asyncio.to_thread(perceptual_hash, image_bytes)
+        if phash is None:
+            return False
+        analyzed = self._analyzed_phashes.setdefault(capture_mode, PerceptualHashIndex(self.PERCEPTUAL_HASH_DISTANCE))
+        if analyzed.has_near(phash):
+            return True
+        analyzed.add(phash)
+        return False
+    
+    async def _analyze_screenshot(self, screenshot_path: str, image_bytes: bytes, context: str, viewport_key: str,
+                                  page_url: str, location: str, reproduction_steps: Optional[List[str]],
+                                  capture_mode: Optional[str] = None) -> List[Bug]:
+        """Analyze one screenshot with the selected model and attach its evidence"""
+        if await self._looks_already_analyzed(image_bytes, capture_mode):
+            if self.verbose:
+                print(f"      ⏭️  Screenshot {location} looks the same as one already analyzed, skipping")
+            return []
+        if self.downscale_for_vlm:
+            image_bytes = await asyncio.to_thread(downscale_for_analysis, image_bytes)
+        async with self._analysis_slots:
+            bugs, error = await analyze_screenshot_bytes(
+                image_bytes,
+                screenshot_path, 
+                context, 
+                viewport_key, 
+                page_url, 
+                self.model,
+                self.verbose
+            )
+        if error:
+            if self.verbose:
+                print(f"      ⚠️  {self.model.title()} analysis error: {error}")
+            return []
+        
+        # Update screenshot paths in the bug evidence and populate reproduction steps. The
+        # steps were formatted once for this screenshot; each bug gets its own copy.
+        for bug in bugs:
+            bug.evidence.screenshot_path = screenshot_path
+            if reproduction_steps is not None:
+                bug.reproduction_steps = list(reproduction_steps)
+        if bugs and self.verbose:
+            print(f"      🔍 Found {len(bugs)} visual issues {location}")
+        return bugs
+    
+    async def _collect_analyses(self):
+        """Wait for queued screenshot analyses and add their bugs in capture order"""
+        pending, self._pending_analyses = self._pending_analyses, []
+        for outcome in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                if self.verbose:
+                    print(f"      ⚠️  {self.model.title()} analysis error: {str(outcome)}")
+                continue
+            self.bugs.extend(outcome)
+    
     def _record_spa_navigation(self, page_url: str):
         """Record navigation with SPA context awareness"""
         from urllib.parse import urlparse, urljoin
@@ -92,6 +903,14 @@ class StructuredExplorer:
         
         # Standard navigation recording
         self.action_recorder.record_navigation(page_url, "Navigate to page for testing")
+    
+    async def _block_heavy(self, route):
+        """Abort requests for non-essential resources and trackers triggered while exploring"""
+        request = route.request
+        if request.resource_type in self.blocked_resources or _is_blocked_host(urlparse(request.url).hostname or ''):
+            await route.abort()
+        else:
+            await route.continue_()
         
     async def run_complete_exploration(self, page: Page, page_url: str) -> PageResult:
         """
@@ -99,51 +918,77 @@ class StructuredExplorer:
         """
         if self.verbose:
             print(f"\n🔍 Starting direct exploration of {page_url}")
+            if not self.capture_modes:
+                print(f"  ⚠️  {self.model.title()} analyzer not available, skipping screenshot capture")
         
         # Initialize result
         result = PageResult(page_url=page_url)
         self.bugs = []
+        self.captured_screenshots = []
         
-        # Set up evidence collection, performance tracking, and action recording
-        evidence_collector = EvidenceCollector(page, self.output_dir, self.verbose)
-        performance_tracker = PerformanceTracker()
-        self.action_recorder = ActionRecorder(page_url)
+        # Set up action recording, reusing the recorder from a previous page if there is one
+        # (screenshots are captured by the per-viewport collectors, so none is needed here)
+        if self.action_recorder:
+            self.action_recorder.reset(page_url)
+        else:
+            self.action_recorder = ActionRecorder(page_url)
         
         # Record initial navigation with SPA context if available
         self._record_spa_navigation(page_url)
         
+        # Skip fetching non-essential resources pulled in by scrolling and interactions
+        await page.route('**/*', self._block_heavy)
+        
         try:
             # Collect initial performance data
-            result.timings = await performance_tracker.collect_timings(page)
+            result.timings = await self.performance_tracker.collect_timings(page)
             
             # Detect outlinks
             link_detector = LinkDetector(page, page_url)
             result.outlinks = await link_detector.collect_outlinks()
             
-            # Explore each viewport directly
-            for viewport_config in self.DEFAULT_VIEWPORTS:
-                viewport_name = viewport_config["name"]
-                viewport_key = f"{viewport_config['width']}x{viewport_config['height']}"
-                
-                if self.verbose:
-                    print(f"\nExploring {viewport_name} viewport ({viewport_key})")
-                
-                # Set viewport size
-                await page.set_viewport_size({"width": viewport_config['width'], "height": viewport_config['height']})
-                self.action_recorder.record_viewport_change(viewport_key, f"Change to {viewport_name} viewport")
-                await asyncio.sleep(0.5)  # Allow layout to settle
-                
-                # Set interaction tracker context for this viewport
-                self.interaction_tracker.set_viewport_context(viewport_key)
-                
-                # Explore this viewport
-                await self._explore_viewport(page, page_url, viewport_name, viewport_key, evidence_collector)
+            # Explore the viewports concurrently: the first on this page, the others on
+            # sibling pages in the same context, each with its own recorder and tracker.
+            # Viewports beyond the concurrency limit, or whose sibling page couldn't open,
+            # are taken by whichever page finishes its pass first.
+            explorers = [self._spawn_viewport_explorer(page_url) for _ in self.DEFAULT_VIEWPORTS]
+            passes = list(zip(explorers, self.DEFAULT_VIEWPORTS))
+            sibling_pages = await self._open_sibling_pages(page, page_url, self.DEFAULT_VIEWPORTS[1:self._viewport_concurrency()])
+            viewport_pages = ([page] + sibling_pages + [None] * len(passes))[:len(passes)]
+            leftover = [viewport_pass for viewport_pass, viewport_page in zip(passes, viewport_pages) if viewport_page is None]
+            
+            async def explore_on(viewport_page: Page, viewport_pass):
+                while viewport_pass:
+                    explorer, viewport_config = viewport_pass
+                    await explorer._explore_viewport_pass(viewport_page, page_url, viewport_config)
+                    viewport_pass = leftover.pop(0) if leftover else None
+            
+            try:
+                await asyncio.gather(*(
+                    explore_on(viewport_page, viewport_pass)
+                    for viewport_pass, viewport_page in zip(passes, viewport_pages)
+                    if viewport_page is not None
+                ))
+            finally:
+                for sibling_page in sibling_pages:
+                    if sibling_page is None:
+                        continue
+                    try:
+                        await sibling_page.close()
+                    except Exception:
+                        pass
+            
+            # Merge per-viewport state back in viewport order
+            for explorer in explorers:
+                self.bugs.extend(explorer.bugs)
+                self.interaction_tracker.merge(explorer.interaction_tracker)
+                self.captured_screenshots.extend(explorer.captured_screenshots)
             
             # Collect all findings
             result.findings.extend(self.bugs)
             
             # Collect viewport artifacts
-            result.viewport_artifacts = await self._get_viewport_artifacts(evidence_collector)
+            result.viewport_artifacts = self._get_viewport_artifacts()
             
             # Log interaction tracking summary
             self.interaction_tracker.log_final_summary()
@@ -158,28 +1003,130 @@ class StructuredExplorer:
                 suggested_fix="Review page structure and exploration compatibility"
             )
             result.findings.append(bug)
+        
+        finally:
+            # Pages are reused across inspections, so don't leave the handler installed
+            try:
+                await page.unroute('**/*', self._block_heavy)
+            except Exception:
+                pass
             
         if self.verbose:
             print(f"✅ Exploration complete. Found {len(self.bugs)} potential issues.")
         return result
     
-    async def _explore_viewport(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector):
-        """Explore a single viewport comprehensively with scrolling-based analysis"""
+    def _spawn_viewport_explorer(self, page_url: str) -> 'StructuredExplorer':
+        """Create an explorer for one viewport pass, sharing config but not mutable state"""
+        explorer = StructuredExplorer(self.output_dir, self.model, self.verbose, capture_modes=self.capture_modes,
+                                      downscale_for_vlm=self.downscale_for_vlm)
+        explorer.blocked_resources = self.blocked_resources
+        explorer._analysis_slots = self._analysis_slots
+        explorer.navigation_metadata = self.navigation_metadata
+        explorer.action_recorder = ActionRecorder(page_url)
+        explorer._record_spa_navigation(page_url)
+        return explorer
+    
+    async def _open_sibling_pages(self, page: Page, page_url: str, viewport_configs: List[Dict[str, Any]]) -> List[Optional[Page]]:
+        """
+        Open one extra page on page_url per viewport config in the same browser context.
+        Each page is sized and has resource blocking installed before it loads, so it lays
+        out once at its own viewport. When the main navigation's response is known, the
+        siblings are served its original HTML rather than fetching it again. Returns None in
+        place of pages that couldn't open.
+        """
+        document = await self._original_document()
+        if document is not None and self.verbose:
+            print(f"  📄 Reusing the loaded document for {len(viewport_configs)} sibling page(s)")
         
-        # Get viewport height for scroll manager
-        viewport_config = next((v for v in self.DEFAULT_VIEWPORTS if v["name"] == viewport_name), None)
-        if not viewport_config:
-            if self.verbose:
-                print(f"  ⚠️  Could not find viewport config for {viewport_name}")
-            return
+        async def open_one(viewport_config: Dict[str, Any]) -> Optional[Page]:
+            sibling_page = None
+            served = False
+            
+            async def serve_document(route):
+                nonlocal served
+                if served or route.request.resource_type != 'document':
+                    await route.fallback()
+                    return
+                served = True
+                await route.fulfill(status=200, content_type=document['content_type'], body=document['body'])
+            
+            try:
+                sibling_page = await page.context.new_page()
+                await sibling_page.set_viewport_size({"width": viewport_config['width'], "height": viewport_config['height']})
+                await sibling_page.route('**/*', self._block_heavy)
+                navigate_to = page_url
+                if document is not None:
+                    await sibling_page.route(lambda url: urldefrag(url).url == document['url'], serve_document)
+                    navigate_to = document['url']
+                if await PageSetup(sibling_page, navigate_to, DEFAULT_TIMEOUTS).navigate_safely():
+                    return sibling_page
+            except Exception as e:
+                if self.verbose:
+                    print(f"  ⚠️  Could not open sibling page for parallel exploration: {str(e)}")
+            if sibling_page:
+                await sibling_page.close()
+            return None
+        
+        return list(await asyncio.gather(*(open_one(viewport_config) for viewport_config in viewport_configs)))
+    
+    async def _original_document(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the HTML the main navigation was served, as {url, content_type, body}, so sibling
+        pages load exactly what the server sent. None if there's no successful HTML response.
+        """
+        response = self.document_response
+        if response is None or not response.ok:
+            return None
+        content_type = response.headers.get('content-type', '')
+        if 'text/html' not in content_type:
+            return None
+        try:
+            body = await response.body()
+        except Exception:
+            return None
+        return {'url': urldefrag(response.url).url, 'content_type': content_type, 'body': body}
+    
+    async def _explore_viewport_pass(self, page: Page, page_url: str, viewport_config: Dict[str, Any]):
+        """Resize the page to one viewport and explore it"""
+        viewport_name = viewport_config["name"]
+        viewport_size = {"width": viewport_config['width'], "height": viewport_config['height']}
+        viewport_key = f"{viewport_size['width']}x{viewport_size['height']}"
+        
+        if self.verbose:
+            print(f"\nExploring {viewport_name} viewport ({viewport_key})")
+        
+        evidence_collector = EvidenceCollector(page, self.output_dir, self.verbose)
+        
+        # Set viewport size (sibling pages are opened at their viewport already)
+        if page.viewport_size != viewport_size:
+            await page.set_viewport_size(viewport_size)
+            await self._wait_settled(page)  # Allow layout to settle
+        self.action_recorder.record_viewport_change(viewport_key, f"Change to {viewport_name} viewport")
+        
+        # Set interaction tracker context for this viewport
+        self.interaction_tracker.set_viewport_context(viewport_key)
+        
+        # Explore this viewport
+        try:
+            await self._explore_viewport(page, page_url, viewport_config, viewport_key, evidence_collector)
+        finally:
+            # Analyses and screenshot writes overlap with the pass; make sure they've landed
+            await self._collect_analyses()
+            await evidence_collector.flush()
+            self.captured_screenshots.extend(evidence_collector.captured_paths)
+    
+    async def _explore_viewport(self, page: Page, page_url: str, viewport_config: Dict[str, Any], viewport_key: str, evidence_collector: EvidenceCollector):
+        """Explore a single viewport comprehensively with scrolling-based analysis"""
+        viewport_name = viewport_config["name"]
+        viewport_height = viewport_config["height"]
         
         # Initialize scroll manager
-        scroll_manager = ScrollManager(page, viewport_config["height"], verbose=self.verbose)
+        scroll_manager = ScrollManager(page, viewport_height, verbose=self.verbose)
         is_scrollable = await scroll_manager.initialize()
         
         # Record scroll manager setup
         if self.action_recorder:
-            self.action_recorder.record_scroll_setup(viewport_config["height"], is_scrollable)
+            self.action_recorder.record_scroll_setup(viewport_height, is_scrollable)
         
         if not is_scrollable:
             # Page fits in viewport - do single-screen exploration
@@ -192,37 +1139,30 @@ class StructuredExplorer:
         """Explore a single screen (non-scrollable page or one scroll position)"""
                 
         # Capture screenshot at current scroll position
-        screenshot_path = await evidence_collector.capture_scroll_screenshot(scroll_position, viewport_key)
+        screenshot_path = None
+        if 'scroll' in self.capture_modes:
+            screenshot_path = await evidence_collector.capture_scroll_screenshot(scroll_position, viewport_key)
         
         # Analyze screenshot with selected model
         if screenshot_path:
             context = f"viewport at scroll position {scroll_position}px"
-            screenshot_bugs, error = await analyze_screenshot(
-                screenshot_path, 
-                context, 
-                viewport_key, 
-                page_url, 
-                self.model,
-                self.verbose
-            )
-            if error:
-                if self.verbose:
-                    print(f"      ⚠️  {self.model.title()} analysis error: {error}")
-            else:
-                # Update screenshot paths in the bug evidence and populate reproduction steps
-                for bug in screenshot_bugs:
-                    bug.evidence.screenshot_path = screenshot_path
-                    # Populate reproduction steps from action recorder
-                    if self.action_recorder:
-                        bug.reproduction_steps = self._format_reproduction_steps()
-                self.bugs.extend(screenshot_bugs)
-                if screenshot_bugs:
-                    if self.verbose:
-                        print(f"      🔍 Found {len(screenshot_bugs)} visual issues at scroll position {scroll_position}px")
+            self._queue_analysis(screenshot_path, context, viewport_key, page_url, f"at scroll position {scroll_position}px", 'scroll')
+        
+        # Discovery only reads the DOM, so find forms and interactive elements together;
+        # the tests themselves type and click on the shared page and stay sequential
+        visible_forms, element_groups = await asyncio.gather(
+            self._discover_visible_forms(page),
+            self._find_viewport_visible_element_groups(page, self.INTERACTIVE_SELECTOR_GROUPS),
+            return_exceptions=True
+        )
+        if isinstance(visible_forms, Exception):
+            visible_forms = None
+        if isinstance(element_groups, Exception):
+            element_groups = None
         
         # Test forms and interactive elements visible at this scroll position
-        await self._test_forms_with_edge_cases(page, page_url, viewport_name, viewport_key, evidence_collector)
-        await self._test_interactive_elements(page, page_url, viewport_name, viewport_key, evidence_collector)
+        await self._test_forms_with_edge_cases(page, page_url, viewport_name, viewport_key, evidence_collector, visible_forms)
+        await self._test_interactive_elements(page, page_url, viewport_name, viewport_key, evidence_collector, element_groups)
     
     async def _explore_scrollable_page(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector, scroll_manager: ScrollManager):
         """Explore a scrollable page by iterating through scroll positions"""
@@ -272,136 +1212,22 @@ class StructuredExplorer:
             print(f"  ✅ Scroll exploration complete: {final_info['iterations']} positions explored")
     
     
-    async def _test_forms_with_edge_cases(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector):
+    async def _discover_visible_forms(self, page: Page) -> List[Dict[str, Any]]:
+        """Find forms and standalone inputs with at least one input visible in the current viewport"""
+        # The injected kernel reuses its discovery across scroll positions until the DOM changes,
+        # so a form that appears later (lazy loading, a step revealed by a click) is still found
+        return await self._evaluate_kernel(page, 'visibleForms', self._VISIBLE_FORMS_JS, self._STANDALONE_INPUT_SELECTOR) or []
+    
+    async def _test_forms_with_edge_cases(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector,
+                                          visible_forms: Optional[List[Dict[str, Any]]] = None):
         """Find forms and test them with edge case data that might break layouts"""
         
         if self.verbose:
             print(f"  📝 Testing forms in {viewport_name}")
         
         try:
-            # Find all visible forms AND standalone inputs
-            forms_and_inputs_data = await page.evaluate("""
-            () => {
-                // Helper function to check if element is truly visible AND in current viewport
-                const isElementVisible = (element) => {
-                    if (!element) return false;
-                    
-                    // Check basic visibility
-                    if (element.offsetParent === null) return false;
-                    
-                    // Check computed style
-                    const style = window.getComputedStyle(element);
-                    if (style.display === 'none' || 
-                        style.visibility === 'hidden' || 
-                        style.opacity === '0') return false;
-                    
-                    // Check if element has dimensions
-                    const rect = element.getBoundingClientRect();
-                    if (rect.width === 0 && rect.height === 0) return false;
-                    
-                    // PHASE 3: Enhanced viewport visibility checking
-                    // Check if element is positioned completely off-screen
-                    if (rect.right < 0 || rect.bottom < 0 || 
-                        rect.left > window.innerWidth || rect.top > window.innerHeight) return false;
-                    
-                    // Check if element is substantially visible in viewport (at least 50% visible)
-                    const viewportHeight = window.innerHeight;
-                    const viewportWidth = window.innerWidth;
-                    
-                    // Calculate visible area of element
-                    const visibleTop = Math.max(0, rect.top);
-                    const visibleLeft = Math.max(0, rect.left);
-                    const visibleBottom = Math.min(viewportHeight, rect.bottom);
-                    const visibleRight = Math.min(viewportWidth, rect.right);
-                    
-                    // Element must have some visible area
-                    if (visibleTop >= visibleBottom || visibleLeft >= visibleRight) return false;
-                    
-                    // Calculate percentage of element that's visible
-                    const elementArea = rect.width * rect.height;
-                    const visibleArea = (visibleRight - visibleLeft) * (visibleBottom - visibleTop);
-                    const visibilityRatio = visibleArea / elementArea;
-                    
-                    // Element must be at least 30% visible to be considered testable
-                    // This prevents testing elements that are barely visible at viewport edges
-                    return visibilityRatio >= 0.3;
-                };
-                
-                // Helper function to create more specific selectors
-                const createBestSelector = (input, containerIndex) => {
-                    // Priority: ID > name > data attributes > class + type > placeholder (with container context)
-                    if (input.id) {
-                        return `#${input.id}`;
-                    }
-                    
-                    if (input.name) {
-                        return `[name="${input.name}"]`;
-                    }
-                    
-                    // Check for data attributes that could make selector more specific
-                    const dataAttrs = [];
-                    for (const attr of input.attributes) {
-                        if (attr.name.startsWith('data-') && attr.value) {
-                            dataAttrs.push(`[${attr.name}="${attr.value}"]`);
-                        }
-                    }
-                    if (dataAttrs.length > 0) {
-                        return `${input.tagName.toLowerCase()}${dataAttrs.join('')}`;
-                    }
-                    
-                    // Use class + type if available
-                    if (input.className && input.type) {
-                        const firstClass = input.className.split(' ')[0];
-                        return `${input.tagName.toLowerCase()}[type="${input.type}"].${firstClass}`;
-                    }
-                    
-                    // Last resort: placeholder with additional context
-                    if (input.placeholder) {
-                        const tagType = input.type ? `[type="${input.type}"]` : '';
-                        // Add container context to make it more specific
-                        return `${input.tagName.toLowerCase()}${tagType}[placeholder="${input.placeholder}"]:nth-of-type(${containerIndex + 1})`;
-                    }
-                    
-                    return null;
-                };
-                
-                // Find forms with their inputs
-                const forms = Array.from(document.querySelectorAll('form')).map((form, index) => ({
-                    type: 'form',
-                    index: index,
-                    inputs: Array.from(form.querySelectorAll('input:not([type="hidden"]), textarea, select')).map((input, inputIndex) => ({
-                        type: input.type || input.tagName.toLowerCase(),
-                        name: input.name,
-                        id: input.id,
-                        placeholder: input.placeholder,
-                        selector: createBestSelector(input, inputIndex),
-                        visible: isElementVisible(input)
-                    })).filter(input => input.selector && input.visible),
-                    visible: isElementVisible(form)
-                }));
-                
-                // Find standalone inputs (not inside forms)
-                const standaloneInputs = Array.from(document.querySelectorAll('input:not(form input):not([type="hidden"]), textarea:not(form textarea)')).map((input, index) => ({
-                    type: 'standalone_input',
-                    index: index,
-                    inputs: [{
-                        type: input.type || input.tagName.toLowerCase(),
-                        name: input.name,
-                        id: input.id,
-                        placeholder: input.placeholder,
-                        selector: createBestSelector(input, index),
-                        visible: isElementVisible(input)
-                    }].filter(input => input.selector && input.visible),
-                    visible: isElementVisible(input)
-                }));
-                
-                return [...forms, ...standaloneInputs];
-            }
-            """)
-            
-            visible_forms = [f for f in forms_and_inputs_data if f['visible'] and f['inputs']]
-            forms_count = len([f for f in visible_forms if f['type'] == 'form'])
-            inputs_count = len([f for f in visible_forms if f['type'] == 'standalone_input'])
+            if visible_forms is None:
+                visible_forms = await self._discover_visible_forms(page)
             
             if not visible_forms:
                 return
@@ -428,9 +1254,9 @@ class StructuredExplorer:
                 if self.verbose:
                     print(f"    📝 Testing {form_type} {form_index + 1} with edge case data")
                 
-                # Fill form with edge case data that might break layout
-                for input_data in form['inputs']:
-                    await self._fill_input_with_edge_case_data(page, input_data)
+                # Fill all inputs with edge case data, then let the layout settle once
+                await self._fill_form_inputs(page, form)
+                await self._wait_settled(page, 200)
                 
                 # Mark form as tested to prevent duplicate testing in future scroll positions
                 form_element_info = {
@@ -441,33 +1267,14 @@ class StructuredExplorer:
                 self.interaction_tracker.mark_as_tested(form_element_info, "form")
                 
                 # Screenshot after filling with edge case data
-                screenshot_id = f"form_{form_index}_filled_{viewport_key}"
-                screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
+                screenshot_path = None
+                if 'forms' in self.capture_modes:
+                    screenshot_id = f"form_{form_index}_filled_{viewport_key}"
+                    screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
                 
-                if screenshot_path:                    
+                if screenshot_path:
                     # Analyze form filled with edge case data
-                    form_bugs, error = await analyze_screenshot(
-                        screenshot_path, 
-                        f"form filled with edge case data",
-                        viewport_key, 
-                        page_url, 
-                        self.model,
-                        self.verbose
-                    )
-                    if error:
-                        if self.verbose:
-                            print(f"      ⚠️  {self.model.title()} analysis error: {error}")
-                    else:
-                        # Update screenshot paths in the bug evidence and populate reproduction steps
-                        for bug in form_bugs:
-                            bug.evidence.screenshot_path = screenshot_path
-                            # Populate reproduction steps from action recorder
-                            if self.action_recorder:
-                                bug.reproduction_steps = self._format_reproduction_steps()
-                        self.bugs.extend(form_bugs)
-                        if form_bugs:
-                            if self.verbose:
-                                print(f"      🔍 Found {len(form_bugs)} visual issues in form {form_index + 1}")
+                    self._queue_analysis(screenshot_path, "form filled with edge case data", viewport_key, page_url, f"in form {form_index + 1}", 'forms')
                 
                 # Clear form for next test
                 await self._clear_form_inputs(page, form)
@@ -476,58 +1283,66 @@ class StructuredExplorer:
             if self.verbose:
                 print(f"    ❌ Form testing error: {str(e)}")
     
+    def _edge_case_value(self, input_data: Dict[str, Any]) -> str:
+        """Pick the edge case value for an input's type"""
+        return self.EDGE_CASE_DATA.get(input_data['type'].lower(), self.EDGE_CASE_DATA['text'])
+    
+    def _record_fill(self, input_data: Dict[str, Any], value: str):
+        """Record filling an input for reproduction steps"""
+        if self.action_recorder:
+            field_name = input_data.get('name', input_data.get('placeholder', 'unknown field'))
+            self.action_recorder.record_fill(input_data['selector'], value, field_name)
+    
+    async def _fill_form_inputs(self, page: Page, form: Dict[str, Any]):
+        """
+        Fill every input in a form with edge case data in a single evaluate.
+        Inputs the in-page fill couldn't handle go through the per-input locator path.
+        """
+        inputs = [input_data for input_data in form['inputs'] if input_data.get('selector')]
+        values = [self._edge_case_value(input_data) for input_data in inputs]
+        
+        try:
+            outcome = await self._evaluate_kernel(
+                page, 'fillInputs', self._FILL_INPUTS_JS, [[input_data['selector'], value] for input_data, value in zip(inputs, values)]
+            )
+            failed, skipped = set(outcome['failed']), set(outcome['skipped'])
+        except Exception:
+            failed, skipped = {input_data['selector'] for input_data in inputs}, set()
+        
+        fallback = []
+        for input_data, value in zip(inputs, values):
+            if input_data['selector'] in failed:
+                fallback.append(input_data)
+            elif input_data['selector'] not in skipped:
+                self._record_fill(input_data, value)
+        
+        if fallback:
+            await asyncio.gather(
+                *[self._fill_input_with_edge_case_data(page, input_data) for input_data in fallback],
+                return_exceptions=True
+            )
+    
     async def _fill_input_with_edge_case_data(self, page: Page, input_data: Dict[str, Any]):
         """Fill a single input with edge case data designed to test layout breaks"""
         try:
             selector = input_data['selector']
-            input_type = input_data['type'].lower()
-            
-            # First verify the element is visible and unique before attempting to fill
-            locator = page.locator(selector)
             
-            # Check how many elements match the selector
-            count = await locator.count()
-            if count == 0:
+            # Only fill if the (first) element is visible; is_visible() is simply False when
+            # nothing matches, so no separate count() round trip is needed. This path only runs
+            # for inputs the bulk fill couldn't reach, so don't wait for them to appear either.
+            locator = page.locator(selector).first
+            if not await locator.is_visible():
                 if self.verbose:
-                    print(f"      ⚠️  No elements found for selector: {selector}")
+                    print(f"      ⚠️  No visible element found for selector: {selector}")
                 return
-            elif count > 1:
-                if self.verbose:
-                    print(f"      ⚠️  Multiple elements ({count}) found for selector: {selector}, using first visible one")
-                # Use the first visible element
-                locator = locator.first
             
-            # Wait for element to be visible and ready
-            try:
-                await locator.wait_for(state="visible", timeout=5000)
-            except Exception as e:
-                if self.verbose:
-                    print(f"      ⚠️  Element not visible within 5s for {selector}: {str(e)}")
-                return
-            
-            # Edge case data designed to test layout limits
-            edge_data = {
-                'text': 'This is an extremely long text input that should test how the form handles very long content that might overflow containers or break layouts in unexpected ways when the user enters much more text than anticipated by the designer',
-                'email': 'very.very.very.long.email.address.that.might.break.layout@extremely.long.domain.name.that.could.cause.issues.example.com',
-                'password': 'VeryLongPasswordThatMightBreakLayoutsWhenDisplayed123!@#$%^&*()',
-                'tel': '555-123-4567-extension-9999-department-sales-very-long-phone-number',
-                'url': 'https://extremely.long.domain.name.that.might.cause.layout.issues.when.displayed.in.forms.example.com/very/long/path/that/continues',
-                'number': '999999999999999999999',
-                'search': 'Very long search query with lots of special characters !@#$%^&*()_+ that might break search input layouts and cause overflow',
-                'textarea': 'This is extremely long textarea content that spans multiple lines and contains various special characters !@#$%^&*()_+ and should test how well the textarea handles large amounts of content without breaking the surrounding layout or causing overflow issues that might affect other page elements. This text continues for a very long time to really test the boundaries of what the textarea can handle without breaking the page layout or causing visual problems for users.'
-            }
-            
-            value = edge_data.get(input_type, edge_data['text'])
+            value = self._edge_case_value(input_data)
             
             # Use locator.fill() instead of page.fill() for better error handling
             await locator.fill(value)
             
             # Record the action
-            if self.action_recorder:
-                field_name = input_data.get('name', input_data.get('placeholder', 'unknown field'))
-                self.action_recorder.record_fill(selector, value, field_name)
-            
-            await asyncio.sleep(0.1)  # Brief pause for layout to settle
+            self._record_fill(input_data, value)
             
         except Exception as e:
             field_identifier = input_data.get('name') or input_data.get('placeholder') or input_data.get('id') or 'unknown'
@@ -535,198 +1350,112 @@ class StructuredExplorer:
                 print(f"      ⚠️  Could not fill input '{field_identifier}': {str(e)}")
     
     async def _clear_form_inputs(self, page: Page, form: Dict[str, Any]):
-        """Clear all inputs in a form"""
-        for input_data in form['inputs']:
-            try:
-                selector = input_data['selector']
-                if selector:
-                    locator = page.locator(selector)
-                    
-                    # Only clear if element is visible and available
-                    if await locator.count() > 0:
-                        # Use first visible element if multiple exist
-                        if await locator.count() > 1:
-                            locator = locator.first
-                        
-                        # Only clear if element is visible
-                        if await locator.is_visible():
-                            await locator.fill('')
-            except Exception:
-                continue  # Ignore individual clear failures
+        """Clear all inputs in a form, falling back to per-input clears only for those the bulk clear missed"""
+        selectors = [input_data['selector'] for input_data in form['inputs'] if input_data.get('selector')]
+        try:
+            outcome = await self._evaluate_kernel(page, 'fillInputs', self._FILL_INPUTS_JS, [[selector, ''] for selector in selectors])
+            failed = set(outcome['failed'])
+        except Exception:
+            failed = set(selectors)
+        
+        if failed:
+            await asyncio.gather(
+                *[self._clear_input(page, input_data) for input_data in form['inputs'] if input_data.get('selector') in failed],
+                return_exceptions=True
+            )
+    
+    async def _clear_input(self, page: Page, input_data: Dict[str, Any]):
+        """Clear a single input, ignoring failures"""
+        try:
+            selector = input_data['selector']
+            if selector:
+                # Only clear if the (first) element is visible; is_visible() is simply
+                # False when nothing matches, so no separate count() round trips are needed
+                locator = page.locator(selector).first
+                if await locator.is_visible():
+                    await locator.fill('')
+        except Exception:
+            pass  # Ignore individual clear failures
     
-    async def _test_interactive_elements(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector):
+    async def _test_interactive_elements(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector,
+                                         element_groups: Optional[List[List[Dict[str, Any]]]] = None):
         """Find and test interactive elements like dropdowns, modals, accordions"""        
         try:
+            # Discover all three kinds of trigger in a single DOM walk
+            if element_groups is None:
+                element_groups = await self._find_viewport_visible_element_groups(page, self.INTERACTIVE_SELECTOR_GROUPS)
+            dropdown_elements, modal_elements, accordion_elements = element_groups
+            
             # Test dropdowns
-            await self._test_dropdowns(page, page_url, viewport_name, viewport_key, evidence_collector)
+            await self._test_dropdowns(page, page_url, viewport_name, viewport_key, evidence_collector, dropdown_elements)
             
             # Test modals
-            await self._test_modals(page, page_url, viewport_name, viewport_key, evidence_collector)
+            await self._test_modals(page, page_url, viewport_name, viewport_key, evidence_collector, modal_elements)
             
             # Test accordions
-            await self._test_accordions(page, page_url, viewport_name, viewport_key, evidence_collector)
+            await self._test_accordions(page, page_url, viewport_name, viewport_key, evidence_collector, accordion_elements)
             
         except Exception as e:
             if self.verbose:
                 print(f"    ❌ Interactive testing error: {str(e)}")
     
-    async def _find_viewport_visible_elements(self, page: Page, selectors: List[str]) -> List[Dict[str, Any]]:
+    async def _find_viewport_visible_elements(self, page: Page, selectors: Sequence[str]) -> List[Dict[str, Any]]:
         """
         PHASE 3: Find elements matching any of the given selectors that are visible in current viewport.
         Returns a list of element info dictionaries with selector and visibility data.
         """
+        groups = await self._find_viewport_visible_element_groups(page, [selectors])
+        return groups[0]
+    
+    async def _find_viewport_visible_element_groups(self, page: Page, selector_groups: Sequence[Sequence[str]]) -> List[List[Dict[str, Any]]]:
+        """
+        Like _find_viewport_visible_elements, but for several selector groups at once.
+        The union of every group is queried in one pass and one list is returned per group.
+        """
         try:
-            # JavaScript to find elements visible in current viewport
-            elements_data = await page.evaluate("""
-            (selectors) => {
-                // Enhanced viewport visibility checker from Phase 3
-                const isElementInViewport = (element) => {
-                    if (!element) return false;
-                    
-                    // Check basic visibility
-                    if (element.offsetParent === null) return false;
-                    
-                    // Check computed style
-                    const style = window.getComputedStyle(element);
-                    if (style.display === 'none' || 
-                        style.visibility === 'hidden' || 
-                        style.opacity === '0') return false;
-                    
-                    // Check if element has dimensions
-                    const rect = element.getBoundingClientRect();
-                    if (rect.width === 0 && rect.height === 0) return false;
-                    
-                    // Enhanced viewport visibility checking
-                    const viewportHeight = window.innerHeight;
-                    const viewportWidth = window.innerWidth;
-                    
-                    // Check if element is positioned completely off-screen
-                    if (rect.right < 0 || rect.bottom < 0 || 
-                        rect.left > viewportWidth || rect.top > viewportHeight) return false;
-                    
-                    // Calculate visible area of element
-                    const visibleTop = Math.max(0, rect.top);
-                    const visibleLeft = Math.max(0, rect.left);
-                    const visibleBottom = Math.min(viewportHeight, rect.bottom);
-                    const visibleRight = Math.min(viewportWidth, rect.right);
-                    
-                    // Element must have some visible area
-                    if (visibleTop >= visibleBottom || visibleLeft >= visibleRight) return false;
-                    
-                    // Calculate percentage of element that's visible
-                    const elementArea = rect.width * rect.height;
-                    const visibleArea = (visibleRight - visibleLeft) * (visibleBottom - visibleTop);
-                    const visibilityRatio = visibleArea / elementArea;
-                    
-                    // Element must be at least 30% visible to be considered testable
-                    return visibilityRatio >= 0.3;
-                };
-                
-                const createBestSelector = (element, baseSelector, index) => {
-                    // Try to create the most specific selector possible
-                    if (element.id) {
-                        return `#${element.id}`;
-                    }
-                    
-                    if (element.name) {
-                        return `${baseSelector}[name="${element.name}"]`;
-                    }
-                    
-                    // Check for data attributes
-                    const dataAttrs = [];
-                    for (const attr of element.attributes) {
-                        if (attr.name.startsWith('data-') && attr.value) {
-                            dataAttrs.push(`[${attr.name}="${attr.value}"]`);
-                        }
-                    }
-                    if (dataAttrs.length > 0) {
-                        return `${baseSelector}${dataAttrs[0]}`;
-                    }
-                    
-                    // Use class if available
-                    if (element.className && typeof element.className === 'string') {
-                        const firstClass = element.className.split(' ')[0];
-                        if (firstClass) {
-                            return `${baseSelector}.${firstClass}`;
-                        }
-                    }
-                    
-                    // Last resort: use base selector with nth-of-type
-                    return `${baseSelector}:nth-of-type(${index + 1})`;
-                };
-                
-                const visibleElements = [];
-                
-                // Check each selector
-                for (const selector of selectors) {
-                    const elements = document.querySelectorAll(selector);
-                    for (let i = 0; i < elements.length; i++) {
-                        const element = elements[i];
-                        if (isElementInViewport(element)) {
-                            visibleElements.push({
-                                selector: createBestSelector(element, selector, i),
-                                baseSelector: selector,
-                                text: element.textContent ? element.textContent.trim().substring(0, 50) : '',
-                                tagName: element.tagName.toLowerCase(),
-                                index: i,
-                                rect: element.getBoundingClientRect()
-                            });
-                        }
-                    }
-                }
-                
-                return visibleElements;
-            }
-            """, selectors)
+            elements_data = await self._evaluate_kernel(page, 'visibleElementGroups', self._VISIBLE_ELEMENT_GROUPS_JS, selector_groups)
             
             return elements_data
             
         except Exception as e:
-            print(f"      ⚠️  Error finding viewport-visible elements: {str(e)}")
-            return []
+            if self.verbose:
+                print(f"      ⚠️  Error finding viewport-visible elements: {str(e)}")
+            return [[] for _ in selector_groups]
     
-    async def _test_dropdowns(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector):
+    async def _test_dropdowns(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector, dropdown_elements: Optional[List[Dict[str, Any]]] = None):
         """Test dropdown menus by opening them and capturing screenshots"""
         
         # PHASE 3: Find dropdown triggers that are visible in current viewport
-        dropdown_elements = await self._find_viewport_visible_elements(page, [
-            '.dropdown-toggle',
-            '[data-toggle="dropdown"]',
-            '[data-bs-toggle="dropdown"]',
-            '.nav-item.dropdown > a',
-            'button[aria-expanded]',          # Modern ARIA dropdowns
-            'button[aria-controls]',          # ARIA controlled elements
-            '[data-toggle="collapse"]',       # Collapsible elements
-            '[data-bs-toggle="collapse"]',    # Bootstrap 5 collapse
-            '.hamburger',                     # Mobile hamburger menus
-            '.menu-toggle',                   # Generic menu toggles
-            '.navbar-toggler'                 # Bootstrap navbar toggles
-        ])
+        if dropdown_elements is None:
+            dropdown_elements = await self._find_viewport_visible_elements(page, self.DROPDOWN_SELECTORS)
         
         # Filter out already-tested dropdowns to prevent duplicate testing
-        untested_dropdowns = self.interaction_tracker.filter_untested_elements(dropdown_elements, "dropdown")
+        untested_dropdowns = self.interaction_tracker.filter_untested_elements(dropdown_elements, "dropdown", limit=5)
         
         if not untested_dropdowns:
             return
         
         dropdown_count = 0
-        for element_info in untested_dropdowns[:5]:  # Limit to 5 new dropdowns in viewport
+        for element_info in untested_dropdowns:  # At most 5 new dropdowns in viewport
             try:
                 selector = element_info['selector']
                 element_locator = page.locator(selector).first  # Use first matching element
                 
                 dropdown_count += 1
-                element_text = await element_locator.text_content()
-                print(f"    📋 Testing viewport-visible dropdown {dropdown_count}: '{element_text[:30] if element_text else 'unknown'}'")
+                # Text and initial ARIA state come from the batched discovery query
+                element_text = element_info['text']
+                if self.verbose:
+                    print(f"    📋 Testing viewport-visible dropdown {dropdown_count}: '{element_text[:30] if element_text else 'unknown'}'")
                 
                 # Get initial state for ARIA elements
-                initial_aria_expanded = await element_locator.get_attribute('aria-expanded')
+                initial_aria_expanded = element_info.get('ariaExpanded')
                 
                 # Try to click with multiple strategies
                 click_success = await self._safe_click_element(page, element_locator, selector)
                 
                 if not click_success:
-                    print(f"      ⚠️  Could not click dropdown {dropdown_count}, skipping")
+                    if self.verbose:
+                        print(f"      ⚠️  Could not click dropdown {dropdown_count}, skipping")
                     continue
                 
                 # Record the action
@@ -736,62 +1465,43 @@ class StructuredExplorer:
                 # Mark as tested to prevent duplicate testing in future scroll positions
                 self.interaction_tracker.mark_as_tested(element_info, "dropdown")
                 
-                await asyncio.sleep(0.5)  # Longer wait for mobile animations
-                
-                # Check if state actually changed (for ARIA elements)
-                new_aria_expanded = await element_locator.get_attribute('aria-expanded')
+                # Wait out open animations (longer on mobile), then check if state actually
+                # changed (for ARIA elements)
+                new_aria_expanded = await self._settle_and_read_aria_expanded(page, element_locator)
                 state_changed = initial_aria_expanded != new_aria_expanded
                 
                 if state_changed:
-                    print(f"      ✅ ARIA state changed: {initial_aria_expanded} → {new_aria_expanded}")
+                    if self.verbose:
+                        print(f"      ✅ ARIA state changed: {initial_aria_expanded} → {new_aria_expanded}")
                 
                 # Screenshot while dropdown is OPEN
-                screenshot_id = f"dropdown_{dropdown_count}_open_{viewport_key}"
-                screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
+                screenshot_path = None
+                if 'dropdowns' in self.capture_modes:
+                    screenshot_id = f"dropdown_{dropdown_count}_open_{viewport_key}"
+                    screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
                 
-                if screenshot_path:                    
+                if screenshot_path:
                     # Analyze dropdown open state
                     element_text = element_text or "unknown"
-                    dropdown_bugs, error = await analyze_screenshot(
-                        screenshot_path, 
-                        f"dropdown opened for {element_text}",
-                        viewport_key, 
-                        page_url, 
-                        self.model,
-                        self.verbose
-                    )
-                    if error:
-                        if self.verbose:
-                            print(f"      ⚠️  {self.model.title()} analysis error: {error}")
-                    else:
-                        # Update screenshot paths in the bug evidence and populate reproduction steps
-                        for bug in dropdown_bugs:
-                            bug.evidence.screenshot_path = screenshot_path
-                            # Populate reproduction steps from action recorder
-                            if self.action_recorder:
-                                bug.reproduction_steps = self._format_reproduction_steps()
-                        self.bugs.extend(dropdown_bugs)
-                        if dropdown_bugs:
-                            print(f"      🔍 Found {len(dropdown_bugs)} visual issues in dropdown")
+                    self._queue_analysis(screenshot_path, f"dropdown opened for {element_text}", viewport_key, page_url, "in dropdown", 'dropdowns')
                 
                 # Close dropdown (try multiple methods)
                 if state_changed:
                     # For ARIA dropdowns, click the same element again
                     await self._safe_click_element(page, element_locator, selector)
+                    await self._wait_settled(page, 300)
                 else:
-                    # For traditional dropdowns, click body or press escape
-                    try:
-                        await page.click('body', timeout=1000)
-                    except:
-                        await page.keyboard.press('Escape')
-                await asyncio.sleep(0.3)
+                    # For traditional dropdowns, press escape (no selector lookup needed)
+                    await self._press_escape(page)
                         
             except Exception as e:
-                print(f"      ⚠️  Dropdown test failed: {str(e)}")
+                if self.verbose:
+                    print(f"      ⚠️  Dropdown test failed: {str(e)}")
                 continue
         
         if dropdown_count == 0:
-            print(f"    📋 No viewport-visible dropdowns found in {viewport_name}")
+            if self.verbose:
+                print(f"    📋 No viewport-visible dropdowns found in {viewport_name}")
     
     async def _safe_click_element(self, page: Page, locator, selector: str) -> bool:
         """Safely click an element with multiple fallback strategies"""
@@ -802,7 +1512,8 @@ class StructuredExplorer:
             
         except Exception as e:
             if "intercepts pointer events" in str(e):
-                print(f"      🔄 Pointer intercepted, trying alternative click methods...")
+                if self.verbose:
+                    print(f"      🔄 Pointer intercepted, trying alternative click methods...")
                 
                 # Strategy 2: Dismiss any overlays first
                 await self._dismiss_overlays(page)
@@ -817,99 +1528,120 @@ class StructuredExplorer:
                 # Strategy 3: Force click (ignores intercepting elements)
                 try:
                     await locator.click(force=True, timeout=2000)
-                    print(f"      ✅ Force click succeeded")
+                    if self.verbose:
+                        print(f"      ✅ Force click succeeded")
                     return True
                 except Exception as force_e:
-                    print(f"      ⚠️  Force click failed: {str(force_e)}")
+                    if self.verbose:
+                        print(f"      ⚠️  Force click failed: {str(force_e)}")
                 
                 # Strategy 4: Scroll into view and try again
                 try:
                     await locator.scroll_into_view_if_needed()
-                    await asyncio.sleep(0.2)
+                    await self._wait_settled(page, 200)  # Smooth scrolling animates
                     await locator.click(timeout=2000)
-                    print(f"      ✅ Click after scroll succeeded")
+                    if self.verbose:
+                        print(f"      ✅ Click after scroll succeeded")
                     return True
                 except Exception as scroll_e:
-                    print(f"      ⚠️  Click after scroll failed: {str(scroll_e)}")
+                    if self.verbose:
+                        print(f"      ⚠️  Click after scroll failed: {str(scroll_e)}")
                 
                 # Strategy 5: Use JavaScript click as last resort
                 try:
                     await locator.evaluate("element => element.click()")
-                    print(f"      ✅ JavaScript click succeeded")
+                    if self.verbose:
+                        print(f"      ✅ JavaScript click succeeded")
                     return True
                 except Exception as js_e:
-                    print(f"      ⚠️  JavaScript click failed: {str(js_e)}")
+                    if self.verbose:
+                        print(f"      ⚠️  JavaScript click failed: {str(js_e)}")
             
             else:
-                print(f"      ⚠️  Click failed: {str(e)}")
+                if self.verbose:
+                    print(f"      ⚠️  Click failed: {str(e)}")
             
             return False
     
+    async def _wait_settled(self, page: Page, max_ms: int = 500):
+        """
+        Wait for running animations and transitions to finish, up to max_ms.
+        Returns after a couple of frames on static pages instead of a fixed delay.
+        """
+        try:
+            await self._evaluate_kernel(page, 'waitSettled', self._WAIT_SETTLED_JS, max_ms)
+        except Exception:
+            await asyncio.sleep(max_ms / 1000)
+    
+    async def _settle_and_read_aria_expanded(self, page: Page, locator, max_ms: int = 500) -> Optional[str]:
+        """Wait for animations to settle and read an element's aria-expanded in one round trip"""
+        try:
+            return await locator.evaluate(self._SETTLE_AND_READ_ARIA_JS, max_ms, timeout=max_ms + 2000)
+        except Exception:
+            await self._wait_settled(page, max_ms)
+            return await locator.get_attribute('aria-expanded')
+    
+    async def _press_escape(self, page: Page):
+        """Press Escape to close an open dropdown or modal and let it animate out"""
+        await page.keyboard.press('Escape')
+        await self._wait_settled(page, 300)
+    
     async def _dismiss_overlays(self, page: Page):
         """Try to dismiss common overlays that might block clicks"""
         try:
-            # Common overlay dismissal strategies
-            overlay_selectors = [
-                '.modal-backdrop',
-                '.overlay',
-                '.loading-overlay',
-                '[data-dismiss="modal"]',
-                '[data-bs-dismiss="modal"]',
-                '.close',
-                'button:has-text("Close")',
-                'button:has-text("×")'
-            ]
-            
-            for overlay_selector in overlay_selectors:
-                try:
-                    overlay_locator = page.locator(overlay_selector)
-                    if await overlay_locator.count() > 0 and await overlay_locator.first.is_visible():
-                        await overlay_locator.first.click(timeout=1000)
-                        await asyncio.sleep(0.2)
-                        break
-                except:
-                    continue
+            try:
+                await self._evaluate_kernel(page, 'dismissOverlay', self._DISMISS_OVERLAY_JS, self.OVERLAY_SELECTORS)
+            except Exception:
+                await self._click_first_visible_overlay(page)
             
             # Try pressing Escape to dismiss any modal/overlay
             await page.keyboard.press('Escape')
-            await asyncio.sleep(0.2)
+            await self._wait_settled(page, 200)
             
         except Exception:
             pass  # Ignore overlay dismissal failures
     
-    async def _test_modals(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector):
+    async def _click_first_visible_overlay(self, page: Page):
+        """Click the first visible overlay one selector at a time, for pages the overlay kernel can't run on"""
+        for overlay_selector in self.OVERLAY_SELECTORS:
+            try:
+                overlay_locator = page.locator(overlay_selector).first
+                if await overlay_locator.is_visible():
+                    await overlay_locator.click(timeout=1000)
+                    await self._wait_settled(page, 200)
+                    break
+            except:
+                continue
+    
+    async def _test_modals(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector, modal_elements: Optional[List[Dict[str, Any]]] = None):
         """Test modal triggers by opening them and capturing screenshots"""
         
         # PHASE 3: Find modal triggers that are visible in current viewport
-        modal_elements = await self._find_viewport_visible_elements(page, [
-            '[data-toggle="modal"]',
-            '[data-bs-toggle="modal"]',
-            '[data-target*="modal"]',
-            '[data-bs-target*="modal"]',
-            'button:has(+ .modal)',
-            '.modal-trigger'
-        ])
+        if modal_elements is None:
+            modal_elements = await self._find_viewport_visible_elements(page, self.MODAL_SELECTORS)
         
         # Filter out already-tested modals to prevent duplicate testing
-        untested_modals = self.interaction_tracker.filter_untested_elements(modal_elements, "modal")
+        untested_modals = self.interaction_tracker.filter_untested_elements(modal_elements, "modal", limit=3)
         
         if not untested_modals:
             return
         
         modal_count = 0
-        for element_info in untested_modals[:3]:  # Limit to 3 new modals in viewport
+        for element_info in untested_modals:  # At most 3 new modals in viewport
             try:
                 selector = element_info['selector']
                 element_locator = page.locator(selector).first
                 
                 modal_count += 1
-                print(f"    🔲 Testing viewport-visible modal {modal_count}: '{element_info['text'][:30] if element_info['text'] else 'unknown'}'")
+                if self.verbose:
+                    print(f"    🔲 Testing viewport-visible modal {modal_count}: '{element_info['text'][:30] if element_info['text'] else 'unknown'}'")
                 
                 # Open modal
                 click_success = await self._safe_click_element(page, element_locator, selector)
                 
                 if not click_success:
-                    print(f"      ⚠️  Could not click modal {modal_count}, skipping")
+                    if self.verbose:
+                        print(f"      ⚠️  Could not click modal {modal_count}, skipping")
                     continue
                 
                 # Record the action
@@ -919,78 +1651,53 @@ class StructuredExplorer:
                 # Mark as tested to prevent duplicate testing in future scroll positions
                 self.interaction_tracker.mark_as_tested(element_info, "modal")
                 
-                await asyncio.sleep(0.5)  # Wait for modal to open
+                await self._wait_settled(page)  # Wait for modal to open
                 
                 # Screenshot while modal is OPEN
-                screenshot_id = f"modal_{modal_count}_open_{viewport_key}"
-                screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
+                screenshot_path = None
+                if 'modals' in self.capture_modes:
+                    screenshot_id = f"modal_{modal_count}_open_{viewport_key}"
+                    screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
                 
-                if screenshot_path:                    
+                if screenshot_path:
                     # Analyze modal open state
-                    modal_bugs, error = await analyze_screenshot(
-                        screenshot_path, 
-                        f"modal opened",
-                        viewport_key, 
-                        page_url, 
-                        self.model,
-                        self.verbose
-                    )
-                    if error:
-                        if self.verbose:
-                            print(f"      ⚠️  {self.model.title()} analysis error: {error}")
-                    else:
-                        # Update screenshot paths in the bug evidence and populate reproduction steps
-                        for bug in modal_bugs:
-                            bug.evidence.screenshot_path = screenshot_path
-                            # Populate reproduction steps from action recorder
-                            if self.action_recorder:
-                                bug.reproduction_steps = self._format_reproduction_steps()
-                        self.bugs.extend(modal_bugs)
-                        if modal_bugs:
-                            print(f"      🔍 Found {len(modal_bugs)} visual issues in modal")
+                    self._queue_analysis(screenshot_path, "modal opened", viewport_key, page_url, "in modal", 'modals')
                 
                 # Close modal with escape key
-                await page.keyboard.press('Escape')
-                await asyncio.sleep(0.3)
-                
-                # Also try clicking close button if exists
-                close_selectors = ['.modal .close', '.modal [data-dismiss="modal"]', '.modal [data-bs-dismiss="modal"]']
-                for close_selector in close_selectors:
-                    try:
-                        await page.click(close_selector, timeout=500)
-                        break
-                    except:
-                        continue
+                await self._press_escape(page)
                 
-                await asyncio.sleep(0.2)
+                # Also click a close button if one is still showing. The overlay kernel finds and
+                # clicks it in one round trip, so modals that Escape already closed cost nothing more.
+                try:
+                    if await self._evaluate_kernel(page, 'dismissOverlay', self._DISMISS_OVERLAY_JS, self.MODAL_CLOSE_SELECTORS):
+                        await self._wait_settled(page, 200)
+                except:
+                    pass
                         
             except Exception as e:
-                print(f"      ⚠️  Modal test failed: {str(e)}")
+                if self.verbose:
+                    print(f"      ⚠️  Modal test failed: {str(e)}")
                 continue
         
         if modal_count == 0:
-            print(f"    🔲 No viewport-visible modals found in {viewport_name}")
+            if self.verbose:
+                print(f"    🔲 No viewport-visible modals found in {viewport_name}")
     
-    async def _test_accordions(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector):
+    async def _test_accordions(self, page: Page, page_url: str, viewport_name: str, viewport_key: str, evidence_collector: EvidenceCollector, accordion_elements: Optional[List[Dict[str, Any]]] = None):
         """Test accordion/collapsible elements by toggling them and capturing screenshots"""
         
         # PHASE 3: Find accordion triggers that are visible in current viewport
-        accordion_elements = await self._find_viewport_visible_elements(page, [
-            '.accordion-button',
-            '[data-toggle="collapse"]',
-            '[data-bs-toggle="collapse"]',
-            'details summary',
-            '.collapsible-header'
-        ])
+        if accordion_elements is None:
+            accordion_elements = await self._find_viewport_visible_elements(page, self.ACCORDION_SELECTORS)
         
         # Filter out already-tested accordions to prevent duplicate testing
-        untested_accordions = self.interaction_tracker.filter_untested_elements(accordion_elements, "accordion")
+        untested_accordions = self.interaction_tracker.filter_untested_elements(accordion_elements, "accordion", limit=4)
         
         if not untested_accordions:
             return
         
         accordion_count = 0
-        for element_info in untested_accordions[:4]:  # Limit to 4 new accordions in viewport
+        for element_info in untested_accordions:  # At most 4 new accordions in viewport
             try:
                 selector = element_info['selector']
                 element_locator = page.locator(selector).first
@@ -1001,7 +1708,8 @@ class StructuredExplorer:
                 click_success = await self._safe_click_element(page, element_locator, selector)
                 
                 if not click_success:
-                    print(f"      ⚠️  Could not click accordion {accordion_count}, skipping")
+                    if self.verbose:
+                        print(f"      ⚠️  Could not click accordion {accordion_count}, skipping")
                     continue
                 
                 # Record the action
@@ -1011,63 +1719,36 @@ class StructuredExplorer:
                 # Mark as tested to prevent duplicate testing in future scroll positions
                 self.interaction_tracker.mark_as_tested(element_info, "accordion")
                 
-                await asyncio.sleep(0.3)  # Wait for expansion
+                await self._wait_settled(page, 300)  # Wait for expansion
                 
                 # Screenshot while accordion is EXPANDED
-                screenshot_id = f"accordion_{accordion_count}_expanded_{viewport_key}"
-                screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
+                screenshot_path = None
+                if 'accordions' in self.capture_modes:
+                    screenshot_id = f"accordion_{accordion_count}_expanded_{viewport_key}"
+                    screenshot_path = await evidence_collector.capture_bug_screenshot(screenshot_id, viewport_key)
                 
-                if screenshot_path:                    
+                if screenshot_path:
                     # Analyze accordion expanded state
-                    accordion_bugs, error = await analyze_screenshot(
-                        screenshot_path, 
-                        f"accordion expanded",
-                        viewport_key, 
-                        page_url, 
-                        self.model,
-                        self.verbose
-                    )
-                    if error:
-                        if self.verbose:
-                            print(f"      ⚠️  {self.model.title()} analysis error: {error}")
-                    else:
-                        # Update screenshot paths in the bug evidence and populate reproduction steps
-                        for bug in accordion_bugs:
-                            bug.evidence.screenshot_path = screenshot_path
-                            # Populate reproduction steps from action recorder
-                            if self.action_recorder:
-                                bug.reproduction_steps = self._format_reproduction_steps()
-                        self.bugs.extend(accordion_bugs)
-                        if accordion_bugs:
-                            print(f"      🔍 Found {len(accordion_bugs)} visual issues in accordion")
+                    self._queue_analysis(screenshot_path, "accordion expanded", viewport_key, page_url, "in accordion", 'accordions')
                 
                 # Close accordion
                 await self._safe_click_element(page, element_locator, selector)
-                await asyncio.sleep(0.3)
+                await self._wait_settled(page, 300)
                         
             except Exception as e:
-                print(f"      ⚠️  Accordion test failed: {str(e)}")
+                if self.verbose:
+                    print(f"      ⚠️  Accordion test failed: {str(e)}")
                 continue
         
         if accordion_count == 0:
-            print(f"    📁 No viewport-visible accordions found in {viewport_name}")
+            if self.verbose:
+                print(f"    📁 No viewport-visible accordions found in {viewport_name}")
     
-    async def _get_viewport_artifacts(self, evidence_collector: EvidenceCollector) -> List[str]:
+    def _get_viewport_artifacts(self) -> List[str]:
         """Get list of all screenshots captured during exploration"""
-        import os
-        import glob
-        
-        try:
-            screenshots_dir = evidence_collector.screenshots_dir
-            if os.path.exists(screenshots_dir):
-                # Find all screenshots from this exploration session
-                all_screenshots = glob.glob(os.path.join(screenshots_dir, "*.png"))
-                return sorted(all_screenshots)
-            
-        except Exception as e:
-            print(f"Warning: Could not collect viewport artifacts: {str(e)}")
-            
-        return []
+        # Viewport passes record their captures as they go, so there's no need to
+        # list the screenshots directory (which is shared by every page in the run)
+        return sorted(self.captured_screenshots)
     
     def _create_bug_with_repro_steps(self, type: str, severity: str, page_url: str, summary: str, suggested_fix: str = None, evidence: Evidence = None) -> Bug:
         """Create a bug with current reproduction steps included"""
@@ -1079,7 +1760,7 @@ class StructuredExplorer:
             evidence.action_log = self.action_recorder.format_steps_for_human()
         
         bug = Bug(
-            id=str(uuid.uuid4()),
+            id=new_bug_id(),
             type=type,
             severity=severity,
             page_url=page_url,
@@ -1,22 +1,20 @@
 import asyncio
 import time
-import uuid
 import os
 import tempfile
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Response, TimeoutError as PlaywrightTimeoutError
 
 from core.types import Inspector as InspectorInterface, PageResult, Bug, Evidence
 from inspector.utils.evidence import EvidenceCollector
-from inspector.utils.performance import PerformanceTracker
-from inspector.playwright_helpers.page_setup import PageSetup
+from inspector.playwright_helpers.page_setup import DEFAULT_TIMEOUTS, PageSetup
 from inspector.playwright_helpers.link_detection import LinkDetector
 from inspector.checks.structured_explorer import StructuredExplorer
 from inspector.checks.accessibility_scanner import AccessibilityScanner
 from inspector.checks.performance_scanner import PerformanceScanner
-from inspector.checks.base_scanner import ScanConfig
+from inspector.checks.base_scanner import ScanConfig, new_bug_id
 
 
 class Inspector(InspectorInterface):
@@ -31,11 +29,16 @@ class Inspector(InspectorInterface):
     _browser: Optional[Browser] = None
     _playwright = None
     
+    # Persistent context and pool of reusable pages rented out per inspection
+    _context: Optional[BrowserContext] = None
+    _page_pool: Optional[asyncio.Queue] = None
+    _pages_created: int = 0
+    
+    # Upper bound on pooled pages (page creation is cheap, but each holds a renderer)
+    PAGE_POOL_SIZE = min(os.cpu_count() or 4, 8)
+    
     # Default timeouts
-    DEFAULT_TIMEOUTS = {
-        "nav_ms": 30000,    # 30 seconds for navigation
-        "action_ms": 5000   # 5 seconds for interactions
-    }
+    DEFAULT_TIMEOUTS = DEFAULT_TIMEOUTS
     
     def __new__(cls, testing_mode: bool = False, scan_config: ScanConfig = None, verbose: bool = False) -> 'Inspector':
         if cls._instance is None:
@@ -53,6 +56,15 @@ class Inspector(InspectorInterface):
         self.scan_config = scan_config or ScanConfig.all_scans()
         self.verbose = verbose
         
+        # Caps concurrent inspections so parallel callers can't overload the browser
+        self._semaphore = asyncio.BoundedSemaphore(self.scan_config.max_concurrency)
+        self._browser_lock = asyncio.Lock()
+        
+        # Pages navigated ahead of time, by URL: tasks resolving to an opened page
+        self._prefetches: Dict[str, asyncio.Task] = {}
+        # Prefetches nobody claimed, releasing their page once navigation finishes
+        self._prefetch_discards: Set[asyncio.Task] = set()
+        
         # Set output directory based on testing mode
         if self.testing_mode:
             # Use permanent location relative to project directory
@@ -76,6 +88,14 @@ class Inspector(InspectorInterface):
     
     async def _ensure_browser_ready(self):
         """Ensure the browser is launched and ready"""
+        # Called for every inspection; once the browser is up there's nothing to wait on the lock for
+        if self._context is not None and self._browser is not None and self._browser.is_connected():
+            return
+        async with self._browser_lock:
+            await self._launch_browser_if_needed()
+    
+    async def _launch_browser_if_needed(self):
+        """Launch the browser and persistent context if they aren't running"""
         if self._browser is None or not self._browser.is_connected():
             if self._playwright is None:
                 self._playwright = await async_playwright().start()
@@ -84,6 +104,46 @@ class Inspector(InspectorInterface):
                 headless=True,
                 args=['--no-sandbox', '--disable-dev-shm-usage']  # Better for containers
             )
+            
+            # Pages from a previous browser are gone with it
+            Inspector._context = None
+            Inspector._page_pool = None
+            Inspector._pages_created = 0
+        
+        if self._context is None:
+            Inspector._context = await self._create_context()
+            Inspector._page_pool = asyncio.Queue()
+    
+    async def _acquire_page(self) -> Page:
+        """Rent a page from the pool, creating one while the pool is below its size limit"""
+        while True:
+            if self._page_pool.empty() and self._pages_created < self.PAGE_POOL_SIZE:
+                Inspector._pages_created += 1
+                try:
+                    return await self._context.new_page()
+                except Exception:
+                    Inspector._pages_created -= 1
+                    raise
+            
+            page = await self._page_pool.get()
+            if not page.is_closed():
+                return page
+            Inspector._pages_created -= 1
+    
+    async def _release_page(self, page: Page):
+        """Reset a rented page and return it to the pool, dropping it if it can't be reused"""
+        try:
+            await page.goto("about:blank")
+        except Exception:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        
+        if page.is_closed():
+            Inspector._pages_created -= 1
+        else:
+            self._page_pool.put_nowait(page)
     
     async def inspect_page(self, url: str, scan_config: ScanConfig = None) -> PageResult:
         """
@@ -96,25 +156,90 @@ class Inspector(InspectorInterface):
         Returns:
             PageResult with all findings from configured scans
         """
-        await self._ensure_browser_ready()
+        async with self._semaphore:
+            return await self._inspect_page(url, scan_config)
+    
+    async def inspect_pages(self, urls: List[str], scan_config: ScanConfig = None) -> List[PageResult]:
+        """
+        Inspect several pages concurrently, bounded by the configured max_concurrency.
         
-        context = None
-        try:
-            # Create browser context
-            context = await self._create_context()
+        Args:
+            urls: The URLs to inspect
+            scan_config: Optional scan configuration (uses instance default if not provided)
             
-            # Set up page
-            page = await context.new_page()
+        Returns:
+            PageResults in the same order as urls
+        """
+        return list(await asyncio.gather(*(self.inspect_page(url, scan_config) for url in urls)))
+    
+    def prefetch(self, url: str):
+        """
+        Start navigating to a URL in the background so a later inspect_page(url) can skip the wait.
+        
+        The prefetch is kept until inspect_page(url) claims it, so it can be started while an
+        earlier prefetch is still waiting to be claimed. One that is never claimed is released
+        when a later page is inspected. Needs a spare pooled page besides the one being inspected.
+        """
+        if url in self._prefetches or self.PAGE_POOL_SIZE < 2:
+            return
+        self._prefetches[url] = asyncio.ensure_future(self._open_page(url))
+    
+    async def _open_page(self, url: str) -> Tuple[Page, PageSetup, bool, float]:
+        """Rent a page and navigate it to url, returning (page, setup, success, navigation ms)"""
+        await self._ensure_browser_ready()
+        page = await self._acquire_page()
+        try:
             page_setup = PageSetup(page, url, self.DEFAULT_TIMEOUTS)
-            
-            # Navigate to URL
             navigation_start = time.time()
             success = await page_setup.navigate_safely()
+        except BaseException:
+            await self._release_page(page)
+            raise
+        return page, page_setup, success, (time.time() - navigation_start) * 1000
+    
+    async def _take_prefetched(self, url: str) -> Optional[Tuple[Page, PageSetup, bool, float]]:
+        """Claim the prefetched page for url, releasing older prefetches that were never claimed"""
+        task = self._prefetches.pop(url, None)
+        
+        # The newest prefetch is the hint for the page after this one; anything older was skipped
+        for stale_url in list(self._prefetches)[:-1]:
+            self._discard_prefetch(self._prefetches.pop(stale_url))
+        
+        if task is None:
+            return None
+        try:
+            return await task
+        except Exception:
+            return None
+    
+    def _discard_prefetch(self, task: asyncio.Task):
+        """Return a prefetched page to the pool once its navigation finishes, without waiting for it"""
+        discard = asyncio.ensure_future(self._release_prefetched(task))
+        self._prefetch_discards.add(discard)
+        discard.add_done_callback(self._prefetch_discards.discard)
+    
+    async def _release_prefetched(self, task: asyncio.Task):
+        """Wait for a prefetch nobody claimed and release its page"""
+        try:
+            opened = await task
+        except Exception:
+            return
+        await self._release_page(opened[0])
+    
+    async def _inspect_page(self, url: str, scan_config: ScanConfig = None) -> PageResult:
+        """Inspect a single page; callers go through inspect_page for concurrency limiting"""
+        await self._ensure_browser_ready()
+        
+        page = None
+        try:
+            # Use the prefetched page if one was navigated ahead for this URL, else rent and navigate
+            opened = await self._take_prefetched(url) or await self._open_page(url)
+            page, page_setup, success, navigation_duration = opened
             
             if not success:
                 result = PageResult(page_url=url)
                 result.findings.append(Bug(
-                    id=str(uuid.uuid4()),
+                    id=new_bug_id(),
                     type="Logic",
                     severity="high", 
                     page_url=url,
@@ -132,29 +257,39 @@ class Inspector(InspectorInterface):
             # Initialize result
             result = PageResult(page_url=url)
             result.status = status
-            result.timings['navigation_duration'] = (time.time() - navigation_start) * 1000
+            result.timings['navigation_duration'] = navigation_duration
+            
+            # The accessibility and performance scans and link collection don't change the
+            # page, so run them together. The scans report into their own results, merged in
+            # a fixed order afterwards so findings don't depend on which finished first.
+            scan_results = [PageResult(page_url=url), PageResult(page_url=url)]
+            checks = [self._collect_links(page, url, result)]
             
             # Run accessibility scan if enabled
             if config.accessibility:
-                await self._run_accessibility_scan(page, url, result)
+                checks.append(self._run_accessibility_scan(page, url, scan_results[0]))
             
             # Run performance scan if enabled
             if config.performance:
-                await self._run_performance_scan(page, url, result)
+                checks.append(self._run_performance_scan(page, url, scan_results[1]))
+            
+            # Let every check finish with the page before surfacing a failure and releasing it
+            for outcome in await asyncio.gather(*checks, return_exceptions=True):
+                if isinstance(outcome, BaseException):
+                    raise outcome
             
-            # Collect outlinks and navigation metadata (always needed for crawling and action recording)
-            link_detector = LinkDetector(page, url)
-            result.outlinks = await link_detector.collect_outlinks()
-            result.navigation_metadata = await link_detector.get_navigation_metadata()
+            for scan_result in scan_results:
+                result.findings.extend(scan_result.findings)
+                result.timings.update(scan_result.timings)
             
             # Run comprehensive UI scans (visual + interactive) if enabled
             if config.ui_scans:
-                await self._run_ui_scans(page, url, result, config)
+                await self._run_ui_scans(page, url, result, config, page_setup.response)
             
         except PlaywrightTimeoutError:
             result = PageResult(page_url=url)
             result.findings.append(Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="UI",
                 severity="medium",
                 page_url=url,
@@ -165,7 +300,7 @@ class Inspector(InspectorInterface):
         except Exception as e:
             result = PageResult(page_url=url)
             result.findings.append(Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="Logic", 
                 severity="high",
                 page_url=url,
@@ -174,17 +309,23 @@ class Inspector(InspectorInterface):
             ))
             
         finally:
-            if context:
-                await context.close()
+            if page:
+                await self._release_page(page)
                 
         return result
     
+    async def _collect_links(self, page: Page, url: str, result: PageResult):
+        """Collect outlinks and navigation metadata (always needed for crawling and action recording)"""
+        link_detector = LinkDetector(page, url)
+        result.outlinks = await link_detector.collect_outlinks()
+        result.navigation_metadata = await link_detector.get_navigation_metadata()
+    
     async def _run_accessibility_scan(self, page: Page, url: str, result: PageResult):
         """Run accessibility scan and merge results"""
         try:
             if self.verbose:
                 print(f"🔍 Running accessibility scan for {url}")
-            accessibility_scanner = AccessibilityScanner(self.output_dir, self.verbose)
+            accessibility_scanner = AccessibilityScanner(self.output_dir, verbose=self.verbose)
             
             # Run multi-viewport accessibility scan to catch responsive design issues
             accessibility_result = await accessibility_scanner.scan_all_viewports(page, url)
@@ -195,7 +336,7 @@ class Inspector(InspectorInterface):
                 print(f"❌ Accessibility scan failed: {str(e)}")
             # Add error bug
             error_bug = Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="Accessibility",
                 severity="medium",
                 page_url=url,
@@ -211,34 +352,20 @@ class Inspector(InspectorInterface):
                 print(f"⚡ Running performance scan for {url}")
             performance_scanner = PerformanceScanner(self.output_dir, self.verbose)
             
-            # Run performance scan across multiple viewports to catch responsive performance issues
-            viewports = ["1280x800", "768x1024", "375x667"]  # Desktop, tablet, mobile
+            # Metrics come from the page load's navigation/paint timing, which doesn't change
+            # when the viewport is resized, so one pass covers every viewport
+            perf_result = await performance_scanner.scan(page, url)
+            perf_result.merge_into_page_result(result)
             
-            for viewport in viewports:
-                # Parse viewport dimensions
-                width, height = map(int, viewport.split('x'))
-                
-                # Set viewport
-                await page.set_viewport_size({"width": width, "height": height})
-                
-                # Wait for any layout changes to settle
-                await page.wait_for_timeout(500)
-                
-                # Run performance scan for this viewport
-                perf_result = await performance_scanner.scan(page, url, viewport)
-                perf_result.merge_into_page_result(result)
-            
-            # Also collect the performance timing data into the result
-            performance_tracker = PerformanceTracker()
-            timing_data = await performance_tracker.collect_timings(page)
-            result.timings.update(timing_data)
+            # Reuse the collected timing data instead of querying the page again
+            result.timings.update(perf_result.timings)
             
         except Exception as e:
             if self.verbose:
                 print(f"❌ Performance scan failed: {str(e)}")
             # Add error bug
             error_bug = Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="Performance",
                 severity="medium",
                 page_url=url,
@@ -247,7 +374,8 @@ class Inspector(InspectorInterface):
             )
             result.findings.append(error_bug)
     
-    async def _run_ui_scans(self, page: Page, url: str, result: PageResult, config: ScanConfig):
+    async def _run_ui_scans(self, page: Page, url: str, result: PageResult, config: ScanConfig,
+                            document_response: Optional[Response] = None):
         """Run comprehensive UI scans"""
         try:
             if self.verbose:
@@ -259,6 +387,9 @@ class Inspector(InspectorInterface):
             # Pass navigation metadata for better action recording
             explorer.navigation_metadata = result.navigation_metadata
             
+            # Sibling viewport pages are served the document this page loaded
+            explorer.document_response = document_response
+            
             # Always run complete exploration (visual + interactive)
             explorer_result = await explorer.run_complete_exploration(page, url)
             
@@ -272,7 +403,7 @@ class Inspector(InspectorInterface):
                 print(f"❌ UI scan failed: {str(e)}")
             # Add error bug
             error_bug = Bug(
-                id=str(uuid.uuid4()),
+                id=new_bug_id(),
                 type="UI",
                 severity="medium",
                 page_url=url,
@@ -283,7 +414,7 @@ class Inspector(InspectorInterface):
     
     async def _create_context(self) -> BrowserContext:
         """Create a browser context with sensible defaults"""
-        return await self._browser.new_context(
+        context = await self._browser.new_context(
             viewport=None,  # We'll set viewport per check
             user_agent='Mantis-UI-Inspector/1.0',
             ignore_https_errors=True,  # Be lenient with SSL issues
@@ -291,10 +422,28 @@ class Inspector(InspectorInterface):
                 'Accept-Language': 'en-US,en;q=0.9'
             }
         )
+        await StructuredExplorer.install_dom_kernels(context)
+        return context
     
     
     async def close(self):
         """Clean up resources"""
+        for url in list(self._prefetches):
+            self._discard_prefetch(self._prefetches.pop(url))
+        if self._prefetch_discards:
+            await asyncio.gather(*self._prefetch_discards)
+        if self._page_pool is not None:
+            while not self._page_pool.empty():
+                page = self._page_pool.get_nowait()
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        if self._context is not None:
+            try:
+                await self._context.close()
+            except Exception:
+                pass
         if self._browser and self._browser.is_connected():
             await self._browser.close()
         if self._playwright:
@@ -304,6 +453,9 @@ class Inspector(InspectorInterface):
         Inspector._instance = None
         Inspector._browser = None
         Inspector._playwright = None
+        Inspector._context = None
+        Inspector._page_pool = None
+        Inspector._pages_created = 0
     
     def __del__(self):
         """Cleanup on deletion"""
@@ -2,6 +2,8 @@ from typing import List, Set
 from urllib.parse import urljoin, urlparse
 from playwright.async_api import Page
 
+from inspector.playwright_helpers.page_setup import evaluate_kernel, wait_for_content_settled
+
 
 class LinkDetector:
     """
@@ -11,6 +13,334 @@ class LinkDetector:
     should consider for crawling.
     """
     
+    # Every href on the page, from anchors plus onclick handlers and data attributes
+    _ALL_LINKS_JS = """
+    () => {
+        // Navigation menus repeat the same hrefs (header, footer, mobile nav), so
+        // collect into a Set to send each distinct link over once
+        const links = new Set();
+        
+        // Get all anchor tags with href
+        const anchors = document.querySelectorAll('a[href]');
+        anchors.forEach(anchor => {
+            const href = anchor.getAttribute('href');
+            if (href && href.trim()) {
+                links.add(href.trim());
+            }
+        });
+        
+        // Also check for links in onclick handlers or data attributes
+        const clickableElements = document.querySelectorAll('[onclick], [data-href], [data-url]');
+        clickableElements.forEach(element => {
+            // Extract URLs from onclick handlers
+            const onclick = element.getAttribute('onclick');
+            if (onclick) {
+                const urlMatch = onclick.match(/(?:window\.location\.href|location\.href|window\.open|navigate)\s*=?\s*['"`]([^'"`]+)['"`]/);
+                if (urlMatch) {
+                    links.add(urlMatch[1]);
+                }
+            }
+            
+            // Extract from data attributes
+            const dataHref = element.getAttribute('data-href') || element.getAttribute('data-url');
+            if (dataHref) {
+                links.add(dataHref);
+            }
+        });
+        
+        return Array.from(links);
+    }
+    """
+    
+    # Routes exposed by client-side routers and router-style nav links
+    _REACT_ROUTES_JS = """
+    () => {
+        const routes = [];
+        
+        // Method 1: Check for React Router in window
+        if (window.__REACT_ROUTER__) {
+            try {
+                const router = window.__REACT_ROUTER__;
+                if (router.routes) {
+                    router.routes.forEach(route => {
+                        if (route.path) routes.push(route.path);
+                    });
+                }
+            } catch (e) {}
+        }
+        
+        // Method 2: Check for Next.js router
+        if (window.__NEXT_DATA__ && window.__NEXT_DATA__.page) {
+            try {
+                const page = window.__NEXT_DATA__.page;
+                if (page && page !== '/') {
+                    routes.push(page);
+                }
+            } catch (e) {}
+        }
+        
+        // Method 3: Look for navigation elements with React Router patterns
+        const navElements = document.querySelectorAll('nav a, .nav a, [role="navigation"] a');
+        navElements.forEach(link => {
+            const href = link.getAttribute('href');
+            if (href && !href.startsWith('http') && !href.startsWith('mailto:')) {
+                routes.push(href);
+            }
+        });
+        
+        // Method 4: Look for Next.js Link components (they might have data attributes)
+        const nextLinks = document.querySelectorAll('[data-testid*="link"], [data-next-link]');
+        nextLinks.forEach(link => {
+            const href = link.getAttribute('href');
+            if (href && !href.startsWith('http') && !href.startsWith('mailto:')) {
+                routes.push(href);
+            }
+        });
+        
+        return [...new Set(routes)]; // Remove duplicates
+    }
+    """
+    
+    # Route patterns found in the page's HTML and script sources
+    _BUNDLE_ROUTES_JS = """
+    () => {
+        const routes = [];
+        
+        try {
+            // Route patterns live in href attributes and inline script text, so read those
+            // directly rather than serializing the whole document to search it
+            const scriptContent = Array.from(document.scripts)
+                .filter(script => !script.src)
+                .map(script => script.text)
+                .join('\\n');
+            
+            // Next.js App Router patterns: href="/about", href='/contact'
+            const hrefs = Array.from(document.querySelectorAll('[href^="/"]'), element => element.getAttribute('href'));
+            const scriptHrefs = scriptContent.match(/href=["']\/[^"']*["']/g);
+            if (scriptHrefs) {
+                scriptHrefs.forEach(match => hrefs.push(match.match(/href=["'](\/[^"']*)["']/)[1]));
+            }
+            hrefs.forEach(route => {
+                if (route && route !== '/' && !route.includes('_next') && !route.includes('.')) {
+                    routes.push(route);
+                }
+            });
+            
+            // React Router patterns: to:"/about-me"
+            const reactRoutes = scriptContent.match(/to:"([^"]+)"/g);
+            if (reactRoutes) {
+                reactRoutes.forEach(match => {
+                    const route = match.match(/to:"([^"]+)"/)[1];
+                    if (route && route.startsWith('/') && !route.includes('_next')) {
+                        routes.push(route);
+                    }
+                });
+            }
+            
+            // Vue Router patterns: path:"/about"
+            const vueRoutes = scriptContent.match(/path:"([^"]+)"/g);
+            if (vueRoutes) {
+                vueRoutes.forEach(match => {
+                    const route = match.match(/path:"([^"]+)"/)[1];
+                    if (route && route.startsWith('/') && !route.includes('_next')) {
+                        routes.push(route);
+                    }
+                });
+            }
+            
+            // Look for Next.js page files in script sources
+            const scripts = Array.from(document.scripts);
+            scripts.forEach(script => {
+                if (script.src && script.src.includes('/app/')) {
+                    // Extract potential page routes from Next.js app directory structure
+                    const matches = script.src.match(/\/app\/([^\/]+)\/page-/);
+                    if (matches && matches[1] !== 'page') {
+                        routes.push('/' + matches[1]);
+                    }
+                }
+            });
+            
+        } catch (e) {
+            console.log('Error parsing bundles:', e);
+        }
+        
+        return [...new Set(routes)]; // Remove duplicates
+    }
+    """
+    
+    # Routes from navigation elements, inferred from link text when there's no href
+    _NAVIGATION_ROUTES_JS = """
+    () => {
+        const routes = [];
+        
+        // Look for navigation patterns (including Next.js navigation)
+        const selectors = [
+            'nav a[href]',
+            '.navbar a[href]',
+            '.navigation a[href]',
+            '[role="navigation"] a[href]',
+            '.menu a[href]',
+            '.nav-links a[href]',
+            // Next.js specific patterns - look for clickable navigation elements
+            'nav div[class*="cursor-pointer"]',
+            '.navbar div[class*="cursor-pointer"]',
+            '.navigation div[class*="cursor-pointer"]',
+            '[role="navigation"] div[class*="cursor-pointer"]',
+            '.menu div[class*="cursor-pointer"]',
+            '.nav-links div[class*="cursor-pointer"]',
+            // Common Next.js navigation container patterns
+            '.bg-gray-800 div[class*="cursor-pointer"]',
+            'div[class*="flex"] div[class*="cursor-pointer"]',
+            // Button-based navigation (common in modern React apps)
+            'nav button',
+            '.navbar button',
+            '.navigation button',
+            '[role="navigation"] button',
+            '.menu button',
+            '.nav-links button',
+            // Sidebar navigation patterns
+            'div[class*="space-y"] button',
+            'div[class*="flex-col"] button'
+        ];
+        
+        // Many of these overlap (a nav link inside a .menu matches several), so query
+        // them together to visit and read each element once
+        try {
+            document.querySelectorAll(selectors.join(', ')).forEach(link => {
+                const href = link.getAttribute('href');
+                if (href && 
+                    !href.startsWith('http') && 
+                    !href.startsWith('mailto:') && 
+                    !href.startsWith('tel:') &&
+                    !href.startsWith('javascript:')) {
+                    routes.push(href);
+                } else if (!href && link.textContent) {
+                    // For Next.js navigation divs, infer routes from text content dynamically
+                    const text = link.textContent.trim();
+                    const cleanText = text.toLowerCase().replace(/[^\w\s]/g, '').trim();
+                    
+                    // Skip empty or very short text
+                    if (cleanText.length < 2) return;
+                    
+                    // Handle special cases first
+                    if (cleanText.includes('home') || text.includes('🏠')) {
+                        routes.push('/');
+                        return;
+                    }
+                    
+                    // For other navigation items, create route from the text
+                    // Remove common words and clean up
+                    const words = cleanText.split(/\s+/).filter(word => 
+                        word.length > 1 && 
+                        !['the', 'and', 'or', 'of', 'to', 'in', 'a', 'an'].includes(word)
+                    );
+                    
+                    if (words.length > 0) {
+                        const routeName = words[0];
+                        
+                        // Filter out common UI controls that aren't navigation routes
+                        const uiControls = ['sign', 'login', 'logout', 'dark', 'light', 'theme', 'toggle', 'menu', 'close', 'open', 'search'];
+                        if (!uiControls.includes(routeName)) {
+                            routes.push('/' + routeName);
+                        }
+                    }
+                }
+            });
+        } catch (e) {}
+        
+        return [...new Set(routes)]; // Remove duplicates
+    }
+    """
+    
+    # Runs all four scans in one evaluate. Route discovery is best effort, so a failing
+    # route scan yields no routes, while a failing link scan fails the whole call.
+    _LINK_SCAN_JS = f"""
+    () => {{
+        const routesOrNone = (scan) => {{
+            try {{
+                return scan();
+            }} catch (e) {{
+                return [];
+            }}
+        }};
+        return {{
+            links: ({_ALL_LINKS_JS})(),
+            reactRoutes: routesOrNone({_REACT_ROUTES_JS}),
+            bundleRoutes: routesOrNone({_BUNDLE_ROUTES_JS}),
+            navigationRoutes: routesOrNone({_NAVIGATION_ROUTES_JS})
+        }};
+    }}
+    """
+    
+    # Relative navigation links by href, with the text and selectors used to describe
+    # them in recorded actions
+    _NAVIGATION_METADATA_JS = """
+    () => {
+        const navigationMap = {};
+        
+        // Look for navigation patterns
+        const selectors = [
+            'nav a[href]',
+            '.navbar a[href]',
+            '.navigation a[href]',
+            '[role="navigation"] a[href]',
+            '.menu a[href]',
+            '.nav-links a[href]'
+        ];
+        
+        // One DOM walk over the union of the selectors, giving the same result as a pass
+        // per selector: each link keeps its index among every selector's matches for the
+        // nth-of-type selector, a URL is described by the last selector that matches one
+        // of its links, and URLs are listed in the order those passes would first add them
+        const matchCounts = new Array(selectors.length).fill(0);
+        const describedBy = {};
+        const firstAdded = {};
+        
+        document.querySelectorAll(selectors.join(', ')).forEach((link, position) => {
+            let first = -1;
+            let last = -1;
+            let index = 0;
+            selectors.forEach((selector, s) => {
+                if (link.matches(selector)) {
+                    if (first === -1) first = s;
+                    last = s;
+                    index = matchCounts[s]++;
+                }
+            });
+            
+            const href = link.getAttribute('href');
+            if (href && 
+                !href.startsWith('http') && 
+                !href.startsWith('mailto:') && 
+                !href.startsWith('tel:') &&
+                !href.startsWith('javascript:')) {
+                
+                if (!firstAdded[href] || first < firstAdded[href][0]) {
+                    firstAdded[href] = [first, position];
+                }
+                if (describedBy[href] > last) return;
+                
+                // Create a unique selector for this link
+                const selector = selectors[last];
+                const linkText = link.textContent?.trim() || '';
+                const linkSelector = `${selector.split('[')[0]}:nth-of-type(${index + 1})`;
+                
+                describedBy[href] = last;
+                navigationMap[href] = {
+                    text: linkText,
+                    selector: linkSelector,
+                    originalSelector: selector,
+                    title: link.getAttribute('title') || '',
+                    ariaLabel: link.getAttribute('aria-label') || ''
+                };
+            }
+        });
+        
+        const byFirstAdded = (a, b) => firstAdded[a][0] - firstAdded[b][0] || firstAdded[a][1] - firstAdded[b][1];
+        return Object.fromEntries(Object.keys(navigationMap).sort(byFirstAdded).map(href => [href, navigationMap[href]]));
+    }
+    """
+    
     def __init__(self, page: Page, current_url: str):
         self.page = page
         self.current_url = current_url
@@ -25,17 +355,17 @@ class LinkDetector:
         """
         try:
             # Wait a bit longer for client-side JavaScript to execute (especially for Next.js)
-            await self.page.wait_for_timeout(2000)
+            await wait_for_content_settled(self.page, 2000)
             
-            # Get all links from the page
-            raw_links = await self._extract_all_links()
+            # Get all links and candidate SPA routes from the page in one evaluate
+            scan = await evaluate_kernel(self.page, 'linkScan', self._LINK_SCAN_JS)
             
             # Process and filter links
-            processed_links = self._process_links(raw_links)
+            processed_links = self._process_links(scan['links'])
             
-            # Check for SPA routes and add them
-            spa_routes = await self._discover_spa_routes()
-            processed_links.extend(spa_routes)
+            # Add SPA routes
+            routes = scan['reactRoutes'] + scan['bundleRoutes'] + scan['navigationRoutes']
+            processed_links.extend(self._absolute_routes(routes))
             
             # Remove duplicates and return
             return list(set(processed_links))
@@ -46,45 +376,7 @@ class LinkDetector:
     
     async def _extract_all_links(self) -> List[str]:
         """Extract all href attributes from anchor tags"""
-        
-        # JavaScript to extract all links
-        js_code = """
-        () => {
-            const links = [];
-            
-            // Get all anchor tags with href
-            const anchors = document.querySelectorAll('a[href]');
-            anchors.forEach(anchor => {
-                const href = anchor.getAttribute('href');
-                if (href && href.trim()) {
-                    links.push(href.trim());
-                }
-            });
-            
-            // Also check for links in onclick handlers or data attributes
-            const clickableElements = document.querySelectorAll('[onclick], [data-href], [data-url]');
-            clickableElements.forEach(element => {
-                // Extract URLs from onclick handlers
-                const onclick = element.getAttribute('onclick');
-                if (onclick) {
-                    const urlMatch = onclick.match(/(?:window\.location\.href|location\.href|window\.open|navigate)\s*=?\s*['"`]([^'"`]+)['"`]/);
-                    if (urlMatch) {
-                        links.push(urlMatch[1]);
-                    }
-                }
-                
-                // Extract from data attributes
-                const dataHref = element.getAttribute('data-href') || element.getAttribute('data-url');
-                if (dataHref) {
-                    links.push(dataHref);
-                }
-            });
-            
-            return links;
-        }
-        """
-        
-        return await self.page.evaluate(js_code)
+        return await self.page.evaluate(self._ALL_LINKS_JS)
     
     def _process_links(self, raw_links: List[str]) -> List[str]:
         """
@@ -270,7 +562,10 @@ class LinkDetector:
         except Exception as e:
             print(f"Error discovering SPA routes: {str(e)}")
         
-        # Convert relative routes to absolute URLs and filter
+        return self._absolute_routes(routes)
+    
+    def _absolute_routes(self, routes: List[str]) -> List[str]:
+        """Convert relative routes to absolute same-host URLs"""
         absolute_routes = []
         for route in routes:
             if route and not route.startswith(('http://', 'https://')):
@@ -283,215 +578,22 @@ class LinkDetector:
     
     async def _discover_react_routes(self) -> List[str]:
         """Extract React Router routes from the page."""
-        js_code = """
-        () => {
-            const routes = [];
-            
-            // Method 1: Check for React Router in window
-            if (window.__REACT_ROUTER__) {
-                try {
-                    const router = window.__REACT_ROUTER__;
-                    if (router.routes) {
-                        router.routes.forEach(route => {
-                            if (route.path) routes.push(route.path);
-                        });
-                    }
-                } catch (e) {}
-            }
-            
-            // Method 2: Check for Next.js router
-            if (window.__NEXT_DATA__ && window.__NEXT_DATA__.page) {
-                try {
-                    const page = window.__NEXT_DATA__.page;
-                    if (page && page !== '/') {
-                        routes.push(page);
-                    }
-                } catch (e) {}
-            }
-            
-            // Method 3: Look for navigation elements with React Router patterns
-            const navElements = document.querySelectorAll('nav a, .nav a, [role="navigation"] a');
-            navElements.forEach(link => {
-                const href = link.getAttribute('href');
-                if (href && !href.startsWith('http') && !href.startsWith('mailto:')) {
-                    routes.push(href);
-                }
-            });
-            
-            // Method 4: Look for Next.js Link components (they might have data attributes)
-            const nextLinks = document.querySelectorAll('[data-testid*="link"], [data-next-link]');
-            nextLinks.forEach(link => {
-                const href = link.getAttribute('href');
-                if (href && !href.startsWith('http') && !href.startsWith('mailto:')) {
-                    routes.push(href);
-                }
-            });
-            
-            return [...new Set(routes)]; // Remove duplicates
-        }
-        """
-        
         try:
-            return await self.page.evaluate(js_code)
+            return await self.page.evaluate(self._REACT_ROUTES_JS)
         except Exception:
             return []
     
     async def _parse_js_bundles(self) -> List[str]:
         """Parse JavaScript bundles for route definitions."""
-        js_code = """
-        () => {
-            const routes = [];
-            
-            try {
-                // Look for route patterns in the current page's HTML and scripts
-                const pageContent = document.documentElement.innerHTML;
-                
-                // Next.js App Router patterns: href="/about", href='/contact'
-                const nextHrefRoutes = pageContent.match(/href=["']\/[^"']*["']/g);
-                if (nextHrefRoutes) {
-                    nextHrefRoutes.forEach(match => {
-                        const route = match.match(/href=["'](\/[^"']*)["']/)[1];
-                        if (route && route !== '/' && !route.includes('_next') && !route.includes('.')) {
-                            routes.push(route);
-                        }
-                    });
-                }
-                
-                // React Router patterns: to:"/about-me"
-                const reactRoutes = pageContent.match(/to:"([^"]+)"/g);
-                if (reactRoutes) {
-                    reactRoutes.forEach(match => {
-                        const route = match.match(/to:"([^"]+)"/)[1];
-                        if (route && route.startsWith('/') && !route.includes('_next')) {
-                            routes.push(route);
-                        }
-                    });
-                }
-                
-                // Vue Router patterns: path:"/about"
-                const vueRoutes = pageContent.match(/path:"([^"]+)"/g);
-                if (vueRoutes) {
-                    vueRoutes.forEach(match => {
-                        const route = match.match(/path:"([^"]+)"/)[1];
-                        if (route && route.startsWith('/') && !route.includes('_next')) {
-                            routes.push(route);
-                        }
-                    });
-                }
-                
-                // Look for Next.js page files in script sources
-                const scripts = Array.from(document.scripts);
-                scripts.forEach(script => {
-                    if (script.src && script.src.includes('/app/')) {
-                        // Extract potential page routes from Next.js app directory structure
-                        const matches = script.src.match(/\/app\/([^\/]+)\/page-/);
-                        if (matches && matches[1] !== 'page') {
-                            routes.push('/' + matches[1]);
-                        }
-                    }
-                });
-                
-            } catch (e) {
-                console.log('Error parsing bundles:', e);
-            }
-            
-            return [...new Set(routes)]; // Remove duplicates
-        }
-        """
-        
         try:
-            return await self.page.evaluate(js_code)
+            return await self.page.evaluate(self._BUNDLE_ROUTES_JS)
         except Exception:
             return []
     
     async def _discover_navigation_routes(self) -> List[str]:
         """Discover routes from navigation elements."""
-        js_code = """
-        () => {
-            const routes = [];
-            
-            // Look for navigation patterns (including Next.js navigation)
-            const selectors = [
-                'nav a[href]',
-                '.navbar a[href]',
-                '.navigation a[href]',
-                '[role="navigation"] a[href]',
-                '.menu a[href]',
-                '.nav-links a[href]',
-                // Next.js specific patterns - look for clickable navigation elements
-                'nav div[class*="cursor-pointer"]',
-                '.navbar div[class*="cursor-pointer"]',
-                '.navigation div[class*="cursor-pointer"]',
-                '[role="navigation"] div[class*="cursor-pointer"]',
-                '.menu div[class*="cursor-pointer"]',
-                '.nav-links div[class*="cursor-pointer"]',
-                // Common Next.js navigation container patterns
-                '.bg-gray-800 div[class*="cursor-pointer"]',
-                'div[class*="flex"] div[class*="cursor-pointer"]',
-                // Button-based navigation (common in modern React apps)
-                'nav button',
-                '.navbar button',
-                '.navigation button',
-                '[role="navigation"] button',
-                '.menu button',
-                '.nav-links button',
-                // Sidebar navigation patterns
-                'div[class*="space-y"] button',
-                'div[class*="flex-col"] button'
-            ];
-            
-            selectors.forEach(selector => {
-                try {
-                    const links = document.querySelectorAll(selector);
-                    links.forEach(link => {
-                        const href = link.getAttribute('href');
-                        if (href && 
-                            !href.startsWith('http') && 
-                            !href.startsWith('mailto:') && 
-                            !href.startsWith('tel:') &&
-                            !href.startsWith('javascript:')) {
-                            routes.push(href);
-                        } else if (!href && link.textContent) {
-                            // For Next.js navigation divs, infer routes from text content dynamically
-                            const text = link.textContent.trim();
-                            const cleanText = text.toLowerCase().replace(/[^\w\s]/g, '').trim();
-                            
-                            // Skip empty or very short text
-                            if (cleanText.length < 2) return;
-                            
-                            // Handle special cases first
-                            if (cleanText.includes('home') || text.includes('🏠')) {
-                                routes.push('/');
-                                return;
-                            }
-                            
-                            // For other navigation items, create route from the text
-                            // Remove common words and clean up
-                            const words = cleanText.split(/\s+/).filter(word => 
-                                word.length > 1 && 
-                                !['the', 'and', 'or', 'of', 'to', 'in', 'a', 'an'].includes(word)
-                            );
-                            
-                            if (words.length > 0) {
-                                const routeName = words[0];
-                                
-                                // Filter out common UI controls that aren't navigation routes
-                                const uiControls = ['sign', 'login', 'logout', 'dark', 'light', 'theme', 'toggle', 'menu', 'close', 'open', 'search'];
-                                if (!uiControls.includes(routeName)) {
-                                    routes.push('/' + routeName);
-                                }
-                            }
-                        }
-                    });
-                } catch (e) {}
-            });
-            
-            return [...new Set(routes)]; // Remove duplicates
-        }
-        """
-        
         try:
-            return await self.page.evaluate(js_code)
+            return await self.page.evaluate(self._NAVIGATION_ROUTES_JS)
         except Exception:
             return []
     
@@ -502,52 +604,7 @@ class LinkDetector:
         Returns:
             Dictionary mapping URLs to their navigation context (text, selector, etc.)
         """
-        js_code = """
-        () => {
-            const navigationMap = {};
-            
-            // Look for navigation patterns
-            const selectors = [
-                'nav a[href]',
-                '.navbar a[href]',
-                '.navigation a[href]',
-                '[role="navigation"] a[href]',
-                '.menu a[href]',
-                '.nav-links a[href]'
-            ];
-            
-            selectors.forEach(selector => {
-                try {
-                    const links = document.querySelectorAll(selector);
-                    links.forEach((link, index) => {
-                        const href = link.getAttribute('href');
-                        if (href && 
-                            !href.startsWith('http') && 
-                            !href.startsWith('mailto:') && 
-                            !href.startsWith('tel:') &&
-                            !href.startsWith('javascript:')) {
-                            
-                            // Create a unique selector for this link
-                            const linkText = link.textContent?.trim() || '';
-                            const linkSelector = `${selector.split('[')[0]}:nth-of-type(${index + 1})`;
-                            
-                            navigationMap[href] = {
-                                text: linkText,
-                                selector: linkSelector,
-                                originalSelector: selector,
-                                title: link.getAttribute('title') || '',
-                                ariaLabel: link.getAttribute('aria-label') || ''
-                            };
-                        }
-                    });
-                } catch (e) {}
-            });
-            
-            return navigationMap;
-        }
-        """
-        
         try:
-            return await self.page.evaluate(js_code)
+            return await evaluate_kernel(self.page, 'navigationMetadata', self._NAVIGATION_METADATA_JS)
         except Exception:
             return {}
@@ -1,15 +1,102 @@
 import asyncio
-from typing import Optional, Dict
+from typing import Any, Optional, Dict
 from urllib.parse import urlparse
 
 from playwright.async_api import Page, Response, TimeoutError as PlaywrightTimeoutError
 
 
+# Once fonts have loaded, content counts as settled when nothing has been added to the
+# DOM and no resources have been fetched for quietMs (waiting maxMs at most). Attribute
+# changes are ignored so carousels and other tickers don't hold the wait open.
+_CONTENT_SETTLED_JS = """
+([quietMs, maxMs]) => new Promise(resolve => {
+    const start = performance.now();
+    let lastChange = start;
+    let resourceCount = performance.getEntriesByType('resource').length;
+    let fontsLoaded = !document.fonts;
+    if (document.fonts) document.fonts.ready.then(() => { fontsLoaded = true; });
+    
+    const observer = new MutationObserver(() => { lastChange = performance.now(); });
+    observer.observe(document, { childList: true, subtree: true, characterData: true });
+    
+    const timer = setInterval(() => {
+        const now = performance.now();
+        const count = performance.getEntriesByType('resource').length;
+        if (count !== resourceCount) {
+            resourceCount = count;
+            lastChange = now;
+        }
+        if ((fontsLoaded && now - lastChange >= quietMs) || now - start >= maxMs) {
+            observer.disconnect();
+            clearInterval(timer);
+            resolve(true);
+        }
+    }, 50);
+})
+"""
+
+# How long the DOM and network must stay quiet for content to count as settled
+CONTENT_SETTLE_QUIET_MS = 200
+
+# Default timeouts, shared by the inspector and the scanners that open extra pages
+DEFAULT_TIMEOUTS = {
+    "nav_ms": 30000,    # 30 seconds for navigation
+    "action_ms": 5000   # 5 seconds for interactions
+}
+
+
+async def wait_for_content_settled(page: Page, max_ms: int):
+    """
+    Wait for client-side rendering and lazy-loaded content to settle, up to max_ms.
+    Returns as soon as the page goes quiet instead of always waiting the full time.
+    """
+    try:
+        await page.wait_for_function(_CONTENT_SETTLED_JS, arg=[CONTENT_SETTLE_QUIET_MS, max_ms], timeout=max_ms + 2000)
+    except Exception:
+        # Navigated away or closed mid-wait; callers proceed either way
+        pass
+
+
+# Calls a script injected into the page's window.__mantisKernels (see
+# StructuredExplorer.install_dom_kernels), or returns null when the page doesn't have them
+_CALL_KERNEL_JS = """
+async ([name, arg]) => window.__mantisKernels ? { value: await window.__mantisKernels[name](arg) } : null
+"""
+
+
+async def evaluate_kernel(page: Page, name: str, source: str, arg: Any = None) -> Any:
+    """
+    Run a page script, calling the copy injected as a kernel when the page has one and
+    sending the full source only when it doesn't.
+    """
+    result = await page.evaluate(_CALL_KERNEL_JS, [name, arg])
+    if result is None:
+        return await page.evaluate(source, arg)
+    return result.get('value')
+
+
 class PageSetup:
     """
     Handles safe page navigation and initial setup for inspection.
     """
     
+    # Common loading indicators, waited on to disappear before inspection
+    LOADING_SELECTORS = (
+        '.loading',
+        '.spinner',
+        '[data-loading="true"]',
+        '.loader'
+    )
+    
+    # True once nothing matching the selector is visible, by Playwright's definition of
+    # visible: a non-empty bounding box and no visibility:hidden
+    _NOTHING_VISIBLE_JS = """
+    (selector) => ![...document.querySelectorAll(selector)].some(element => {
+        const rect = element.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && window.getComputedStyle(element).visibility !== 'hidden';
+    })
+    """
+    
     def __init__(self, page: Page, url: str, timeouts: Dict[str, int]):
         self.page = page
         self.url = url
@@ -131,27 +218,19 @@ class PageSetup:
             await self.page.wait_for_load_state('networkidle', timeout=10000)
             
             # Wait for any lazy-loaded content
-            await asyncio.sleep(1)
-            
-            # Check for common loading indicators and wait for them to disappear
-            loading_selectors = [
-                '.loading',
-                '.spinner',
-                '[data-loading="true"]',
-                '.loader'
-            ]
+            await wait_for_content_settled(self.page, 1000)
             
-            for selector in loading_selectors:
-                try:
-                    # Wait for loading indicators to be hidden (if they exist)
-                    await self.page.wait_for_selector(
-                        selector, 
-                        state='hidden', 
-                        timeout=5000
-                    )
-                except PlaywrightTimeoutError:
-                    # Loading indicator might not exist, continue
-                    continue
+            # Check for common loading indicators and wait for them to disappear, polling
+            # all of them together rather than waiting on each selector in turn
+            try:
+                await self.page.wait_for_function(
+                    self._NOTHING_VISIBLE_JS,
+                    arg=', '.join(self.LOADING_SELECTORS),
+                    timeout=5000
+                )
+            except PlaywrightTimeoutError:
+                # A loading indicator is still showing, but we'll proceed with inspection
+                pass
                     
         except PlaywrightTimeoutError:
             # Page might still be loading, but we'll proceed with inspection
@@ -18,6 +18,12 @@ class ActionRecorder:
         self.current_viewport = initial_viewport
         self.steps: List[ReproStep] = []
         self.step_counter = 0
+    
+    def reset(self, page_url: str, initial_viewport: Optional[str] = None):
+        """Start a fresh recording for another page, reusing this recorder"""
+        self.page_url = page_url
+        self.current_viewport = initial_viewport
+        self.clear_steps()
         
     def record_navigation(self, url: str, description: str = ""):
         """Record a navigation action"""
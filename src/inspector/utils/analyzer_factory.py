@@ -2,11 +2,13 @@
 Factory for creating screenshot analyzers based on model configuration.
 """
 
-import base64
-import os
-from typing import List, Tuple, Optional
+import io
+import asyncio
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional
 
 from core.types import Bug
+from inspector.utils.evidence import read_screenshot, screenshot_exists
 
 
 async def analyze_screenshot(
@@ -38,17 +40,47 @@ async def analyze_screenshot(
         return await _analyze_with_cohere(screenshot_path, context, viewport, page_url, verbose)
 
 
+async def analyze_screenshot_bytes(
+    image_bytes: bytes,
+    screenshot_path: str,
+    context: str,
+    viewport: str,
+    page_url: str,
+    model: str = 'cohere',
+    verbose: bool = False
+) -> Tuple[List[Bug], Optional[str]]:
+    """
+    Analyze screenshot bytes the caller already holds, without reading them back by path.
+    
+    Args:
+        image_bytes: The captured screenshot
+        screenshot_path: Where the screenshot is saved, recorded in bug evidence
+        context: Description of what just happened (e.g., "after clicking Home dropdown")
+        viewport: Viewport size (e.g., "1280x800")
+        page_url: URL being tested
+        model: Which model to use ('cohere' or 'gemini')
+        
+    Returns:
+        Tuple of (bugs_found, error_message)
+    """
+    if model.lower() == 'gemini':
+        return await _analyze_with_gemini(screenshot_path, context, viewport, page_url, verbose, image_bytes)
+    else:  # Default to cohere
+        return await _analyze_with_cohere(screenshot_path, context, viewport, page_url, verbose, image_bytes)
+
+
 async def _analyze_with_gemini(
     screenshot_path: str, 
     context: str, 
     viewport: str, 
     page_url: str,
-    verbose: bool = False
+    verbose: bool = False,
+    image_bytes: Optional[bytes] = None
 ) -> Tuple[List[Bug], Optional[str]]:
     """Analyze screenshot using Gemini model"""
     try:
         from .gemini_analyzer import analyze_screenshot as gemini_analyze
-        return await gemini_analyze(screenshot_path, context, viewport, page_url)
+        return await gemini_analyze(screenshot_path, context, viewport, page_url, image_bytes=image_bytes)
     except ImportError as e:
         return [], f"Gemini analyzer not available: {str(e)}"
     except Exception as e:
@@ -60,27 +92,32 @@ async def _analyze_with_cohere(
     context: str, 
     viewport: str, 
     page_url: str,
-    verbose: bool = False
+    verbose: bool = False,
+    image_bytes: Optional[bytes] = None
 ) -> Tuple[List[Bug], Optional[str]]:
     """Analyze screenshot using Cohere model"""
     try:
-        from .cohere_analyzer import analyze_screenshot as cohere_analyze
+        from .cohere_analyzer import analyze_screenshot as cohere_analyze, analyze_screenshot_data
         
-        # Check if input is a file path and convert to base64 if needed
-        if os.path.exists(screenshot_path):
-            # It's a file path - convert to base64
+        # Cohere analyzer expects base64 image data, viewport description, and URL
+        viewport_desc = f"viewport {viewport}"
+        
+        # Bytes the caller already holds go straight to the analyzer
+        if image_bytes is not None:
+            bugs, error = await analyze_screenshot_data(image_bytes, viewport_desc, page_url, verbose=verbose)
+            return bugs, error if error else None
+        
+        # A file path is read once and sent like held bytes, labelled PNG or JPEG by its contents
+        if screenshot_exists(screenshot_path):
             try:
-                with open(screenshot_path, "rb") as image_file:
-                    image_data = base64.b64encode(image_file.read()).decode('utf-8')
+                image_bytes = await asyncio.to_thread(read_screenshot, screenshot_path)
             except Exception as e:
                 return [], f"Failed to read image file: {str(e)}"
-        else:
-            # Assume it's already base64 data
-            image_data = screenshot_path
+            bugs, error = await analyze_screenshot_data(image_bytes, viewport_desc, page_url, verbose=verbose)
+            return bugs, error if error else None
         
-        # Cohere analyzer expects base64 image data, viewport description, and URL
-        viewport_desc = f"viewport {viewport}"
-        bugs, error = await cohere_analyze(image_data, viewport_desc, page_url)
+        # Otherwise assume it's already base64 data
+        bugs, error = await cohere_analyze(screenshot_path, viewport_desc, page_url)
         return bugs, error if error else None
         
     except ImportError as e:
@@ -89,11 +126,97 @@ async def _analyze_with_cohere(
         return [], f"Cohere analysis error: {str(e)}"
 
 
+def downscale_for_analysis(image_bytes: bytes, max_edge: int = 768, quality: int = 85) -> bytes:
+    """
+    Shrink a screenshot to at most max_edge pixels on its longest side and re-encode
+    it as JPEG, which is plenty for the vision models and far smaller to upload.
+    
+    Pillow is optional: without it, or for bytes it can't decode, the screenshot is
+    returned unchanged.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_bytes
+    
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.thumbnail((max_edge, max_edge))
+            buffer = io.BytesIO()
+            image.convert('RGB').save(buffer, 'JPEG', quality=quality, optimize=True)
+    except Exception:
+        return image_bytes
+    
+    downscaled = buffer.getvalue()
+    return downscaled if len(downscaled) < len(image_bytes) else image_bytes
+
+
+def perceptual_hash(image_bytes: bytes, hash_size: int = 8) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash of a screenshot: the sign of the brightness
+    gradient across a tiny greyscale copy. Screenshots that look the same hash to
+    values a few bits apart, even when their bytes differ.
+    
+    Returns None without Pillow or for bytes it can't decode.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            pixels = list(image.convert('L').resize((hash_size + 1, hash_size)).getdata())
+    except Exception:
+        return None
+    
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            offset = row * (hash_size + 1) + col
+            value = (value << 1) | (pixels[offset] > pixels[offset + 1])
+    return value
+
+
+class PerceptualHashIndex:
+    """
+    Perceptual hashes seen so far, searchable for ones within a Hamming distance.
+    
+    Each hash is split into max_distance + 1 bands. Two hashes that close
+    must agree exactly on at least one band, so a lookup only compares against hashes
+    sharing a band with it rather than against every hash seen.
+    """
+    
+    def __init__(self, max_distance: int, hash_bits: int = 64):
+        self.max_distance = max_distance
+        self._band_bits = -(-hash_bits // (max_distance + 1))
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+    
+    def _bands(self, value: int):
+        mask = (1 << self._band_bits) - 1
+        for band in range(self.max_distance + 1):
+            yield band, (value >> (band * self._band_bits)) & mask
+    
+    def has_near(self, value: int) -> bool:
+        """Check whether a hash within max_distance bits of value has been added"""
+        for key in self._bands(value):
+            for seen in self._buckets.get(key, ()):
+                if bin(value ^ seen).count('1') <= self.max_distance:
+                    return True
+        return False
+    
+    def add(self, value: int):
+        """Remember a hash"""
+        for key in self._bands(value):
+            self._buckets.setdefault(key, []).append(value)
+
+
 def get_supported_models() -> List[str]:
     """Get list of supported models"""
     return ['cohere', 'gemini']
 
 
+@lru_cache(maxsize=None)
 def is_model_available(model: str) -> bool:
     """Check if a specific model is available"""
     if model.lower() == 'gemini':
@@ -3,7 +3,6 @@ Bug deduplication system that identifies and merges duplicate bug reports.
 """
 
 import asyncio
-import uuid
 import json
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import asdict
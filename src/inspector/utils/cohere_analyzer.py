@@ -1,9 +1,9 @@
 import os
-import uuid
 import base64
 import asyncio
 from typing import List, Tuple, Optional, Dict, Any
 import json
+from functools import lru_cache
 
 # Environment variables are loaded at CLI entry point
 # Users should set COHERE_API_KEY in their shell environment or .env file
@@ -14,6 +14,8 @@ except ImportError:
     cohere = None
 
 from core.types import Bug, Evidence
+from inspector.checks.base_scanner import new_bug_id
+from inspector.utils.evidence import image_mime_type, read_screenshot
 
 
 class CohereAnalyzer:
@@ -21,6 +23,10 @@ class CohereAnalyzer:
     Analyzes screenshots using Cohere's Command-A-Vision (command-a-vision-07-2025) model to detect visual layout issues and severe UX problems.
     """
     
+    # Retries for rate-limited requests, waiting 1s, 2s, then 4s
+    RATE_LIMIT_RETRIES = 3
+    RATE_LIMIT_BACKOFF_SECONDS = 1.0
+    
     def __init__(self, api_key: Optional[str] = None, verbose: bool = False):
         """
         Initialize Cohere analyzer.
@@ -46,14 +52,15 @@ class CohereAnalyzer:
             "max_tokens": 4000,  # Command-A-Vision supports up to 8K output tokens
         }
     
-    async def analyze_screenshot(self, image_data: str, viewport: str, page_url: str) -> Tuple[List[Bug], str]:
+    async def analyze_screenshot(self, image_data: str, viewport: str, page_url: str, mime_type: str = "image/png") -> Tuple[List[Bug], str]:
         """
         Analyze a screenshot for visual layout issues and UX problems.
         
         Args:
-            image_data: Base64 encoded PNG image data
+            image_data: Base64 encoded PNG or JPEG image data
             viewport: Viewport description (e.g., "desktop 1280x800")
             page_url: URL of the page being analyzed
+            mime_type: MIME type of the encoded image
             
         Returns:
             Tuple of (List of Bug objects, error message if any)
@@ -68,16 +75,13 @@ class CohereAnalyzer:
                     {"type": "text", "text": prompt},
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{image_data}"}
+                        "image_url": {"url": f"data:{mime_type};base64,{image_data}"}
                     }
                 ]
             }]
             
-            # Make API call with timeout
-            response = await asyncio.wait_for(
-                self._make_api_call(messages),
-                timeout=30.0
-            )
+            # Make API call with timeout, backing off if rate limited
+            response = await self._make_api_call_with_backoff(messages)
             
             if not response or not response.message or not response.message.content:
                 return [], "Cohere API returned empty response"
@@ -100,6 +104,22 @@ class CohereAnalyzer:
         except Exception as e:
             return [], f"Cohere API error: {str(e)}"
     
+    async def _make_api_call_with_backoff(self, messages: List[Dict[str, Any]]) -> Any:
+        """
+        Make the API call with a 30 second timeout, retrying with exponential backoff
+        when Cohere rejects it for rate limiting (HTTP 429).
+        """
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            try:
+                return await asyncio.wait_for(self._make_api_call(messages), timeout=30.0)
+            except Exception as e:
+                if getattr(e, 'status_code', None) != 429 or attempt == self.RATE_LIMIT_RETRIES:
+                    raise
+                delay = self.RATE_LIMIT_BACKOFF_SECONDS * (2 ** attempt)
+                if self.verbose:
+                    print(f"Cohere rate limited, retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+    
     async def _make_api_call(self, messages: List[Dict[str, Any]]) -> Any:
         """Make async API call to Cohere"""
         # Cohere doesn't have native async support, so we'll run in executor
@@ -246,7 +266,7 @@ EXAMPLE OUTPUT (when issues exist):
                 
                 # Create Bug object
                 bug = Bug(
-                    id=item.get('id', str(uuid.uuid4())),
+                    id=item['id'] if 'id' in item else new_bug_id(),  # Only mint an id when the model gave none
                     type=bug_type,
                     severity=severity,
                     page_url=page_url,
@@ -280,8 +300,15 @@ EXAMPLE OUTPUT (when issues exist):
             return []
 
 
+@lru_cache(maxsize=None)
+def _shared_analyzer(api_key: Optional[str], verbose: bool) -> CohereAnalyzer:
+    """One analyzer per key, so concurrent analyses share a client and its connection pool"""
+    return CohereAnalyzer(api_key=api_key, verbose=verbose)
+
+
 # Convenience function for backward compatibility
-async def analyze_screenshot(image_path_or_data: str, viewport: str, page_url: str, api_key: Optional[str] = None, verbose: bool = False) -> Tuple[List[Bug], str]:
+async def analyze_screenshot(image_path_or_data: str, viewport: str, page_url: str, api_key: Optional[str] = None, verbose: bool = False,
+                             mime_type: str = "image/png") -> Tuple[List[Bug], str]:
     """
     Analyze a screenshot using Cohere vision model.
     
@@ -290,22 +317,44 @@ async def analyze_screenshot(image_path_or_data: str, viewport: str, page_url: s
         viewport: Viewport description (e.g., "desktop 1280x800")
         page_url: URL of the page being analyzed
         api_key: Optional Cohere API key
+        mime_type: MIME type of the image when base64 data is passed (detected for files)
         
     Returns:
         Tuple of (List of Bug objects, error message if any)
     """
-    analyzer = CohereAnalyzer(api_key=api_key, verbose=verbose)
+    analyzer = _shared_analyzer(api_key or os.getenv("COHERE_API_KEY"), verbose)
     
     # Check if input is a file path or base64 data
     if os.path.exists(image_path_or_data):
-        # It's a file path - convert to base64
+        # It's a file path - read it once and label it by its contents (PNG or JPEG)
         try:
-            with open(image_path_or_data, "rb") as image_file:
-                image_data = base64.b64encode(image_file.read()).decode('utf-8')
+            image_bytes = await asyncio.to_thread(read_screenshot, image_path_or_data)
         except Exception as e:
             return [], f"Failed to read image file: {str(e)}"
+        image_data = base64.b64encode(image_bytes).decode('utf-8')
+        mime_type = image_mime_type(image_bytes)
     else:
         # Assume it's already base64 data
         image_data = image_path_or_data
     
-    return await analyzer.analyze_screenshot(image_data, viewport, page_url)
\ No newline at end of file
+    return await analyzer.analyze_screenshot(image_data, viewport, page_url, mime_type)
+
+
+async def analyze_screenshot_data(image_bytes: bytes, viewport: str, page_url: str, api_key: Optional[str] = None,
+                                  verbose: bool = False) -> Tuple[List[Bug], str]:
+    """
+    Analyze screenshot bytes already held in memory, without checking whether they
+    name a file first.
+    
+    Args:
+        image_bytes: Raw PNG or JPEG screenshot bytes
+        viewport: Viewport description (e.g., "desktop 1280x800")
+        page_url: URL of the page being analyzed
+        api_key: Optional Cohere API key
+        
+    Returns:
+        Tuple of (List of Bug objects, error message if any)
+    """
+    analyzer = _shared_analyzer(api_key or os.getenv("COHERE_API_KEY"), verbose)
+    image_data = base64.b64encode(image_bytes).decode('utf-8')
+    return await analyzer.analyze_screenshot(image_data, viewport, page_url, image_mime_type(image_bytes))
@@ -1,11 +1,107 @@
 import os
-import uuid
 import json
-from typing import Optional
+import base64
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 from datetime import datetime
 from playwright.async_api import Page
 
 
+class ScreenshotStore:
+    """
+    In-memory screenshot bytes keyed by file path.
+    
+    Bytes are held while their disk write is in flight, so readers can use a
+    screenshot as soon as it's captured, and the most recent ones are kept after
+    the write since the analyzer usually reads a screenshot right after capture.
+    """
+    
+    def __init__(self, max_recent: int = 32):
+        self.max_recent = max_recent
+        self._pending: Dict[str, bytes] = {}
+        self._recent: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put(self, filepath: str, data: bytes):
+        """Hold screenshot bytes until their disk write completes"""
+        with self._lock:
+            self._pending[filepath] = data
+    
+    def mark_written(self, filepath: str):
+        """Move a screenshot from pending to the bounded recent cache"""
+        with self._lock:
+            data = self._pending.pop(filepath, None)
+            if data is None:
+                return
+            self._recent[filepath] = data
+            self._recent.move_to_end(filepath)
+            while len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+    
+    def get(self, filepath: str) -> Optional[bytes]:
+        """Return in-memory bytes for a screenshot, or None if they aren't held"""
+        with self._lock:
+            data = self._pending.get(filepath)
+            if data is None:
+                data = self._recent.get(filepath)
+            return data
+    
+    def __contains__(self, filepath: str) -> bool:
+        with self._lock:
+            return filepath in self._pending or filepath in self._recent
+
+
+_screenshot_store = ScreenshotStore()
+_write_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mantis-evidence")
+
+
+# Evidence directories already created by this process
+_ensured_dirs = set()
+
+
+def _ensure_dir(path: str):
+    """Create a directory once per process rather than on every collector"""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+
+def _write_screenshot(filepath: str, data: bytes):
+    """Write screenshot bytes to disk, then release them from the pending set"""
+    try:
+        with open(filepath, 'wb') as f:
+            f.write(data)
+    finally:
+        _screenshot_store.mark_written(filepath)
+
+
+def screenshot_exists(filepath: str) -> bool:
+    """Check whether a screenshot was captured, even if it isn't on disk yet"""
+    return filepath in _screenshot_store or os.path.exists(filepath)
+
+
+def read_screenshot(filepath: str) -> bytes:
+    """Read screenshot bytes, served from memory when the store still holds them"""
+    data = _screenshot_store.get(filepath)
+    if data is not None:
+        return data
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+
+def encode_screenshot(filepath: str) -> str:
+    """Read a screenshot and return it base64-encoded; run in a thread when it may hit disk"""
+    return base64.b64encode(read_screenshot(filepath)).decode('utf-8')
+
+
+def image_mime_type(data: bytes) -> str:
+    """Return the MIME type of PNG or JPEG screenshot bytes"""
+    return 'image/jpeg' if data[:3] == b'\xff\xd8\xff' else 'image/png'
+
+
 class EvidenceCollector:
     """
     Handles collection and storage of evidence for bugs found during inspection.
@@ -22,8 +118,80 @@ class EvidenceCollector:
         self.logs_dir = os.path.join(output_dir, 'logs')
         
         # Ensure directories exist
-        os.makedirs(self.screenshots_dir, exist_ok=True)
-        os.makedirs(self.logs_dir, exist_ok=True)
+        _ensure_dir(self.screenshots_dir)
+        _ensure_dir(self.logs_dir)
+        
+        # Background screenshot writes started by this collector
+        self._pending_writes: List[Future] = []
+        
+        # Every screenshot path this collector has captured, in capture order
+        self.captured_paths: List[str] = []
+        
+        # CDP session reused by every viewport capture, opened on first use
+        self._cdp = None
+        self._cdp_failed = False
+        self._cdp_lock = asyncio.Lock()  # Captures may run concurrently; open one session
+    
+    async def _save_screenshot(self, filepath: str, image_format: str = 'png', quality: Optional[int] = None) -> str:
+        """
+        Capture a viewport screenshot to memory and write it to disk in the background.
+        
+        The path is returned immediately; read_screenshot() serves the bytes until
+        the write lands, and flush() waits for all of this collector's writes.
+        """
+        data = await self._capture_viewport(image_format, quality)
+        return self._queue_write(filepath, data)
+    
+    async def _capture_viewport(self, image_format: str, quality: Optional[int] = None) -> bytes:
+        """
+        Capture the viewport straight from CDP on Chromium, skipping the extra work
+        page.screenshot() does per call. Falls back to page.screenshot() elsewhere.
+        """
+        cdp = await self._cdp_session()
+        if cdp is not None:
+            params = {"format": image_format, "optimizeForSpeed": True}
+            if quality is not None:
+                params["quality"] = quality
+            try:
+                capture = await cdp.send("Page.captureScreenshot", params)
+                return base64.b64decode(capture["data"])
+            except Exception:
+                self._cdp_failed = True  # Don't keep trying a session that can't capture
+        
+        options = {"full_page": False, "type": image_format}
+        if quality is not None:
+            options["quality"] = quality
+        return await self.page.screenshot(**options)
+    
+    async def _cdp_session(self):
+        """Open this collector's CDP session on first use, or None if the browser has no CDP"""
+        async with self._cdp_lock:
+            if self._cdp is None and not self._cdp_failed:
+                try:
+                    self._cdp = await self.page.context.new_cdp_session(self.page)
+                except Exception:
+                    self._cdp_failed = True  # Not Chromium - let Playwright capture
+        return None if self._cdp_failed else self._cdp
+    
+    def _queue_write(self, filepath: str, data: bytes) -> str:
+        """Hand captured screenshot bytes to the background writer and record the path"""
+        _screenshot_store.put(filepath, data)
+        self._pending_writes.append(_write_executor.submit(_write_screenshot, filepath, data))
+        self.captured_paths.append(filepath)
+        return filepath
+    
+    async def flush(self):
+        """Wait until every screenshot captured by this collector is on disk and release its CDP session"""
+        cdp, self._cdp = self._cdp, None
+        if cdp is not None:
+            try:
+                await cdp.detach()
+            except Exception:
+                pass
+        
+        pending, self._pending_writes = self._pending_writes, []
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in pending), return_exceptions=True)
         
     async def capture_bug_screenshot(self, bug_id: str, viewport: str) -> Optional[str]:
         """
@@ -41,13 +209,7 @@ class EvidenceCollector:
             filename = f"bug_{bug_id}_{viewport}_{timestamp}.png"
             filepath = os.path.join(self.screenshots_dir, filename)
             
-            await self.page.screenshot(
-                path=filepath,
-                full_page=False,  # Changed to capture only viewport
-                type='png'
-            )
-            
-            return filepath
+            return await self._save_screenshot(filepath)  # Viewport only
             
         except Exception as e:
             if self.verbose:
@@ -58,6 +220,9 @@ class EvidenceCollector:
         """
         Capture a viewport-only screenshot for general documentation.
         
+        These aren't bug evidence, so they're taken as JPEG, which encodes much
+        faster and moves fewer bytes than PNG.
+        
         Args:
             viewport: Current viewport (e.g., "1280x800")
             
@@ -66,16 +231,10 @@ class EvidenceCollector:
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"viewport_{viewport}_{timestamp}.png"
+            filename = f"viewport_{viewport}_{timestamp}.jpg"
             filepath = os.path.join(self.screenshots_dir, filename)
             
-            await self.page.screenshot(
-                path=filepath,
-                full_page=False,  # Changed to capture only viewport
-                type='png'
-            )
-            
-            return filepath
+            return await self._save_screenshot(filepath, 'jpeg', quality=70)
             
         except Exception as e:
             if self.verbose:
@@ -98,13 +257,7 @@ class EvidenceCollector:
             filename = f"viewport_{viewport}_scroll_{scroll_position}_{timestamp}.png"
             filepath = os.path.join(self.screenshots_dir, filename)
             
-            await self.page.screenshot(
-                path=filepath,
-                full_page=False,  # Viewport-only screenshot
-                type='png'
-            )
-            
-            return filepath
+            return await self._save_screenshot(filepath)  # Viewport-only screenshot
             
         except Exception as e:
             if self.verbose:
@@ -131,9 +284,9 @@ class EvidenceCollector:
             filename = f"element_{bug_id}_{timestamp}.png"
             filepath = os.path.join(self.screenshots_dir, filename)
             
-            await element.screenshot(path=filepath, type='png')
+            data = await element.screenshot(type='png')
             
-            return filepath
+            return self._queue_write(filepath, data)
             
         except Exception as e:
             if self.verbose:
@@ -1,9 +1,9 @@
 import os
-import uuid
 import base64
 import asyncio
 from typing import List, Tuple, Optional, Dict, Any
 import json
+from functools import lru_cache
 
 # Environment variables are loaded at CLI entry point
 
@@ -13,6 +13,8 @@ except ImportError:
     genai = None
 
 from core.types import Bug, Evidence
+from inspector.checks.base_scanner import new_bug_id
+from inspector.utils.evidence import encode_screenshot, image_mime_type, read_screenshot, screenshot_exists
 
 
 class GeminiAnalyzer:
@@ -50,8 +52,7 @@ class GeminiAnalyzer:
     def _encode_image(self, image_path: str) -> str:
         """Encode image to base64 for Gemini API"""
         try:
-            with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
+            return encode_screenshot(image_path)
         except Exception as e:
             raise ValueError(f"Failed to encode image {image_path}: {str(e)}")
     
@@ -169,7 +170,7 @@ EXAMPLE OUTPUT (when issues exist):
                 
                 # Create Bug object
                 bug = Bug(
-                    id=str(uuid.uuid4()),
+                    id=new_bug_id(),
                     type="UI",  # All visual issues map to UI type
                     severity=bug_data.get("severity", "medium"),
                     page_url=page_url,
@@ -196,7 +197,8 @@ EXAMPLE OUTPUT (when issues exist):
                 print(f"Warning: Error parsing Gemini response: {str(e)}")
             return []
     
-    async def analyze_screenshot(self, screenshot_path: str, context: str, viewport: str, page_url: str) -> Tuple[List[Bug], Optional[str]]:
+    async def analyze_screenshot(self, screenshot_path: str, context: str, viewport: str, page_url: str,
+                                 image_bytes: Optional[bytes] = None) -> Tuple[List[Bug], Optional[str]]:
         """
         Analyze a screenshot for visual layout issues and severe UX problems.
         
@@ -205,6 +207,7 @@ EXAMPLE OUTPUT (when issues exist):
             context: Description of what just happened (e.g., "after clicking Home dropdown")
             viewport: Viewport size (e.g., "1280x800") 
             page_url: URL being tested
+            image_bytes: Screenshot bytes already held by the caller, used instead of reading the file
             
         Returns:
             Tuple of (bugs_found, error_message)
@@ -212,22 +215,26 @@ EXAMPLE OUTPUT (when issues exist):
             - error_message: None if successful, error string if API failed
         """
         try:
-            # Validate screenshot exists
-            if not os.path.exists(screenshot_path):
-                return [], f"Screenshot file not found: {screenshot_path}"
+            if image_bytes is None:
+                # Validate screenshot exists
+                if not screenshot_exists(screenshot_path):
+                    return [], f"Screenshot file not found: {screenshot_path}"
+                
+                # Read the screenshot once; captures may be PNG or JPEG
+                try:
+                    image_bytes = await asyncio.to_thread(read_screenshot, screenshot_path)
+                except Exception as e:
+                    return [], f"Failed to encode screenshot: {str(e)}"
             
-            # Encode image
-            try:
-                image_data = self._encode_image(screenshot_path)
-            except Exception as e:
-                return [], f"Failed to encode screenshot: {str(e)}"
+            image_data = base64.b64encode(image_bytes).decode('utf-8')
+            mime_type = image_mime_type(image_bytes)
             
             # Create prompt
             prompt = self._create_analysis_prompt(context, viewport, page_url)
             
             # Prepare image part for Gemini
             image_part = {
-                "mime_type": "image/png",
+                "mime_type": mime_type,
                 "data": image_data
             }
             
@@ -258,8 +265,15 @@ EXAMPLE OUTPUT (when issues exist):
             return [], f"Unexpected error in analyze_screenshot: {str(e)}"
 
 
+@lru_cache(maxsize=None)
+def _shared_analyzer(api_key: Optional[str], verbose: bool) -> GeminiAnalyzer:
+    """One analyzer per key, so concurrent analyses share a configured model"""
+    return GeminiAnalyzer(api_key=api_key, verbose=verbose)
+
+
 # Convenience function for easy integration
-async def analyze_screenshot(screenshot_path: str, context: str, viewport: str, page_url: str, verbose: bool = False) -> Tuple[List[Bug], Optional[str]]:
+async def analyze_screenshot(screenshot_path: str, context: str, viewport: str, page_url: str, verbose: bool = False,
+                             image_bytes: Optional[bytes] = None) -> Tuple[List[Bug], Optional[str]]:
     """
     Convenience function to analyze a screenshot without managing GeminiAnalyzer instance.
     
@@ -268,12 +282,13 @@ async def analyze_screenshot(screenshot_path: str, context: str, viewport: str,
         context: Description of what just happened (e.g., "after clicking Home dropdown")
         viewport: Viewport size (e.g., "1280x800")
         page_url: URL being tested
+        image_bytes: Screenshot bytes already held by the caller, used instead of reading the file
         
     Returns:
         Tuple of (bugs_found, error_message)
     """
     try:
-        analyzer = GeminiAnalyzer(verbose=verbose)
-        return await analyzer.analyze_screenshot(screenshot_path, context, viewport, page_url)
+        analyzer = _shared_analyzer(os.getenv("GEMINI_API_KEY"), verbose)
+        return await analyzer.analyze_screenshot(screenshot_path, context, viewport, page_url, image_bytes)
     except Exception as e:
         return [], f"Failed to initialize Gemini analyzer: {str(e)}"
@@ -60,20 +60,37 @@ class InteractionTracker:
             self.interaction_counts[viewport_key].clear()
             self.skipped_counts[viewport_key].clear()
     
-    def filter_untested_elements(self, elements: List[Dict[str, Any]], element_type: str) -> List[Dict[str, Any]]:
+    def merge(self, other: 'InteractionTracker'):
+        """
+        Fold another tracker's per-viewport records into this one.
+        
+        Args:
+            other: Tracker used for a separate (e.g. concurrent) viewport pass
+        """
+        for viewport_key, signatures in other.tested_elements.items():
+            self.set_viewport_context(viewport_key)
+            self.tested_elements[viewport_key].update(signatures)
+            for counts, other_counts in ((self.interaction_counts, other.interaction_counts),
+                                         (self.skipped_counts, other.skipped_counts)):
+                for element_type, count in other_counts.get(viewport_key, {}).items():
+                    counts[viewport_key][element_type] = counts[viewport_key].get(element_type, 0) + count
+    
+    def filter_untested_elements(self, elements: List[Dict[str, Any]], element_type: str,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Filter out elements that have already been tested in the current viewport.
         
         Args:
             elements: List of element info dictionaries from _find_viewport_visible_elements
             element_type: Type of element ("dropdown", "modal", "accordion", "form")
+            limit: Stop once this many untested elements are found (None for no limit)
             
         Returns:
             List of elements that haven't been tested yet
         """
         if not self.current_viewport:
             # If no viewport context set, return all elements (fallback behavior)
-            return elements
+            return elements[:limit]
         
         untested_elements = []
         skipped_count = 0
@@ -83,6 +100,8 @@ class InteractionTracker:
             
             if signature not in self.tested_elements[self.current_viewport]:
                 untested_elements.append(element_info)
+                if limit is not None and len(untested_elements) >= limit:
+                    break
             else:
                 skipped_count += 1
         
@@ -151,13 +170,19 @@ class InteractionTracker:
         """
         selector = element_info.get('selector', 'unknown')
         
-        # Use element text for disambiguation, but limit length
-        element_text = element_info.get('text', '').strip()
-        text_key = element_text[:20] if element_text else 'no-text'
+        # The explorer's discovery kernel sends the text and base keys ready-made; derive
+        # them here for element info that comes from anywhere else
+        text_key = element_info.get('textKey')
+        if text_key is None:
+            # Use element text for disambiguation, but limit length
+            element_text = element_info.get('text', '').strip()
+            text_key = element_text[:20] if element_text else 'no-text'
         
         # Include base selector for additional context
-        base_selector = element_info.get('baseSelector', '')
-        base_key = base_selector.split('.')[-1].split('[')[0] if base_selector else ''
+        base_key = element_info.get('baseKey')
+        if base_key is None:
+            base_selector = element_info.get('baseSelector', '')
+            base_key = base_selector.split('.')[-1].split('[')[0] if base_selector else ''
         
         # Create signature: type:selector:text:base
         signature = f"{element_type}:{selector}:{text_key}:{base_key}"
@@ -205,8 +230,10 @@ class InteractionTracker:
     
     def log_final_summary(self):
         """Log a final summary of all testing activity across viewports."""
-        if self.verbose:
-            print(f"\n📊 InteractionTracker Final Summary:")
+        if not self.verbose:
+            return
+        
+        print(f"\n📊 InteractionTracker Final Summary:")
         
         total_tested = 0
         total_skipped = 0
@@ -223,9 +250,7 @@ class InteractionTracker:
             if tested > 0 or skipped > 0:
                 for element_type, count in summary['tested_by_type'].items():
                     skipped_count = summary['skipped_by_type'].get(element_type, 0)
-                    if self.verbose:
-                        print(f"    • {element_type}: {count} tested, {skipped_count} skipped")
+                    print(f"    • {element_type}: {count} tested, {skipped_count} skipped")
         
         efficiency_saved = total_skipped / (total_tested + total_skipped) * 100 if (total_tested + total_skipped) > 0 else 0
-        if self.verbose:
-            print(f"  🎯 Overall: {total_tested} interactions, {total_skipped} duplicates prevented ({efficiency_saved:.1f}% efficiency gain)")
+        print(f"  🎯 Overall: {total_tested} interactions, {total_skipped} duplicates prevented ({efficiency_saved:.1f}% efficiency gain)")
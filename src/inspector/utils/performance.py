@@ -1,7 +1,183 @@
-from typing import Dict
+from typing import Dict, Tuple
 from playwright.async_api import Page
 
 
+_NAVIGATION_TIMINGS_JS = """
+() => {
+    const perfData = performance.getEntriesByType('navigation')[0];
+    const paintEntries = performance.getEntriesByType('paint');
+    
+    if (!perfData) {
+        return {};
+    }
+    
+    // Core navigation timings
+    const timings = {
+        // DNS and connection
+        dns_lookup: perfData.domainLookupEnd - perfData.domainLookupStart,
+        tcp_connect: perfData.connectEnd - perfData.connectStart,
+        ssl_handshake: perfData.secureConnectionStart > 0 ? 
+            perfData.connectEnd - perfData.secureConnectionStart : 0,
+        
+        // Request/Response
+        request_start: perfData.requestStart - perfData.navigationStart,
+        response_start: perfData.responseStart - perfData.navigationStart,
+        response_end: perfData.responseEnd - perfData.navigationStart,
+        
+        // Document processing
+        dom_loading: perfData.domLoading - perfData.navigationStart,
+        dom_interactive: perfData.domInteractive - perfData.navigationStart,
+        dom_content_loaded: perfData.domContentLoadedEventEnd - perfData.navigationStart,
+        dom_complete: perfData.domComplete - perfData.navigationStart,
+        
+        // Load events
+        load_event_start: perfData.loadEventStart - perfData.navigationStart,
+        load_event_end: perfData.loadEventEnd - perfData.navigationStart,
+        
+        // Total times
+        total_load_time: perfData.loadEventEnd - perfData.navigationStart,
+        dcl_time: perfData.domContentLoadedEventEnd - perfData.domContentLoadedEventStart
+    };
+    
+    // Add paint timings
+    paintEntries.forEach(entry => {
+        if (entry.name === 'first-paint') {
+            timings.first_paint = entry.startTime;
+        } else if (entry.name === 'first-contentful-paint') {
+            timings.first_contentful_paint = entry.startTime;
+        }
+    });
+    
+    // Add largest contentful paint if available
+    try {
+        const lcpEntries = performance.getEntriesByType('largest-contentful-paint');
+        if (lcpEntries.length > 0) {
+            timings.largest_contentful_paint = lcpEntries[lcpEntries.length - 1].startTime;
+        }
+    } catch (e) {
+        // LCP might not be available in all browsers
+    }
+    
+    return timings;
+}
+"""
+
+_RESOURCE_SUMMARY_JS = """
+() => {
+    const resources = performance.getEntriesByType('resource');
+    
+    if (resources.length === 0) {
+        return {};
+    }
+    
+    let totalSize = 0;
+    let totalDuration = 0;
+    let slowestResource = 0;
+    let resourceCounts = {
+        images: 0,
+        scripts: 0,
+        stylesheets: 0,
+        fonts: 0,
+        xhr: 0,
+        other: 0
+    };
+    
+    resources.forEach(resource => {
+        const duration = resource.responseEnd - resource.startTime;
+        totalDuration += duration;
+        slowestResource = Math.max(slowestResource, duration);
+        
+        // Estimate size from transfer size
+        if (resource.transferSize) {
+            totalSize += resource.transferSize;
+        }
+        
+        // Categorize resources
+        const initiatorType = resource.initiatorType;
+        if (initiatorType === 'img') {
+            resourceCounts.images++;
+        } else if (initiatorType === 'script') {
+            resourceCounts.scripts++;
+        } else if (initiatorType === 'css') {
+            resourceCounts.stylesheets++;
+        } else if (resource.name.includes('font') || initiatorType === 'font') {
+            resourceCounts.fonts++;
+        } else if (initiatorType === 'xmlhttprequest' || initiatorType === 'fetch') {
+            resourceCounts.xhr++;
+        } else {
+            resourceCounts.other++;
+        }
+    });
+    
+    return {
+        resource_count: resources.length,
+        total_resource_size: totalSize,
+        average_resource_duration: totalDuration / resources.length,
+        slowest_resource_duration: slowestResource,
+        image_count: resourceCounts.images,
+        script_count: resourceCounts.scripts,
+        stylesheet_count: resourceCounts.stylesheets,
+        font_count: resourceCounts.fonts,
+        xhr_count: resourceCounts.xhr
+    };
+}
+"""
+
+_CORE_WEB_VITALS_JS = """
+() => {
+    const vitals = {};
+    
+    // Get LCP (Largest Contentful Paint)
+    try {
+        const lcpEntries = performance.getEntriesByType('largest-contentful-paint');
+        if (lcpEntries.length > 0) {
+            vitals.lcp = lcpEntries[lcpEntries.length - 1].startTime;
+        }
+    } catch (e) {}
+    
+    // Get FID (First Input Delay) - only available after user interaction
+    // This would need to be collected differently in a real implementation
+    
+    // Get CLS (Cumulative Layout Shift)
+    try {
+        const clsEntries = performance.getEntriesByType('layout-shift');
+        let clsScore = 0;
+        clsEntries.forEach(entry => {
+            if (!entry.hadRecentInput) {
+                clsScore += entry.value;
+            }
+        });
+        vitals.cls = clsScore;
+    } catch (e) {}
+    
+    return vitals;
+}
+"""
+
+# Navigation timings, resource summary and (optionally) Core Web Vitals in one
+# evaluate; resource and vitals failures degrade to empty dicts as before
+_PAGE_METRICS_JS = f"""
+(includeVitals) => {{
+    const orEmpty = (collect) => {{
+        try {{ return collect() || {{}}; }} catch (e) {{ return {{}}; }}
+    }};
+    return {{
+        timings: Object.assign(({_NAVIGATION_TIMINGS_JS})(), orEmpty({_RESOURCE_SUMMARY_JS})),
+        vitals: includeVitals ? orEmpty({_CORE_WEB_VITALS_JS}) : {{}}
+    }};
+}}
+"""
+
+_INTERACTION_DURATION_JS = """
+() => {
+    performance.mark('interaction-end');
+    performance.measure('interaction-duration', 'interaction-start', 'interaction-end');
+    const measure = performance.getEntriesByName('interaction-duration')[0];
+    return measure ? measure.duration : 0;
+}
+"""
+
+
 class PerformanceTracker:
     """
     Tracks and collects performance metrics during page inspection.
@@ -23,153 +199,27 @@ class PerformanceTracker:
         Returns:
             Dictionary of timing metrics in milliseconds
         """
-        try:
-            # Use JavaScript to get performance timing data
-            timing_data = await page.evaluate("""
-            () => {
-                const perfData = performance.getEntriesByType('navigation')[0];
-                const paintEntries = performance.getEntriesByType('paint');
-                
-                if (!perfData) {
-                    return {};
-                }
-                
-                // Core navigation timings
-                const timings = {
-                    // DNS and connection
-                    dns_lookup: perfData.domainLookupEnd - perfData.domainLookupStart,
-                    tcp_connect: perfData.connectEnd - perfData.connectStart,
-                    ssl_handshake: perfData.secureConnectionStart > 0 ? 
-                        perfData.connectEnd - perfData.secureConnectionStart : 0,
-                    
-                    // Request/Response
-                    request_start: perfData.requestStart - perfData.navigationStart,
-                    response_start: perfData.responseStart - perfData.navigationStart,
-                    response_end: perfData.responseEnd - perfData.navigationStart,
-                    
-                    // Document processing
-                    dom_loading: perfData.domLoading - perfData.navigationStart,
-                    dom_interactive: perfData.domInteractive - perfData.navigationStart,
-                    dom_content_loaded: perfData.domContentLoadedEventEnd - perfData.navigationStart,
-                    dom_complete: perfData.domComplete - perfData.navigationStart,
-                    
-                    // Load events
-                    load_event_start: perfData.loadEventStart - perfData.navigationStart,
-                    load_event_end: perfData.loadEventEnd - perfData.navigationStart,
-                    
-                    // Total times
-                    total_load_time: perfData.loadEventEnd - perfData.navigationStart,
-                    dcl_time: perfData.domContentLoadedEventEnd - perfData.domContentLoadedEventStart
-                };
-                
-                // Add paint timings
-                paintEntries.forEach(entry => {
-                    if (entry.name === 'first-paint') {
-                        timings.first_paint = entry.startTime;
-                    } else if (entry.name === 'first-contentful-paint') {
-                        timings.first_contentful_paint = entry.startTime;
-                    }
-                });
-                
-                // Add largest contentful paint if available
-                try {
-                    const lcpEntries = performance.getEntriesByType('largest-contentful-paint');
-                    if (lcpEntries.length > 0) {
-                        timings.largest_contentful_paint = lcpEntries[lcpEntries.length - 1].startTime;
-                    }
-                } catch (e) {
-                    // LCP might not be available in all browsers
-                }
-                
-                return timings;
-            }
-            """)
-            
-            # Add resource timing summary
-            resource_summary = await self._get_resource_summary(page)
-            timing_data.update(resource_summary)
-            
-            return timing_data
-            
-        except Exception as e:
-            # Silently fail - performance data is optional
-            return {}
+        timings, _ = await self.collect_page_metrics(page, include_vitals=False)
+        return timings
     
-    async def _get_resource_summary(self, page: Page) -> Dict[str, float]:
+    async def collect_page_metrics(self, page: Page, include_vitals: bool = True) -> Tuple[Dict[str, float], Dict[str, float]]:
         """
-        Get summary statistics about resource loading.
+        Collect timing metrics and Core Web Vitals in a single evaluate.
         
         Args:
             page: Playwright page object
+            include_vitals: Whether to read Core Web Vitals as well
             
         Returns:
-            Dictionary with resource timing summaries
+            Tuple of (timing metrics including the resource summary, CWV metrics)
         """
         try:
-            return await page.evaluate("""
-            () => {
-                const resources = performance.getEntriesByType('resource');
-                
-                if (resources.length === 0) {
-                    return {};
-                }
-                
-                let totalSize = 0;
-                let totalDuration = 0;
-                let slowestResource = 0;
-                let resourceCounts = {
-                    images: 0,
-                    scripts: 0,
-                    stylesheets: 0,
-                    fonts: 0,
-                    xhr: 0,
-                    other: 0
-                };
-                
-                resources.forEach(resource => {
-                    const duration = resource.responseEnd - resource.startTime;
-                    totalDuration += duration;
-                    slowestResource = Math.max(slowestResource, duration);
-                    
-                    // Estimate size from transfer size
-                    if (resource.transferSize) {
-                        totalSize += resource.transferSize;
-                    }
-                    
-                    // Categorize resources
-                    const initiatorType = resource.initiatorType;
-                    if (initiatorType === 'img') {
-                        resourceCounts.images++;
-                    } else if (initiatorType === 'script') {
-                        resourceCounts.scripts++;
-                    } else if (initiatorType === 'css') {
-                        resourceCounts.stylesheets++;
-                    } else if (resource.name.includes('font') || initiatorType === 'font') {
-                        resourceCounts.fonts++;
-                    } else if (initiatorType === 'xmlhttprequest' || initiatorType === 'fetch') {
-                        resourceCounts.xhr++;
-                    } else {
-                        resourceCounts.other++;
-                    }
-                });
-                
-                return {
-                    resource_count: resources.length,
-                    total_resource_size: totalSize,
-                    average_resource_duration: totalDuration / resources.length,
-                    slowest_resource_duration: slowestResource,
-                    image_count: resourceCounts.images,
-                    script_count: resourceCounts.scripts,
-                    stylesheet_count: resourceCounts.stylesheets,
-                    font_count: resourceCounts.fonts,
-                    xhr_count: resourceCounts.xhr
-                };
-            }
-            """)
+            metrics = await page.evaluate(_PAGE_METRICS_JS, include_vitals)
+            return metrics['timings'], metrics['vitals']
             
         except Exception as e:
             # Silently fail - performance data is optional
-            return {}
+            return {}, {}
     
     async def get_core_web_vitals(self, page: Page) -> Dict[str, float]:
         """
@@ -182,36 +232,7 @@ class PerformanceTracker:
             Dictionary with CWV metrics
         """
         try:
-            return await page.evaluate("""
-            () => {
-                const vitals = {};
-                
-                // Get LCP (Largest Contentful Paint)
-                try {
-                    const lcpEntries = performance.getEntriesByType('largest-contentful-paint');
-                    if (lcpEntries.length > 0) {
-                        vitals.lcp = lcpEntries[lcpEntries.length - 1].startTime;
-                    }
-                } catch (e) {}
-                
-                // Get FID (First Input Delay) - only available after user interaction
-                // This would need to be collected differently in a real implementation
-                
-                // Get CLS (Cumulative Layout Shift)
-                try {
-                    const clsEntries = performance.getEntriesByType('layout-shift');
-                    let clsScore = 0;
-                    clsEntries.forEach(entry => {
-                        if (!entry.hadRecentInput) {
-                            clsScore += entry.value;
-                        }
-                    });
-                    vitals.cls = clsScore;
-                } catch (e) {}
-                
-                return vitals;
-            }
-            """)
+            return await page.evaluate(_CORE_WEB_VITALS_JS)
             
         except Exception as e:
             # Silently fail - performance data is optional
@@ -236,14 +257,7 @@ class PerformanceTracker:
             await action_func()
             
             # Mark end time and measure
-            duration = await page.evaluate("""
-            () => {
-                performance.mark('interaction-end');
-                performance.measure('interaction-duration', 'interaction-start', 'interaction-end');
-                const measure = performance.getEntriesByName('interaction-duration')[0];
-                return measure ? measure.duration : 0;
-            }
-            """)
+            duration = await page.evaluate(_INTERACTION_DURATION_JS)
             
             return duration
             
@@ -2,8 +2,7 @@
 ScrollManager handles scrolling logic for viewport-based exploration.
 """
 
-import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from playwright.async_api import Page
 
 
@@ -18,6 +17,39 @@ class ScrollManager:
     - Dynamic content detection
     """
     
+    # After scrolling, content counts as loaded once the page height and the number of
+    # fetched resources have held steady this long (waiting scroll_delay at most)
+    SETTLE_QUIET_MS = 100
+    
+    # Scrolls, waits for the page to settle as above, and reports where it landed along
+    # with the page height, so a scroll step is a single round trip
+    _SCROLL_AND_SETTLE_JS = """
+    ([position, quietMs, maxMs]) => new Promise(resolve => {
+        window.scrollTo(0, position);
+        const done = () => resolve({
+            position: window.pageYOffset || document.documentElement.scrollTop,
+            scrollHeight: document.body.scrollHeight
+        });
+        const snapshot = () => document.body.scrollHeight + ':' + performance.getEntriesByType('resource').length;
+        
+        const start = performance.now();
+        let last = snapshot();
+        let lastChange = start;
+        const tick = () => {
+            const now = performance.now();
+            const current = snapshot();
+            if (current !== last) {
+                last = current;
+                lastChange = now;
+            }
+            if (now - lastChange >= quietMs || now - start >= maxMs) return done();
+            requestAnimationFrame(tick);
+        };
+        setTimeout(done, maxMs);  // Frames may not run at all in a background page
+        requestAnimationFrame(tick);
+    })
+    """
+    
     def __init__(self, page: Page, viewport_height: int, config: Dict[str, Any] = None, verbose: bool = False):
         """
         Initialize scroll manager.
@@ -119,17 +151,19 @@ class ScrollManager:
         
         # Perform the scroll
         try:
-            await self.page.evaluate(f"window.scrollTo(0, {next_position})")
-            await asyncio.sleep(self.config['scroll_delay'])
+            # Wait for lazily loaded content to settle rather than a fixed delay
+            settled = await self.page.evaluate(
+                self._SCROLL_AND_SETTLE_JS,
+                [next_position, self.SETTLE_QUIET_MS, int(self.config['scroll_delay'] * 1000)]
+            )
             
             # Update current position
-            actual_position = await self.page.evaluate("() => window.pageYOffset || document.documentElement.scrollTop")
-            self.current_position = actual_position
+            self.current_position = settled['position']
             self.scroll_iterations += 1
                         
             # Check for dynamic content if enabled
             if self.config['dynamic_content_detection']:
-                await self._check_for_dynamic_content()
+                await self._check_for_dynamic_content(settled['scrollHeight'])
             
             return True
             
@@ -176,13 +210,17 @@ class ScrollManager:
                 print(f"    ⚠️  Error checking scroll position: {str(e)}")
             return False
     
-    async def _check_for_dynamic_content(self):
+    async def _check_for_dynamic_content(self, current_height: Optional[int] = None):
         """
         Check if dynamic content has been loaded that affects page height.
         Updates scroll limits if new content is detected.
+        
+        Args:
+            current_height: Page height already read by the caller, if any
         """
         try:
-            current_height = await self.page.evaluate("() => document.body.scrollHeight")
+            if current_height is None:
+                current_height = await self.page.evaluate("() => document.body.scrollHeight")
             
             if current_height > self.last_content_height:
                 height_diff = current_height - self.last_content_height
@@ -198,8 +236,14 @@ class ScrollManager:
     async def reset_to_top(self):
         """Reset scroll position to top of page."""
         try:
-            await self.page.evaluate("window.scrollTo(0, 0)")
-            await asyncio.sleep(0.3)
+            # Scrolling is instant; wait two frames for it to paint (0.3s at most) rather than a fixed delay
+            await self.page.evaluate("""
+            () => new Promise(resolve => {
+                window.scrollTo(0, 0);
+                setTimeout(resolve, 300);
+                requestAnimationFrame(() => requestAnimationFrame(resolve));
+            })
+            """)
             self.current_position = 0
             self.scroll_iterations = 0
             if self.verbose:
@@ -6,7 +6,11 @@ import argparse
 import asyncio
 import json
 import sys
+import queue
+import atexit
 import logging
+import logging.handlers
+from collections import Counter
 from pathlib import Path
 from typing import Optional
 
@@ -168,10 +172,22 @@ Examples:
     def setup_logging(self, verbose: bool = False) -> None:
         """Setup logging configuration."""
         level = logging.DEBUG if verbose else logging.ERROR
+        
+        # Records are formatted where they're logged but written to stderr by a background
+        # thread, so verbose runs don't block the event loop on console writes
+        handlers = None
+        if not logging.getLogger().handlers:
+            log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+            listener.start()
+            atexit.register(listener.stop)
+            handlers = [logging.handlers.QueueHandler(log_queue)]
+        
         logging.basicConfig(
             level=level,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+            datefmt='%Y-%m-%d %H:%M:%S',
+            handlers=handlers
         )
         
         # Suppress noisy third-party library logs unless verbose
@@ -245,12 +261,8 @@ Examples:
             print(f"\nBug Breakdown:")
             
             # Group bugs by severity
-            severity_counts = {}
-            type_counts = {}
-            
-            for bug in report.findings:
-                severity_counts[bug.severity] = severity_counts.get(bug.severity, 0) + 1
-                type_counts[bug.type] = type_counts.get(bug.type, 0) + 1
+            severity_counts = Counter(bug.severity for bug in report.findings)
+            type_counts = Counter(bug.type for bug in report.findings)
             
             for severity, count in severity_counts.items():
                 emoji = {'critical': '🔴', 'high': '🟠', 'medium': '🟡', 'low': '🔵'}.get(severity, '⚪')
@@ -110,6 +110,9 @@ class Crawler:
                     print(f"Skipping non-HTML content: {current_url} (type: {content_type})")
                 continue
             
+            # Let the inspector start navigating to the next page while this one is checked
+            self._prefetch_next(frontier, visited, inspector)
+            
             # Inspect the page
             page_result = await self._inspect_page_with_retry(current_url, inspector)
             
@@ -176,6 +179,16 @@ class Crawler:
             print(f"Final report: {report.pages_total} pages, {report.bugs_total} bugs found")
         return report
     
+    def _prefetch_next(self, frontier: deque, visited: set, inspector: Inspector):
+        """Hint the next frontier URL to inspectors that support prefetching"""
+        prefetch = getattr(inspector, 'prefetch', None)
+        if not frontier or prefetch is None:
+            return
+        
+        next_url, _ = frontier[0]
+        if next_url not in visited and URLUtils.should_inspect_url(next_url):
+            prefetch(next_url)
+    
     def _extract_seed_host(self, seed_url: str) -> str:
         """
         Extract host from seed URL for boundary checking.
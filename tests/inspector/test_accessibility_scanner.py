@@ -0,0 +1,66 @@
+"""
+Tests for multi-viewport accessibility scanning.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.inspector.checks.accessibility_scanner import AccessibilityScanner
+
+
+def _page(width, height):
+    page = Mock()
+    page.viewport_size = {"width": width, "height": height}
+    page.set_viewport_size = AsyncMock()
+    page.screenshot = AsyncMock(return_value=b"png-bytes")
+    page.close = AsyncMock()
+    return page
+
+
+class TestScanAllViewports:
+    """Test that viewports scanned on separate pages merge like a one-by-one scan."""
+
+    @pytest.mark.asyncio
+    async def test_shared_violation_reported_for_first_viewport(self, tmp_path, monkeypatch):
+        """A violation found at every size should be reported once, for the first viewport."""
+        scanner = AccessibilityScanner(str(tmp_path))
+        scanner.axe = object()
+        viewports = scanner.DEFAULT_VIEWPORTS
+        main_page = _page(viewports[0]["width"], viewports[0]["height"])
+        extra_pages = [_page(viewport["width"], viewport["height"]) for viewport in viewports[1:]]
+        violation = {"id": "color-contrast", "impact": "serious", "description": "Low contrast",
+                     "nodes": [{"target": ["#footer"], "failureSummary": "Fix contrast"}]}
+
+        async def fake_run_axe(page, options):
+            return {"violations": [violation], "incomplete": [], "passes": 3, "inapplicable": 0}
+
+        monkeypatch.setattr(scanner, "_run_axe", fake_run_axe)
+        monkeypatch.setattr(scanner, "_open_viewport_pages", AsyncMock(return_value=extra_pages))
+
+        result = await scanner.scan_all_viewports(main_page, "https://example.com")
+
+        assert len(result.findings) == 1
+        assert result.findings[0].evidence.viewport == f"{viewports[0]['width']}x{viewports[0]['height']}"
+        assert result.violations_count == len(viewports)
+        for extra_page in extra_pages:
+            extra_page.close.assert_awaited_once()
+
+
+class TestWcagGuidelines:
+    """Test that cached WCAG codes aren't shared between findings."""
+
+    @pytest.mark.asyncio
+    async def test_findings_get_their_own_lists(self, tmp_path):
+        """Editing one finding's WCAG list should leave other findings with the same tags alone."""
+        scanner = AccessibilityScanner(str(tmp_path))
+        tags = ["wcag2aa", "wcag143", "cat.color"]
+        first = await scanner._create_violation_bug(
+            {"id": "color-contrast", "tags": tags, "nodes": [{"target": ["#a"]}]}, "https://example.com", None, None)
+        second = await scanner._create_violation_bug(
+            {"id": "color-contrast", "tags": tags, "nodes": [{"target": ["#b"]}]}, "https://example.com", None, None)
+
+        first.wcag_guidelines.append("EDITED")
+
+        assert second.wcag_guidelines == ["WCAG2AA", "WCAG143"]
+        assert second.evidence.wcag == ["WCAG2AA", "WCAG143"]
+        assert first.evidence.wcag is not first.wcag_guidelines
@@ -0,0 +1,32 @@
+"""
+Tests for screenshot analyzer helpers.
+"""
+
+import random
+
+from src.inspector.utils.analyzer_factory import PerceptualHashIndex
+
+
+class TestPerceptualHashIndex:
+    """Test near-duplicate lookup of perceptual hashes."""
+
+    def test_matches_brute_force(self):
+        """The banded index should find exactly the hashes a full comparison finds."""
+        rng = random.Random(7)
+        seen = [rng.getrandbits(64) for _ in range(200)]
+        index = PerceptualHashIndex(max_distance=4)
+        for value in seen:
+            index.add(value)
+
+        # Probe with exact, near (flipped bits) and unrelated hashes
+        probes = []
+        for value in seen[:50]:
+            flipped = value
+            for bit in rng.sample(range(64), rng.randint(0, 6)):
+                flipped ^= 1 << bit
+            probes.append(flipped)
+        probes.extend(rng.getrandbits(64) for _ in range(50))
+
+        for probe in probes:
+            expected = any(bin(probe ^ value).count('1') <= 4 for value in seen)
+            assert index.has_near(probe) == expected
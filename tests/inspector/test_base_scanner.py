@@ -0,0 +1,20 @@
+"""
+Tests for shared scanner helpers.
+"""
+
+from src.inspector.checks.base_scanner import new_bug_id
+
+
+class TestNewBugId:
+    """Test run-scoped bug id generation."""
+    
+    def test_ids_are_unique(self):
+        """Consecutive ids should never collide."""
+        ids = {new_bug_id() for _ in range(1000)}
+        assert len(ids) == 1000
+    
+    def test_ids_share_run_prefix(self):
+        """Ids from the same run should share the run nonce prefix."""
+        first, second = new_bug_id(), new_bug_id()
+        assert first.split('-')[0] == second.split('-')[0]
+        assert first != second
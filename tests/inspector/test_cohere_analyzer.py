@@ -0,0 +1,99 @@
+"""
+Tests for rate-limit handling, client reuse and in-memory input in the Cohere analyzer.
+"""
+
+import base64
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.inspector.utils import cohere_analyzer
+from src.inspector.utils.cohere_analyzer import CohereAnalyzer
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class TestRateLimitBackoff:
+    """Test that rate-limited Cohere calls are retried with backoff."""
+
+    def _analyzer(self, monkeypatch, outcomes):
+        analyzer = CohereAnalyzer.__new__(CohereAnalyzer)
+        analyzer.verbose = False
+        analyzer.RATE_LIMIT_BACKOFF_SECONDS = 0
+        calls = []
+
+        async def fake_call(messages):
+            calls.append(messages)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(analyzer, "_make_api_call", fake_call)
+        return analyzer, calls
+
+    @pytest.mark.asyncio
+    async def test_retries_after_rate_limit(self, monkeypatch):
+        """A 429 should be retried until the call succeeds."""
+        analyzer, calls = self._analyzer(monkeypatch, [RateLimited(), RateLimited(), "response"])
+
+        assert await analyzer._make_api_call_with_backoff([]) == "response"
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self, monkeypatch):
+        """Errors other than rate limiting should surface immediately."""
+        analyzer, calls = self._analyzer(monkeypatch, [ValueError("bad request"), "response"])
+
+        with pytest.raises(ValueError):
+            await analyzer._make_api_call_with_backoff([])
+        assert len(calls) == 1
+
+
+class TestSharedAnalyzer:
+    """Test that concurrent analyses share one Cohere client."""
+
+    def test_analyzer_reused_per_key(self, monkeypatch):
+        """The same key should get the same analyzer, and so the same client."""
+        created = []
+        monkeypatch.setattr(cohere_analyzer, "cohere", Mock(ClientV2=lambda api_key: created.append(api_key) or Mock()))
+        cohere_analyzer._shared_analyzer.cache_clear()
+
+        try:
+            first = cohere_analyzer._shared_analyzer("key", False)
+            assert cohere_analyzer._shared_analyzer("key", False) is first
+            assert created == ["key"]
+        finally:
+            cohere_analyzer._shared_analyzer.cache_clear()
+
+
+class TestAnalyzeScreenshotData:
+    """Test analysis of screenshot bytes held in memory."""
+
+    @pytest.mark.asyncio
+    async def test_bytes_encoded_with_detected_mime_type(self, monkeypatch):
+        """Bytes should be base64 encoded and sent with their MIME type, never treated as a path."""
+        analyzer = Mock(analyze_screenshot=AsyncMock(return_value=([], None)))
+        monkeypatch.setattr(cohere_analyzer, "_shared_analyzer", lambda api_key, verbose: analyzer)
+        monkeypatch.setattr(cohere_analyzer.os.path, "exists", Mock(side_effect=AssertionError("stat called")))
+
+        await cohere_analyzer.analyze_screenshot_data(b"\xff\xd8\xffjpeg", "viewport 1280x800", "https://example.com")
+
+        analyzer.analyze_screenshot.assert_awaited_once_with(
+            base64.b64encode(b"\xff\xd8\xffjpeg").decode(), "viewport 1280x800", "https://example.com", "image/jpeg"
+        )
+
+    @pytest.mark.asyncio
+    async def test_file_sent_with_detected_mime_type(self, tmp_path, monkeypatch):
+        """A JPEG screenshot passed by path should be labelled image/jpeg, not the PNG default."""
+        analyzer = Mock(analyze_screenshot=AsyncMock(return_value=([], None)))
+        monkeypatch.setattr(cohere_analyzer, "_shared_analyzer", lambda api_key, verbose: analyzer)
+        path = tmp_path / "viewport.jpg"
+        path.write_bytes(b"\xff\xd8\xffjpeg")
+
+        await cohere_analyzer.analyze_screenshot(str(path), "viewport 1280x800", "https://example.com")
+
+        analyzer.analyze_screenshot.assert_awaited_once_with(
+            base64.b64encode(b"\xff\xd8\xffjpeg").decode(), "viewport 1280x800", "https://example.com", "image/jpeg"
+        )
@@ -0,0 +1,100 @@
+"""
+Tests for background screenshot writes in the evidence collector.
+"""
+
+import os
+import base64
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.inspector.utils.evidence import (
+    EvidenceCollector, ScreenshotStore, encode_screenshot, image_mime_type, read_screenshot, screenshot_exists
+)
+
+
+class TestBackgroundScreenshotWrites:
+    """Test that captured screenshots are readable before and after they hit disk."""
+
+    @pytest.mark.asyncio
+    async def test_screenshot_readable_and_flushed(self, tmp_path):
+        """A captured screenshot should be readable immediately and on disk after flush."""
+        page = Mock()
+        page.screenshot = AsyncMock(return_value=b"png-bytes")
+        collector = EvidenceCollector(page, str(tmp_path))
+
+        path = await collector.capture_bug_screenshot("b1", "1280x800")
+
+        assert screenshot_exists(path)
+        assert read_screenshot(path) == b"png-bytes"
+        assert collector.captured_paths == [path]
+
+        await collector.flush()
+
+        assert os.path.exists(path)
+        with open(path, 'rb') as f:
+            assert f.read() == b"png-bytes"
+
+    @pytest.mark.asyncio
+    async def test_captures_share_one_cdp_session(self, tmp_path):
+        """Viewport captures should reuse one CDP session, released on flush."""
+        cdp = Mock()
+        cdp.send = AsyncMock(return_value={"data": base64.b64encode(b"cdp-png").decode()})
+        cdp.detach = AsyncMock()
+        page = Mock()
+        page.context.new_cdp_session = AsyncMock(return_value=cdp)
+        page.screenshot = AsyncMock()
+        collector = EvidenceCollector(page, str(tmp_path))
+
+        first = await collector.capture_bug_screenshot("b1", "1280x800")
+        await collector.capture_scroll_screenshot(800, "1280x800")
+        await collector.flush()
+
+        assert read_screenshot(first) == b"cdp-png"
+        page.context.new_cdp_session.assert_awaited_once()
+        page.screenshot.assert_not_awaited()
+        cdp.detach.assert_awaited_once()
+
+
+class TestScreenshotStore:
+    """Test the in-memory screenshot store."""
+
+    def test_recent_screenshots_are_bounded(self):
+        """Written screenshots stay readable from memory until evicted by newer ones."""
+        store = ScreenshotStore(max_recent=2)
+        for name in ("a", "b", "c"):
+            store.put(name, name.encode())
+            store.mark_written(name)
+
+        assert "a" not in store
+        assert store.get("a") is None
+        assert store.get("b") == b"b"
+        assert store.get("c") == b"c"
+
+    def test_pending_screenshots_are_not_evicted(self):
+        """Screenshots still being written are never dropped from memory."""
+        store = ScreenshotStore(max_recent=0)
+        store.put("pending", b"data")
+
+        assert store.get("pending") == b"data"
+        store.mark_written("pending")
+        assert store.get("pending") is None
+
+
+class TestImageMimeType:
+    """Test MIME detection for screenshot bytes sent to the analyzers."""
+
+    def test_detects_jpeg_and_png(self):
+        """JPEG bytes are recognised by their signature; anything else is treated as PNG."""
+        assert image_mime_type(b"\xff\xd8\xff\xe0rest") == "image/jpeg"
+        assert image_mime_type(b"\x89PNG\r\n\x1a\nrest") == "image/png"
+
+
+class TestEncodeScreenshot:
+    """Test base64 encoding of screenshots for the analyzers."""
+
+    def test_encodes_from_disk(self, tmp_path):
+        """A screenshot no longer held in memory should be read from disk and encoded."""
+        path = tmp_path / "shot.png"
+        path.write_bytes(b"disk-png")
+
+        assert base64.b64decode(encode_screenshot(str(path))) == b"disk-png"
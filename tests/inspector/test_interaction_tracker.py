@@ -0,0 +1,56 @@
+"""
+Tests for interaction tracking across viewports.
+"""
+
+from src.inspector.utils.interaction_tracker import InteractionTracker
+
+
+class TestTrackerMerge:
+    """Test folding per-viewport trackers together."""
+
+    def test_merge_combines_viewports(self):
+        """Elements tested by separate trackers should be tracked after merging."""
+        element = {'selector': '#menu', 'text': 'Menu', 'baseSelector': '.dropdown-toggle'}
+
+        desktop = InteractionTracker()
+        desktop.set_viewport_context("1280x800")
+        desktop.mark_as_tested(element, "dropdown")
+
+        mobile = InteractionTracker()
+        mobile.set_viewport_context("375x667")
+        mobile.mark_as_tested(element, "dropdown")
+
+        combined = InteractionTracker()
+        combined.merge(desktop)
+        combined.merge(mobile)
+
+        for viewport_key in ("1280x800", "375x667"):
+            combined.set_viewport_context(viewport_key)
+            assert combined.is_element_tested(element, "dropdown")
+            assert combined.interaction_counts[viewport_key]["dropdown"] == 1
+
+
+class TestElementSignature:
+    """Test element signatures built from kernel-provided keys."""
+
+    def test_kernel_keys_match_derived_keys(self):
+        """Keys sent by the discovery kernel should give the same signature as deriving them."""
+        tracker = InteractionTracker()
+        element = {'selector': '#menu', 'text': 'Products and services', 'baseSelector': 'nav .dropdown-toggle[aria-haspopup]'}
+        with_keys = dict(element, textKey='Products and service', baseKey='dropdown-toggle')
+
+        assert tracker._create_element_signature(with_keys, "dropdown") == tracker._create_element_signature(element, "dropdown")
+
+
+class TestUntestedFilter:
+    """Test filtering of already-tested elements."""
+
+    def test_stops_at_limit(self):
+        """Filtering should stop once the requested number of untested elements is found."""
+        tracker = InteractionTracker()
+        tracker.set_viewport_context("1280x800")
+        elements = [{'selector': f'#item-{i}', 'text': f'Item {i}', 'baseSelector': '.dropdown-toggle'} for i in range(6)]
+        tracker.mark_as_tested(elements[1], "dropdown")
+
+        assert tracker.filter_untested_elements(elements, "dropdown", limit=3) == [elements[0], elements[2], elements[3]]
+        assert tracker.filter_untested_elements(elements, "dropdown") == elements[:1] + elements[2:]
@@ -0,0 +1,32 @@
+"""
+Tests for outlink collection.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.inspector.playwright_helpers.link_detection import LinkDetector
+
+
+class TestCollectOutlinks:
+    """Test that links and SPA routes are collected in a single page scan."""
+
+    @pytest.mark.asyncio
+    async def test_links_and_routes_from_one_evaluate(self):
+        """Links and every kind of discovered route should come from one evaluate call."""
+        page = Mock()
+        page.wait_for_function = AsyncMock()
+        page.evaluate = AsyncMock(return_value={"value": {
+            "links": ["/about", "https://other.example.org/page"],
+            "reactRoutes": ["/dashboard"],
+            "bundleRoutes": ["/about"],
+            "navigationRoutes": ["/contact", "https://other.example.org/route"],
+        }})
+        detector = LinkDetector(page, "https://example.com/")
+
+        outlinks = await detector.collect_outlinks()
+
+        assert page.evaluate.await_count == 1
+        assert {"https://example.com/about", "https://example.com/dashboard", "https://example.com/contact"} <= set(outlinks)
+        assert "https://other.example.org/route" not in outlinks
+        assert len(outlinks) == len(set(outlinks))
@@ -0,0 +1,43 @@
+"""
+Tests for the performance scanner's metric collection.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.inspector.checks.performance_scanner import PerformanceScanner
+
+
+class TestMetricCollection:
+    """Test that timings and Core Web Vitals are read together."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_read_in_one_evaluate(self, tmp_path):
+        """The scan should fetch timings and vitals with a single page evaluate."""
+        page = Mock()
+        page.evaluate = AsyncMock(return_value={
+            'timings': {'total_load_time': 900.0},
+            'vitals': {'cls': 0.01},
+        })
+        scanner = PerformanceScanner(str(tmp_path))
+
+        result = await scanner.scan(page, "https://example.com")
+
+        page.evaluate.assert_awaited_once()
+        assert result.performance_metrics == {'total_load_time': 900.0, 'cls': 0.01}
+        assert result.timings == {'total_load_time': 900.0}
+
+
+class TestMetricDescriptions:
+    """Test the per-metric summary templates."""
+
+    def test_templates_formatted_per_finding(self, tmp_path):
+        """Summaries should be filled in with the measured value, including KB-scaled metrics."""
+        scanner = PerformanceScanner(str(tmp_path))
+
+        summary, fix = scanner._get_metric_description('total_resource_size', 4500000, 3000000)
+        assert summary == "Total resource size is large (4500KB vs 3000.0KB target)"
+        assert fix == scanner.METRIC_DESCRIPTIONS['total_resource_size'][1]
+
+        summary, _ = scanner._get_metric_description('unknown_metric', 12.34, 10)
+        assert summary == "Performance metric unknown_metric exceeds threshold (12.3 vs 10)"
@@ -0,0 +1,293 @@
+"""
+Tests for background screenshot analysis in the structured explorer.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.inspector.checks import structured_explorer
+from src.inspector.checks.structured_explorer import StructuredExplorer, _is_blocked_host
+from src.inspector.utils.action_recorder import ActionRecorder
+
+
+class TestQueuedAnalysis:
+    """Test that screenshot analysis runs in the background without reordering findings."""
+
+    @pytest.mark.asyncio
+    async def test_bugs_collected_in_capture_order(self, tmp_path, monkeypatch):
+        """Bugs should follow capture order even when later analyses finish first."""
+        delays = {"first.png": 0.05, "second.png": 0.0}
+
+        async def fake_analyze(image_bytes, screenshot_path, context, viewport, page_url, model, verbose):
+            await asyncio.sleep(delays[screenshot_path])
+            return [Mock(evidence=Mock(), reproduction_steps=[])], None
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", fake_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", lambda path: path.encode())
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+
+        explorer._queue_analysis("first.png", "scroll", "1280x800", "https://example.com", "at top")
+        explorer._queue_analysis("second.png", "modal opened", "1280x800", "https://example.com", "in modal")
+        await explorer._collect_analyses()
+
+        assert [bug.evidence.screenshot_path for bug in explorer.bugs] == ["first.png", "second.png"]
+
+    @pytest.mark.asyncio
+    async def test_analysis_errors_are_skipped(self, tmp_path, monkeypatch):
+        """A failed analysis should contribute no bugs."""
+        async def failing_analyze(*args):
+            return [], "API unavailable"
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", failing_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", lambda path: path.encode())
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+
+        explorer._queue_analysis("shot.png", "scroll", "1280x800", "https://example.com", "at top")
+        await explorer._collect_analyses()
+
+        assert explorer.bugs == []
+
+    @pytest.mark.asyncio
+    async def test_identical_screenshots_analyzed_once(self, tmp_path, monkeypatch):
+        """A screenshot with the same content as an analyzed one should not be sent again."""
+        analyzed = []
+
+        async def fake_analyze(image_bytes, screenshot_path, *args):
+            analyzed.append(screenshot_path)
+            return [], None
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", fake_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", lambda path: b"same-pixels")
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+
+        explorer._queue_analysis("form_0.png", "form filled", "1280x800", "https://example.com", "in form 1")
+        explorer._queue_analysis("form_1.png", "form filled", "1280x800", "https://example.com", "in form 2")
+        await explorer._collect_analyses()
+
+        assert analyzed == ["form_0.png"]
+
+    @pytest.mark.asyncio
+    async def test_similar_looking_screenshots_analyzed_once(self, tmp_path, monkeypatch):
+        """Same-mode screenshots whose perceptual hashes are a few bits apart should be analyzed once."""
+        analyzed = []
+        hashes = {b"scroll_0": 0b1011_0000, b"scroll_1": 0b1011_0001, b"scroll_2": 0b0100_1111}
+
+        async def fake_analyze(image_bytes, screenshot_path, *args):
+            analyzed.append(screenshot_path)
+            return [], None
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", fake_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", lambda path: path.split(".")[0].encode())
+        monkeypatch.setattr(structured_explorer, "perceptual_hash", hashes.get)
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=(), downscale_for_vlm=False)
+
+        for name in ("scroll_0", "scroll_1", "scroll_2"):
+            explorer._queue_analysis(f"{name}.png", "scroll", "1280x800", "https://example.com", f"at {name}", 'scroll')
+        await explorer._collect_analyses()
+
+        assert analyzed == ["scroll_0.png", "scroll_2.png"]
+
+    @pytest.mark.asyncio
+    async def test_interaction_screenshots_not_matched_to_scroll(self, tmp_path, monkeypatch):
+        """A filled form or open dropdown that barely changes the hash should still be analyzed."""
+        analyzed = []
+
+        async def fake_analyze(image_bytes, screenshot_path, *args):
+            analyzed.append(screenshot_path)
+            return [], None
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", fake_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", lambda path: path.split(".")[0].encode())
+        monkeypatch.setattr(structured_explorer, "perceptual_hash", lambda image_bytes: 0b1011_0000)
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=(), downscale_for_vlm=False)
+
+        for name, mode in (("scroll", 'scroll'), ("form", 'forms'), ("dropdown", 'dropdowns'), ("dropdown_2", 'dropdowns')):
+            explorer._queue_analysis(f"{name}.png", name, "1280x800", "https://example.com", f"in {name}", mode)
+        await explorer._collect_analyses()
+
+        assert sorted(analyzed) == ["dropdown.png", "dropdown_2.png", "form.png", "scroll.png"]
+
+    @pytest.mark.asyncio
+    async def test_bytes_read_once_at_queue_time(self, tmp_path, monkeypatch):
+        """Queued analyses should get the bytes read at capture, not read the screenshot again."""
+        reads = []
+        received = []
+
+        def fake_read(path):
+            reads.append(path)
+            return b"captured-pixels"
+
+        async def fake_analyze(image_bytes, *args):
+            received.append(image_bytes)
+            return [], None
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", fake_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", fake_read)
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+
+        explorer._queue_analysis("shot.png", "scroll", "1280x800", "https://example.com", "at top")
+        await explorer._collect_analyses()
+
+        assert reads == ["shot.png"]
+        assert received == [b"captured-pixels"]
+
+    @pytest.mark.asyncio
+    async def test_analyzer_gets_downscaled_copy(self, tmp_path, monkeypatch):
+        """The analyzer should see the downscaled copy while evidence keeps the original path."""
+        received = []
+
+        async def fake_analyze(image_bytes, screenshot_path, *args):
+            received.append(image_bytes)
+            return [Mock(evidence=Mock(), reproduction_steps=[])], None
+
+        monkeypatch.setattr(structured_explorer, "analyze_screenshot_bytes", fake_analyze)
+        monkeypatch.setattr(structured_explorer, "read_screenshot", lambda path: b"full-size")
+        monkeypatch.setattr(structured_explorer, "downscale_for_analysis", lambda data: b"small")
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+
+        explorer._queue_analysis("shot.png", "scroll", "1280x800", "https://example.com", "at top")
+        await explorer._collect_analyses()
+
+        assert received == [b"small"]
+        assert explorer.bugs[0].evidence.screenshot_path == "shot.png"
+
+
+class TestAnalysisConcurrency:
+    """Test sizing of the screenshot analysis and viewport concurrency limits."""
+
+    def test_env_override(self, monkeypatch):
+        """MANTIS_ANALYSIS_CONCURRENCY should override the default limit."""
+        monkeypatch.setenv("MANTIS_ANALYSIS_CONCURRENCY", "2")
+        assert StructuredExplorer._analysis_concurrency() == 2
+
+    def test_invalid_env_falls_back_to_default(self, monkeypatch):
+        """An unparseable value should fall back to the default limit."""
+        monkeypatch.setenv("MANTIS_ANALYSIS_CONCURRENCY", "lots")
+        assert StructuredExplorer._analysis_concurrency() == StructuredExplorer.MAX_CONCURRENT_ANALYSES
+
+    def test_viewport_env_override(self, monkeypatch):
+        """MANTIS_VIEWPORT_CONCURRENCY should override the default viewport limit."""
+        monkeypatch.setenv("MANTIS_VIEWPORT_CONCURRENCY", "1")
+        assert StructuredExplorer._viewport_concurrency() == 1
+
+
+class TestViewportScheduling:
+    """Test that viewport passes are spread over the pages allowed to run at once."""
+
+    @pytest.mark.asyncio
+    async def test_viewports_beyond_limit_reuse_free_pages(self, tmp_path, monkeypatch):
+        """With room for two pages, the third viewport should run on whichever page frees up first."""
+        monkeypatch.setenv("MANTIS_VIEWPORT_CONCURRENCY", "2")
+        page = Mock(route=AsyncMock(), unroute=AsyncMock())
+        sibling = Mock(close=AsyncMock())
+        explored = []
+
+        async def fake_pass(self, viewport_page, page_url, viewport_config):
+            await asyncio.sleep(0.02 if viewport_page is page else 0)
+            explored.append((viewport_page, viewport_config['name']))
+
+        async def fake_open_siblings(self, page, page_url, viewport_configs):
+            assert [config['name'] for config in viewport_configs] == ["tablet"]
+            return [sibling]
+
+        monkeypatch.setattr(StructuredExplorer, "_explore_viewport_pass", fake_pass)
+        monkeypatch.setattr(StructuredExplorer, "_open_sibling_pages", fake_open_siblings)
+        monkeypatch.setattr(structured_explorer, "LinkDetector", lambda *args: Mock(collect_outlinks=AsyncMock(return_value=[])))
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+        explorer.performance_tracker = Mock(collect_timings=AsyncMock(return_value={}))
+
+        await explorer.run_complete_exploration(page, "https://example.com")
+
+        assert sorted(explored, key=lambda item: item[1]) == [(page, "desktop"), (sibling, "mobile"), (sibling, "tablet")]
+        sibling.close.assert_awaited_once()
+
+
+class TestSiblingDocument:
+    """Test the document replayed to sibling viewport pages."""
+
+    @pytest.mark.asyncio
+    async def test_serves_original_response_body(self, tmp_path):
+        """Siblings should get the bytes the server sent, not the page's DOM after scripts ran."""
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+        explorer.document_response = Mock(
+            ok=True, url="https://example.com/page", headers={"content-type": "text/html; charset=iso-8859-1"},
+            body=AsyncMock(return_value=b"<html><body><div id=root></div></body></html>")
+        )
+
+        document = await explorer._original_document()
+
+        assert document == {
+            'url': "https://example.com/page",
+            'content_type': "text/html; charset=iso-8859-1",
+            'body': b"<html><body><div id=root></div></body></html>",
+        }
+
+    @pytest.mark.asyncio
+    async def test_no_document_without_html_response(self, tmp_path):
+        """Siblings should navigate normally when there's no successful HTML response to replay."""
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+        assert await explorer._original_document() is None
+
+        explorer.document_response = Mock(ok=False, url="https://example.com", headers={"content-type": "text/html"})
+        assert await explorer._original_document() is None
+
+        explorer.document_response = Mock(ok=True, url="https://example.com/a.pdf", headers={"content-type": "application/pdf"})
+        assert await explorer._original_document() is None
+
+
+class TestFormFilling:
+    """Test the bulk form fill and its per-input fallback."""
+
+    @pytest.mark.asyncio
+    async def test_skipped_inputs_not_recorded_or_retried(self, tmp_path, monkeypatch):
+        """Inputs the fill kernel skips as non-text should neither be recorded nor filled one by one."""
+        explorer = StructuredExplorer(str(tmp_path), capture_modes=())
+        explorer.action_recorder = ActionRecorder("https://example.com")
+        fallback = AsyncMock()
+        monkeypatch.setattr(explorer, "_evaluate_kernel", AsyncMock(return_value={"failed": ["#phone"], "skipped": ["#submit"]}))
+        monkeypatch.setattr(explorer, "_fill_input_with_edge_case_data", fallback)
+        form = {'inputs': [
+            {'selector': '#email', 'type': 'email', 'name': 'email'},
+            {'selector': '#phone', 'type': 'tel', 'name': 'phone'},
+            {'selector': '#submit', 'type': 'submit', 'name': 'send'},
+        ]}
+
+        await explorer._fill_form_inputs(Mock(), form)
+
+        assert [step.target for step in explorer.action_recorder.steps] == ['#email']
+        assert [call.args[1]['selector'] for call in fallback.await_args_list] == ['#phone']
+
+
+class TestBlockedHosts:
+    """Test tracker host matching for exploration request blocking."""
+
+    def test_matches_hosts_and_subdomains(self):
+        """Listed hosts and their subdomains should be blocked."""
+        assert _is_blocked_host("www.googletagmanager.com")
+        assert _is_blocked_host("doubleclick.net")
+        assert _is_blocked_host("static.hotjar.com")
+
+    def test_ignores_lookalike_hosts(self):
+        """Hosts that only end with a listed name should not be blocked."""
+        assert not _is_blocked_host("notdoubleclick.net")
+        assert not _is_blocked_host("example.com")
+        assert not _is_blocked_host("")
+
+
+class TestExplorerReuse:
+    """Test that per-page state is reset when an explorer is reused."""
+
+    def test_recorder_reset_for_new_page(self):
+        """A reused recorder should start the next page with no steps."""
+        recorder = ActionRecorder("https://example.com/a")
+        recorder.record_navigation("https://example.com/a")
+        steps = recorder.steps
+
+        recorder.reset("https://example.com/b")
+
+        assert recorder.steps is steps
+        assert recorder.steps == []
+        assert recorder.page_url == "https://example.com/b"
+        recorder.record_navigation("https://example.com/b")
+        assert recorder.steps[0].step_number == 1
@@ -51,6 +51,32 @@ class TestSeedHostExtraction:
         assert host == "example.com:8080"
 
 
+class TestPrefetchHint:
+    """Test hinting the next frontier URL to the inspector."""
+
+    def test_prefetches_next_frontier_url(self):
+        """Should pass the head of the frontier to inspector.prefetch."""
+        from collections import deque
+        crawler = Crawler()
+        mock_inspector = Mock()
+        frontier = deque([("https://example.com/about", 1)])
+
+        crawler._prefetch_next(frontier, set(), mock_inspector)
+
+        mock_inspector.prefetch.assert_called_once_with("https://example.com/about")
+
+    def test_skips_visited_and_binary_urls(self):
+        """Should not prefetch URLs already visited or that won't be inspected."""
+        from collections import deque
+        crawler = Crawler()
+        mock_inspector = Mock()
+
+        crawler._prefetch_next(deque([("https://example.com/a", 1)]), {"https://example.com/a"}, mock_inspector)
+        crawler._prefetch_next(deque([("https://example.com/report.pdf", 1)]), set(), mock_inspector)
+
+        mock_inspector.prefetch.assert_not_called()
+
+
 class TestPageInspectionWithRetry:
     """Test page inspection with retry logic."""
     
@@ -377,4 +403,48 @@ class TestProgressReporting:
         
         # Verify callback was called with expected arguments (url, current, total)
         calls = progress_callback.call_args_list
-        assert len(calls) >= 2
\ No newline at end of file
+        assert len(calls) >= 2
+
+
+class TestPrefetchClaimed:
+    """Test that pages prefetched for the crawler are used rather than navigated again."""
+
+    @pytest.fixture
+    def inspector(self, monkeypatch):
+        from src.inspector.main import Inspector as BrowserInspector
+        from src.inspector.checks.base_scanner import ScanConfig
+
+        monkeypatch.setattr(BrowserInspector, "_instance", None)
+        monkeypatch.setattr(BrowserInspector, "PAGE_POOL_SIZE", 2)
+        inspector = BrowserInspector(scan_config=ScanConfig(accessibility=False, ui_scans=False))
+        monkeypatch.setattr(BrowserInspector, "_instance", None)
+        monkeypatch.setattr(inspector, "_ensure_browser_ready", AsyncMock())
+        monkeypatch.setattr(inspector, "_release_page", AsyncMock())
+        return inspector
+
+    @pytest.mark.asyncio
+    async def test_each_url_navigated_once(self, inspector, monkeypatch):
+        """A page prefetched while the previous one was inspected should not be navigated again."""
+        from src.orchestrator import crawler as crawler_module
+
+        navigated = []
+        urls = ["https://example.com", "https://example.com/about", "https://example.com/contact"]
+        outlinks = {urls[0]: urls[1:], urls[1]: [], urls[2]: []}
+
+        async def fake_open_page(url):
+            navigated.append(url)
+            await asyncio.sleep(0)
+            return Mock(), Mock(get_response_status=AsyncMock(return_value=200)), True, 1.0
+
+        async def fake_collect_links(page, url, result):
+            result.outlinks = outlinks[url]
+
+        monkeypatch.setattr(inspector, "_open_page", fake_open_page)
+        monkeypatch.setattr(inspector, "_collect_links", fake_collect_links)
+        monkeypatch.setattr(crawler_module.URLUtils, "check_content_type", AsyncMock(return_value="text/html"))
+
+        report = await Crawler(max_depth=1, max_pages=3).crawl_site(urls[0], inspector)
+
+        assert [page["url"] for page in report.pages] == urls
+        assert sorted(navigated) == sorted(urls)
+        assert inspector._prefetches == {}